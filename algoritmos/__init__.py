@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ algoritmos
+                                 A QGIS plugin
+ Horizon Projector - Algoritmos de Processing
+                             -------------------
+        begin                : 2026-01-11
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Alberto Rodrigues
+        email                : betorodriuges@msn.com
+ ***************************************************************************/
+"""
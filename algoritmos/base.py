@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ base
+                                 A QGIS plugin
+ Horizon Projector - Base comum dos algoritmos de Processing
+                             -------------------
+        begin                : 2026-01-11
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Alberto Rodrigues
+        email                : betorodriuges@msn.com
+ ***************************************************************************/
+"""
+
+import os
+
+import numpy as np
+from qgis.PyQt.QtCore import QCoreApplication
+from qgis.PyQt.QtGui import QIcon
+from qgis.core import (
+    QgsCoordinateReferenceSystem, QgsCoordinateTransform, QgsFeature,
+    QgsFeatureRequest, QgsFeatureSink, QgsField, QgsFields, QgsGeometry,
+    QgsLineString, QgsPolygon, QgsProcessingAlgorithm, QgsProcessingException,
+    QgsProcessingParameterDefinition, QgsProcessingParameterEnum,
+    QgsProcessingParameterNumber,
+)
+
+from ..horizon_core import geodesia, paralelo
+
+EPSG4326 = QgsCoordinateReferenceSystem("EPSG:4326")
+
+
+class AlgoritmoHorizonBase(QgsProcessingAlgorithm):
+    """
+    Base dos algoritmos do Horizon Projector.
+
+    Lê a camada de entrada em lotes (TAMANHO_LOTE feições), converte as
+    coordenadas e os campos numéricos em arrays NumPy, calcula o lote de uma
+    vez com horizon_core e grava o resultado no QgsFeatureSink. Nenhum
+    momento guarda a camada inteira em memória.
+    """
+
+    TAMANHO_LOTE = 5000
+
+    MODELO = 'MODELO'
+    MODELOS = ['esfera', 'wgs84']
+
+    NUM_PROCESSOS = 'NUM_PROCESSOS'
+    LOTE = 'TAMANHO_LOTE'
+
+    def tr(self, string):
+        return QCoreApplication.translate('Processing', string)
+
+    def createInstance(self):
+        return type(self)()
+
+    def icon(self):
+        return QIcon(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'icon.png'))
+
+    def group(self):
+        return self.tr('Horizon Projector')
+
+    def groupId(self):
+        return 'horizonprojector'
+
+    # ============ PARÂMETROS COMUNS ============
+
+    def adicionar_parametro_modelo(self):
+        """Parâmetro com o modelo da Terra (esfera ou WGS84)."""
+        self.addParameter(QgsProcessingParameterEnum(
+            self.MODELO, self.tr('Modelo da Terra'),
+            options=[self.tr('Esfera (R = 6371 km)'),
+                     self.tr('Elipsoide WGS84 (geodésico)')],
+            defaultValue=0))
+
+    def nome_modelo(self, parameters, context):
+        """Nome do modelo da Terra escolhido ('esfera' ou 'wgs84'), para os kernels."""
+        return self.MODELOS[self.parameterAsEnum(parameters, self.MODELO, context)]
+
+    def modelo_geodesico(self, parameters, context):
+        """Cria o motor geodésico escolhido no parâmetro MODELO."""
+        return geodesia.criar_modelo_terra(self.nome_modelo(parameters, context))
+
+    def adicionar_parametros_execucao(self):
+        """Parâmetros avançados do pool de processos (horizon_core.paralelo)."""
+        processos = QgsProcessingParameterNumber(
+            self.NUM_PROCESSOS, self.tr('Processos de trabalho (1 = no próprio QGIS)'),
+            QgsProcessingParameterNumber.Integer, defaultValue=1, minValue=1)
+        lote = QgsProcessingParameterNumber(
+            self.LOTE, self.tr('Feições por lote'),
+            QgsProcessingParameterNumber.Integer, defaultValue=self.TAMANHO_LOTE,
+            minValue=1)
+        for parametro in (processos, lote):
+            parametro.setFlags(parametro.flags() | QgsProcessingParameterDefinition.FlagAdvanced)
+            self.addParameter(parametro)
+
+    def executor(self, parameters, context):
+        """ExecutorProcessos configurado pelos parâmetros de execução."""
+        num_processos = self.parameterAsInt(parameters, self.NUM_PROCESSOS, context)
+        if num_processos > 1 and paralelo.interpretador_python() is None:
+            raise QgsProcessingException(self.tr(
+                'Não foi encontrado um interpretador Python ao lado do QGIS para '
+                'os processos de trabalho; use 1 processo.'))
+        return paralelo.ExecutorProcessos(
+            num_processos, self.parameterAsInt(parameters, self.LOTE, context))
+
+    def poligonos_circulos(self, executor, modelo, lats, lons, raios_km, tolerancia_km, feedback):
+        """
+        Polígonos dos círculos geodésicos de um lote, tesselados no pool do
+        executor (horizon_core.paralelo.circulos_geodesicos_paralelo).
+
+        Returns:
+            Lista de QgsGeometry na ordem de entrada, ou None se cancelado
+        """
+        aneis = paralelo.circulos_geodesicos_paralelo(
+            executor, modelo, lats, lons, raios_km, tolerancia_km,
+            cancelado=feedback.isCanceled)
+        if aneis is None:
+            return None
+        return [self.geometria_poligono(*anel) for anel in aneis]
+
+    def valor_ou_campo(self, parameters, nome_campo, nome_valor, context):
+        """
+        Devolve (campo, valor_fixo): o campo da camada, se escolhido, tem
+        prioridade sobre o valor fixo do parâmetro numérico.
+        """
+        campo = self.parameterAsString(parameters, nome_campo, context)
+        valor = self.parameterAsDouble(parameters, nome_valor, context)
+        return (campo or None), valor
+
+    # ============ LEITURA E ESCRITA EM LOTES ============
+
+    def campos_saida(self, source, novos_campos):
+        """Campos da camada de entrada seguidos dos campos calculados."""
+        campos = QgsFields(source.fields())
+        for nome, tipo in novos_campos:
+            campos.append(QgsField(nome, tipo))
+        return campos
+
+    def lotes(self, source, campos_numericos, context, feedback, tamanho=None,
+              request=None):
+        """
+        Percorre a fonte em lotes de pontos.
+
+        Args:
+            source: QgsProcessingFeatureSource de pontos
+            campos_numericos: Dicionário {chave: (campo_ou_None, valor_fixo)}
+            tamanho: Feições por lote (padrão TAMANHO_LOTE)
+            request: QgsFeatureRequest opcional (p.ex. com filtro por retângulo)
+
+        Yields:
+            Tuplas (atributos, lats, lons, valores), onde atributos é a lista
+            de atributos de cada feição e valores é {chave: array NumPy}.
+            Feições sem geometria ou com valores nulos são descartadas.
+        """
+        tamanho = tamanho or self.TAMANHO_LOTE
+        transform = QgsCoordinateTransform(
+            source.sourceCrs(), EPSG4326, context.transformContext())
+        indices = {chave: (source.fields().lookupField(campo) if campo else -1)
+                   for chave, (campo, _) in campos_numericos.items()}
+
+        total = source.featureCount()
+        passo = 100.0 / total if total > 0 else 0
+        atual = 0
+        descartadas = 0
+
+        atributos, lats, lons = [], [], []
+        valores = {chave: [] for chave in campos_numericos}
+
+        for feature in source.getFeatures(request or QgsFeatureRequest()):
+            if feedback.isCanceled():
+                return
+            atual += 1
+
+            geometria = feature.geometry()
+            linha = {}
+            for chave, (_, valor_fixo) in campos_numericos.items():
+                indice = indices[chave]
+                valor = feature.attribute(indice) if indice >= 0 else valor_fixo
+                try:
+                    linha[chave] = float(valor)
+                except (TypeError, ValueError):
+                    linha[chave] = None
+            if geometria.isNull() or geometria.isEmpty() or None in linha.values():
+                descartadas += 1
+                continue
+
+            if geometria.isMultipart():
+                ponto = geometria.asMultiPoint()[0]
+            else:
+                ponto = geometria.asPoint()
+            ponto = transform.transform(ponto)
+            atributos.append(feature.attributes())
+            lats.append(ponto.y())
+            lons.append(ponto.x())
+            for chave, valor in linha.items():
+                valores[chave].append(valor)
+
+            if len(atributos) >= tamanho:
+                yield self._lote(atributos, lats, lons, valores)
+                atributos, lats, lons = [], [], []
+                valores = {chave: [] for chave in campos_numericos}
+                feedback.setProgress(int(atual * passo))
+
+        if atributos:
+            yield self._lote(atributos, lats, lons, valores)
+        feedback.setProgress(100)
+
+        if descartadas:
+            feedback.pushInfo(self.tr(
+                '{} feição(ões) sem geometria ou com valores nulos foram ignoradas.'
+            ).format(descartadas))
+
+    def ler_pontos(self, source, campos_numericos, context, feedback, request=None):
+        """
+        Lê a fonte (ou só as feições de `request`) com lotes() e junta tudo:
+        para camadas que servem de referência a uma consulta.
+
+        Returns:
+            Tupla (atributos, lats, lons, valores), como um único lote
+        """
+        atributos, lats, lons = [], [], []
+        valores = {chave: [] for chave in campos_numericos}
+        for attrs, lats_lote, lons_lote, valores_lote in self.lotes(
+                source, campos_numericos, context, feedback, request=request):
+            atributos.extend(attrs)
+            lats.append(lats_lote)
+            lons.append(lons_lote)
+            for chave, valor in valores_lote.items():
+                valores[chave].append(valor)
+
+        def juntar(partes):
+            return np.concatenate(partes) if partes else np.empty(0)
+
+        return (atributos, juntar(lats), juntar(lons),
+                {chave: juntar(partes) for chave, partes in valores.items()})
+
+    @staticmethod
+    def _lote(atributos, lats, lons, valores):
+        return (atributos,
+                np.asarray(lats, dtype=np.float64),
+                np.asarray(lons, dtype=np.float64),
+                {chave: np.asarray(v, dtype=np.float64) for chave, v in valores.items()})
+
+    @staticmethod
+    def geometria_poligono(lats, lons):
+        """Polígono a partir de um anel fechado em arrays de lat/lon."""
+        anel = QgsLineString(lons.tolist(), lats.tolist())
+        return QgsGeometry(QgsPolygon(anel))
+
+    @staticmethod
+    def geometria_linha(lats, lons):
+        """Linha a partir de arrays de lat/lon."""
+        return QgsGeometry(QgsLineString(list(lons), list(lats)))
+
+    @staticmethod
+    def unir_em_cascata(geometrias, feedback=None, tamanho_grupo=64):
+        """
+        União de muitas geometrias em cascata: grupos de tamanho_grupo
+        geometrias vizinhas são unidos (QgsGeometry.unaryUnion), depois os
+        resultados, nível a nível, até sobrar uma. Com as geometrias em ordem
+        espacial (horizon_core.indice.chaves_morton), cada união só junta
+        vizinhas e os resultados intermediários continuam pequenos; nunca se
+        acumula uma geometria gigante par a par.
+
+        Returns:
+            A geometria unida, ou None se cancelado
+        """
+        nivel = list(geometrias)
+        while len(nivel) > 1:
+            proximo = []
+            for inicio in range(0, len(nivel), tamanho_grupo):
+                if feedback is not None and feedback.isCanceled():
+                    return None
+                proximo.append(QgsGeometry.unaryUnion(nivel[inicio:inicio + tamanho_grupo]))
+            nivel = proximo
+        return nivel[0] if nivel else QgsGeometry()
+
+    def gravar(self, sink, fields, geometrias, atributos, feedback):
+        """Grava um lote de feições no sink (geometria None para tabelas)."""
+        features = []
+        for geometria, attrs in zip(geometrias, atributos):
+            feature = QgsFeature(fields)
+            if geometria is not None:
+                feature.setGeometry(geometria)
+            feature.setAttributes(attrs)
+            features.append(feature)
+        if not sink.addFeatures(features, QgsFeatureSink.FastInsert):
+            feedback.reportError(self.tr('Falha ao gravar feições na camada de saída.'))
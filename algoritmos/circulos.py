@@ -0,0 +1,438 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ circulos
+                                 A QGIS plugin
+ Horizon Projector - Círculos do horizonte, objetos visíveis e anéis
+                             -------------------
+        begin                : 2026-01-11
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Alberto Rodrigues
+        email                : betorodriuges@msn.com
+ ***************************************************************************/
+"""
+
+import numpy as np
+from qgis.PyQt.QtCore import QVariant
+from qgis.core import (
+    QgsFeature, QgsFeatureSink, QgsField, QgsFields, QgsGeometry, QgsProcessing,
+    QgsProcessingException, QgsProcessingMultiStepFeedback,
+    QgsProcessingParameterFeatureSink, QgsProcessingParameterFeatureSource,
+    QgsProcessingParameterField, QgsProcessingParameterNumber, QgsWkbTypes,
+)
+
+from ..horizon_core import circulos, horizonte, indice
+from .base import AlgoritmoHorizonBase, EPSG4326
+
+NM_TO_KM = 1.852
+
+
+class CirculosHorizonteAlgorithm(AlgoritmoHorizonBase):
+    """Círculo do horizonte para cada observador de uma camada de pontos."""
+
+    INPUT = 'INPUT'
+    CAMPO_ALTURA = 'CAMPO_ALTURA'
+    ALTURA = 'ALTURA'
+    TOLERANCIA = 'TOLERANCIA'
+    OUTPUT = 'OUTPUT'
+
+    def name(self):
+        return 'circuloshorizonte'
+
+    def displayName(self):
+        return self.tr('Círculos do horizonte')
+
+    def shortHelpString(self):
+        return self.tr(
+            'Desenha o círculo do horizonte geométrico de cada observador. '
+            'A altura vem de um campo da camada ou de um valor fixo. Em camadas '
+            'grandes, a tesselação pode ser distribuída entre vários processos '
+            '(parâmetros avançados).')
+
+    def initAlgorithm(self, config=None):
+        self.addParameter(QgsProcessingParameterFeatureSource(
+            self.INPUT, self.tr('Observadores'), [QgsProcessing.TypeVectorPoint]))
+        self.addParameter(QgsProcessingParameterField(
+            self.CAMPO_ALTURA, self.tr('Campo da altura do observador (m)'),
+            parentLayerParameterName=self.INPUT,
+            type=QgsProcessingParameterField.Numeric, optional=True))
+        self.addParameter(QgsProcessingParameterNumber(
+            self.ALTURA, self.tr('Altura fixa do observador (m)'),
+            QgsProcessingParameterNumber.Double, defaultValue=1.7, minValue=0.0))
+        self.adicionar_parametro_modelo()
+        self.addParameter(QgsProcessingParameterNumber(
+            self.TOLERANCIA, self.tr('Erro máximo da corda (m)'),
+            QgsProcessingParameterNumber.Double,
+            defaultValue=circulos.TOLERANCIA_CORDA_KM * 1000.0, minValue=0.001))
+        self.adicionar_parametros_execucao()
+        self.addParameter(QgsProcessingParameterFeatureSink(
+            self.OUTPUT, self.tr('Círculos do horizonte'),
+            QgsProcessing.TypeVectorPolygon))
+
+    def processAlgorithm(self, parameters, context, feedback):
+        source = self.parameterAsSource(parameters, self.INPUT, context)
+        if source is None:
+            raise QgsProcessingException(self.invalidSourceError(parameters, self.INPUT))
+
+        altura = self.valor_ou_campo(parameters, self.CAMPO_ALTURA, self.ALTURA, context)
+        modelo = self.nome_modelo(parameters, context)
+        tolerancia_km = self.parameterAsDouble(parameters, self.TOLERANCIA, context) / 1000.0
+
+        fields = self.campos_saida(source, [
+            ('distancia_km', QVariant.Double),
+            ('distancia_nm', QVariant.Double),
+            ('altura_obs_m', QVariant.Double),
+        ])
+        sink, dest_id = self.parameterAsSink(
+            parameters, self.OUTPUT, context, fields, QgsWkbTypes.Polygon, EPSG4326)
+        if sink is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, self.OUTPUT))
+
+        with self.executor(parameters, context) as executor:
+            # Cada leitura alimenta um lote por processo de trabalho
+            tamanho = executor.tamanho_lote * executor.num_processos
+            for atributos, lats, lons, valores in self.lotes(
+                    source, {'altura': altura}, context, feedback, tamanho):
+                alturas = valores['altura']
+                distancias_km = horizonte.distancias_horizonte(alturas)
+                geometrias = self.poligonos_circulos(
+                    executor, modelo, lats, lons, distancias_km, tolerancia_km, feedback)
+                if geometrias is None:
+                    break
+
+                novos = [attrs + [float(d), float(d / NM_TO_KM), float(h)]
+                         for attrs, d, h in zip(atributos, distancias_km, alturas)]
+                self.gravar(sink, fields, geometrias, novos, feedback)
+
+        return {self.OUTPUT: dest_id}
+
+
+class ObjetoVisivelAlgorithm(AlgoritmoHorizonBase):
+    """Alcance de visibilidade entre cada observador e um objeto."""
+
+    INPUT = 'INPUT'
+    CAMPO_ALTURA_OBS = 'CAMPO_ALTURA_OBS'
+    ALTURA_OBS = 'ALTURA_OBS'
+    CAMPO_ALTURA_OBJ = 'CAMPO_ALTURA_OBJ'
+    ALTURA_OBJ = 'ALTURA_OBJ'
+    TOLERANCIA = 'TOLERANCIA'
+    OUTPUT = 'OUTPUT'
+
+    def name(self):
+        return 'objetovisivel'
+
+    def displayName(self):
+        return self.tr('Alcance de objetos visíveis')
+
+    def shortHelpString(self):
+        return self.tr(
+            'Desenha, em torno de cada ponto, o círculo dentro do qual um '
+            'objeto de altura conhecida é geometricamente visível '
+            '(soma das distâncias ao horizonte do observador e do objeto). Em '
+            'camadas grandes, a tesselação pode ser distribuída entre vários '
+            'processos (parâmetros avançados).')
+
+    def initAlgorithm(self, config=None):
+        self.addParameter(QgsProcessingParameterFeatureSource(
+            self.INPUT, self.tr('Pontos'), [QgsProcessing.TypeVectorPoint]))
+        self.addParameter(QgsProcessingParameterField(
+            self.CAMPO_ALTURA_OBS, self.tr('Campo da altura do observador (m)'),
+            parentLayerParameterName=self.INPUT,
+            type=QgsProcessingParameterField.Numeric, optional=True))
+        self.addParameter(QgsProcessingParameterNumber(
+            self.ALTURA_OBS, self.tr('Altura fixa do observador (m)'),
+            QgsProcessingParameterNumber.Double, defaultValue=1.7, minValue=0.0))
+        self.addParameter(QgsProcessingParameterField(
+            self.CAMPO_ALTURA_OBJ, self.tr('Campo da altura do objeto (m)'),
+            parentLayerParameterName=self.INPUT,
+            type=QgsProcessingParameterField.Numeric, optional=True))
+        self.addParameter(QgsProcessingParameterNumber(
+            self.ALTURA_OBJ, self.tr('Altura fixa do objeto (m)'),
+            QgsProcessingParameterNumber.Double, defaultValue=10.0, minValue=0.0))
+        self.adicionar_parametro_modelo()
+        self.addParameter(QgsProcessingParameterNumber(
+            self.TOLERANCIA, self.tr('Erro máximo da corda (m)'),
+            QgsProcessingParameterNumber.Double,
+            defaultValue=circulos.TOLERANCIA_CORDA_KM * 1000.0, minValue=0.001))
+        self.adicionar_parametros_execucao()
+        self.addParameter(QgsProcessingParameterFeatureSink(
+            self.OUTPUT, self.tr('Alcance de visibilidade'),
+            QgsProcessing.TypeVectorPolygon))
+
+    def processAlgorithm(self, parameters, context, feedback):
+        source = self.parameterAsSource(parameters, self.INPUT, context)
+        if source is None:
+            raise QgsProcessingException(self.invalidSourceError(parameters, self.INPUT))
+
+        campos = {
+            'obs': self.valor_ou_campo(parameters, self.CAMPO_ALTURA_OBS, self.ALTURA_OBS, context),
+            'obj': self.valor_ou_campo(parameters, self.CAMPO_ALTURA_OBJ, self.ALTURA_OBJ, context),
+        }
+        modelo = self.nome_modelo(parameters, context)
+        tolerancia_km = self.parameterAsDouble(parameters, self.TOLERANCIA, context) / 1000.0
+
+        fields = self.campos_saida(source, [
+            ('distancia_km', QVariant.Double),
+            ('distancia_nm', QVariant.Double),
+            ('altura_obs_m', QVariant.Double),
+            ('altura_obj_m', QVariant.Double),
+        ])
+        sink, dest_id = self.parameterAsSink(
+            parameters, self.OUTPUT, context, fields, QgsWkbTypes.Polygon, EPSG4326)
+        if sink is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, self.OUTPUT))
+
+        with self.executor(parameters, context) as executor:
+            tamanho = executor.tamanho_lote * executor.num_processos
+            for atributos, lats, lons, valores in self.lotes(
+                    source, campos, context, feedback, tamanho):
+                distancias_km = horizonte.distancias_objeto(valores['obs'], valores['obj'])
+                geometrias = self.poligonos_circulos(
+                    executor, modelo, lats, lons, distancias_km, tolerancia_km, feedback)
+                if geometrias is None:
+                    break
+
+                novos = [attrs + [float(d), float(d / NM_TO_KM), float(h_obs), float(h_obj)]
+                         for attrs, d, h_obs, h_obj in
+                         zip(atributos, distancias_km, valores['obs'], valores['obj'])]
+                self.gravar(sink, fields, geometrias, novos, feedback)
+
+        return {self.OUTPUT: dest_id}
+
+
+class CoberturaAlgorithm(AlgoritmoHorizonBase):
+    """Área coberta pela união dos alcances de visibilidade de muitos objetos."""
+
+    INPUT = 'INPUT'
+    CAMPO_ALTURA_OBS = 'CAMPO_ALTURA_OBS'
+    ALTURA_OBS = 'ALTURA_OBS'
+    CAMPO_ALTURA_OBJ = 'CAMPO_ALTURA_OBJ'
+    ALTURA_OBJ = 'ALTURA_OBJ'
+    TOLERANCIA = 'TOLERANCIA'
+    OUTPUT = 'OUTPUT'
+
+    # Círculos por união no primeiro nível da cascata
+    TAMANHO_GRUPO = 64
+
+    def name(self):
+        return 'cobertura'
+
+    def displayName(self):
+        return self.tr('Cobertura de visibilidade (dissolvida)')
+
+    def shortHelpString(self):
+        return self.tr(
+            'Une os círculos de alcance de visibilidade de todos os objetos '
+            '(p.ex. os faróis de uma costa) num único multipolígono: a área '
+            'de onde ao menos um deles é geometricamente visível. Os círculos '
+            'são ordenados pela curva Z dos centros e unidos em cascata, em '
+            'grupos de vizinhos, em vez de acumulados um a um; milhares de '
+            'círculos se dissolvem em segundos e o mapa ganha uma só feição. '
+            'A tesselação dos círculos pode ser distribuída entre vários '
+            'processos (parâmetros avançados).')
+
+    def initAlgorithm(self, config=None):
+        self.addParameter(QgsProcessingParameterFeatureSource(
+            self.INPUT, self.tr('Objetos'), [QgsProcessing.TypeVectorPoint]))
+        self.addParameter(QgsProcessingParameterField(
+            self.CAMPO_ALTURA_OBS, self.tr('Campo da altura do observador (m)'),
+            parentLayerParameterName=self.INPUT,
+            type=QgsProcessingParameterField.Numeric, optional=True))
+        self.addParameter(QgsProcessingParameterNumber(
+            self.ALTURA_OBS, self.tr('Altura fixa do observador (m)'),
+            QgsProcessingParameterNumber.Double, defaultValue=1.7, minValue=0.0))
+        self.addParameter(QgsProcessingParameterField(
+            self.CAMPO_ALTURA_OBJ, self.tr('Campo da altura do objeto (m)'),
+            parentLayerParameterName=self.INPUT,
+            type=QgsProcessingParameterField.Numeric, optional=True))
+        self.addParameter(QgsProcessingParameterNumber(
+            self.ALTURA_OBJ, self.tr('Altura fixa do objeto (m)'),
+            QgsProcessingParameterNumber.Double, defaultValue=10.0, minValue=0.0))
+        self.adicionar_parametro_modelo()
+        self.addParameter(QgsProcessingParameterNumber(
+            self.TOLERANCIA, self.tr('Erro máximo da corda (m)'),
+            QgsProcessingParameterNumber.Double,
+            defaultValue=circulos.TOLERANCIA_CORDA_KM * 1000.0, minValue=0.001))
+        self.adicionar_parametros_execucao()
+        self.addParameter(QgsProcessingParameterFeatureSink(
+            self.OUTPUT, self.tr('Cobertura de visibilidade'),
+            QgsProcessing.TypeVectorPolygon))
+
+    def processAlgorithm(self, parameters, context, feedback):
+        source = self.parameterAsSource(parameters, self.INPUT, context)
+        if source is None:
+            raise QgsProcessingException(self.invalidSourceError(parameters, self.INPUT))
+
+        campos = {
+            'obs': self.valor_ou_campo(parameters, self.CAMPO_ALTURA_OBS, self.ALTURA_OBS, context),
+            'obj': self.valor_ou_campo(parameters, self.CAMPO_ALTURA_OBJ, self.ALTURA_OBJ, context),
+        }
+        modelo = self.nome_modelo(parameters, context)
+        tolerancia_km = self.parameterAsDouble(parameters, self.TOLERANCIA, context) / 1000.0
+
+        fields = QgsFields()
+        fields.append(QgsField('num_circulos', QVariant.Int))
+        fields.append(QgsField('alcance_min_km', QVariant.Double))
+        fields.append(QgsField('alcance_max_km', QVariant.Double))
+        sink, dest_id = self.parameterAsSink(
+            parameters, self.OUTPUT, context, fields, QgsWkbTypes.MultiPolygon, EPSG4326)
+        if sink is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, self.OUTPUT))
+
+        passos = QgsProcessingMultiStepFeedback(3, feedback)
+        _, lats, lons, valores = self.ler_pontos(source, campos, context, passos)
+        if passos.isCanceled() or len(lats) == 0:
+            return {self.OUTPUT: dest_id}
+        distancias_km = horizonte.distancias_objeto(valores['obs'], valores['obj'])
+
+        # Partição espacial: centros vizinhos ficam juntos na lista
+        ordem = np.argsort(indice.chaves_morton(lats, lons), kind='stable')
+
+        # 1º nível da cascata, lote a lote: só as uniões parciais ficam na memória
+        passos.setCurrentStep(1)
+        parciais = []
+        with self.executor(parameters, context) as executor:
+            tamanho = executor.tamanho_lote * executor.num_processos
+            for inicio in range(0, len(ordem), tamanho):
+                lote = ordem[inicio:inicio + tamanho]
+                geometrias = self.poligonos_circulos(
+                    executor, modelo, lats[lote], lons[lote], distancias_km[lote],
+                    tolerancia_km, passos)
+                if geometrias is None:
+                    return {}
+                for grupo in range(0, len(geometrias), self.TAMANHO_GRUPO):
+                    if passos.isCanceled():
+                        return {}
+                    parciais.append(QgsGeometry.unaryUnion(
+                        geometrias[grupo:grupo + self.TAMANHO_GRUPO]))
+                passos.setProgress(100.0 * min(inicio + tamanho, len(ordem)) / len(ordem))
+
+        # Demais níveis: uniões parciais vizinhas, até sobrar uma
+        passos.setCurrentStep(2)
+        cobertura = self.unir_em_cascata(parciais, passos, self.TAMANHO_GRUPO)
+        if cobertura is None:
+            return {}
+        cobertura.convertToMultiType()
+
+        feature = QgsFeature(fields)
+        feature.setGeometry(cobertura)
+        feature.setAttributes([len(lats), float(distancias_km.min()),
+                               float(distancias_km.max())])
+        sink.addFeature(feature, QgsFeatureSink.FastInsert)
+        passos.setProgress(100)
+
+        return {self.OUTPUT: dest_id}
+
+
+class AneisDistanciaAlgorithm(AlgoritmoHorizonBase):
+    """Anéis de distância (milhas náuticas) em torno de cada ponto."""
+
+    INPUT = 'INPUT'
+    CAMPO_NUM_ANEIS = 'CAMPO_NUM_ANEIS'
+    NUM_ANEIS = 'NUM_ANEIS'
+    CAMPO_INTERVALO = 'CAMPO_INTERVALO'
+    INTERVALO = 'INTERVALO'
+    TOLERANCIA = 'TOLERANCIA'
+    OUTPUT = 'OUTPUT'
+
+    def name(self):
+        return 'aneisdistancia'
+
+    def displayName(self):
+        return self.tr('Anéis de distância')
+
+    def shortHelpString(self):
+        return self.tr(
+            'Desenha anéis concêntricos em milhas náuticas em torno de cada '
+            'ponto. O número de anéis e o intervalo vêm de campos da camada ou '
+            'de valores fixos; centros com menos de um anel ou intervalo não '
+            'positivo são ignorados. Os anéis de um lote de centros são tesselados de uma vez e, '
+            'em camadas grandes, podem ser distribuídos entre vários processos '
+            '(parâmetros avançados).')
+
+    def initAlgorithm(self, config=None):
+        self.addParameter(QgsProcessingParameterFeatureSource(
+            self.INPUT, self.tr('Centros'), [QgsProcessing.TypeVectorPoint]))
+        self.addParameter(QgsProcessingParameterField(
+            self.CAMPO_NUM_ANEIS, self.tr('Campo do número de anéis'),
+            parentLayerParameterName=self.INPUT,
+            type=QgsProcessingParameterField.Numeric, optional=True))
+        self.addParameter(QgsProcessingParameterNumber(
+            self.NUM_ANEIS, self.tr('Número fixo de anéis'),
+            QgsProcessingParameterNumber.Integer, defaultValue=5, minValue=1))
+        self.addParameter(QgsProcessingParameterField(
+            self.CAMPO_INTERVALO, self.tr('Campo do intervalo (NM)'),
+            parentLayerParameterName=self.INPUT,
+            type=QgsProcessingParameterField.Numeric, optional=True))
+        self.addParameter(QgsProcessingParameterNumber(
+            self.INTERVALO, self.tr('Intervalo fixo (NM)'),
+            QgsProcessingParameterNumber.Double, defaultValue=1.0, minValue=0.001))
+        self.adicionar_parametro_modelo()
+        self.addParameter(QgsProcessingParameterNumber(
+            self.TOLERANCIA, self.tr('Erro máximo da corda (m)'),
+            QgsProcessingParameterNumber.Double,
+            defaultValue=circulos.TOLERANCIA_CORDA_KM * 1000.0, minValue=0.001))
+        self.adicionar_parametros_execucao()
+        self.addParameter(QgsProcessingParameterFeatureSink(
+            self.OUTPUT, self.tr('Anéis de distância'),
+            QgsProcessing.TypeVectorPolygon))
+
+    def processAlgorithm(self, parameters, context, feedback):
+        source = self.parameterAsSource(parameters, self.INPUT, context)
+        if source is None:
+            raise QgsProcessingException(self.invalidSourceError(parameters, self.INPUT))
+
+        campos = {
+            'num': self.valor_ou_campo(parameters, self.CAMPO_NUM_ANEIS, self.NUM_ANEIS, context),
+            'intervalo': self.valor_ou_campo(parameters, self.CAMPO_INTERVALO, self.INTERVALO, context),
+        }
+        modelo = self.nome_modelo(parameters, context)
+        tolerancia_km = self.parameterAsDouble(parameters, self.TOLERANCIA, context) / 1000.0
+
+        fields = self.campos_saida(source, [
+            ('anel', QVariant.Int),
+            ('distancia_nm', QVariant.Double),
+            ('distancia_km', QVariant.Double),
+        ])
+        sink, dest_id = self.parameterAsSink(
+            parameters, self.OUTPUT, context, fields, QgsWkbTypes.Polygon, EPSG4326)
+        if sink is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, self.OUTPUT))
+
+        ignorados = 0
+        with self.executor(parameters, context) as executor:
+            # Cada centro vira vários círculos: o lote lido é dividido pelo
+            # número fixo de anéis (estimativa quando ele vem de um campo)
+            num_fixo = max(self.parameterAsInt(parameters, self.NUM_ANEIS, context), 1)
+            tamanho = max(executor.tamanho_lote * executor.num_processos // num_fixo, 1)
+            for atributos, lats, lons, valores in self.lotes(
+                    source, campos, context, feedback, tamanho):
+                num_aneis = np.floor(valores['num']).astype(np.int64)
+                intervalos_nm = valores['intervalo']
+                validos = (num_aneis >= 1) & (intervalos_nm > 0)
+                ignorados += int((~validos).sum())
+                num_aneis = np.where(validos, num_aneis, 0)
+
+                # Todos os anéis do lote de uma vez (centro x anel)
+                centros = np.repeat(np.arange(len(lats)), num_aneis)
+                inicios = np.cumsum(num_aneis) - num_aneis
+                aneis = np.arange(len(centros)) - np.repeat(inicios, num_aneis) + 1
+                distancias_nm = aneis * intervalos_nm[centros]
+                distancias_km = distancias_nm * NM_TO_KM
+
+                geometrias = self.poligonos_circulos(
+                    executor, modelo, lats[centros], lons[centros], distancias_km,
+                    tolerancia_km, feedback)
+                if geometrias is None:
+                    break
+                novos = [atributos[c] + [int(i), float(d_nm), float(d_km)]
+                         for c, i, d_nm, d_km in
+                         zip(centros.tolist(), aneis, distancias_nm, distancias_km)]
+                self.gravar(sink, fields, geometrias, novos, feedback)
+
+        if ignorados:
+            feedback.pushInfo(self.tr(
+                '{} centro(s) com menos de um anel ou intervalo não positivo foram ignorados.'
+            ).format(ignorados))
+
+        return {self.OUTPUT: dest_id}
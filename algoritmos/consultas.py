@@ -0,0 +1,416 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ consultas
+                                 A QGIS plugin
+ Horizon Projector - Consultas de visibilidade sobre camadas de objetos
+                             -------------------
+        begin                : 2026-01-11
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Alberto Rodrigues
+        email                : betorodriuges@msn.com
+ ***************************************************************************/
+"""
+
+import numpy as np
+from qgis.PyQt.QtCore import QVariant
+from qgis.core import (
+    QgsCoordinateTransform, QgsCsException, QgsFeatureRequest, QgsField, QgsFields,
+    QgsGeometry, QgsPointXY, QgsProcessing, QgsProcessingException,
+    QgsProcessingMultiStepFeedback, QgsProcessingParameterFeatureSink,
+    QgsProcessingParameterFeatureSource, QgsProcessingParameterField,
+    QgsProcessingParameterNumber, QgsProcessingParameterPoint, QgsRectangle, QgsWkbTypes,
+)
+
+from ..horizon_core import horizonte, indice
+from .base import AlgoritmoHorizonBase, EPSG4326
+
+NM_TO_KM = 1.852
+
+
+class ObjetosVisiveisAlgorithm(AlgoritmoHorizonBase):
+    """Quais objetos de uma camada são visíveis de um observador."""
+
+    OBSERVADOR = 'OBSERVADOR'
+    ALTURA_OBS = 'ALTURA_OBS'
+    INPUT = 'INPUT'
+    CAMPO_ALTURA_OBJ = 'CAMPO_ALTURA_OBJ'
+    ALTURA_OBJ = 'ALTURA_OBJ'
+    OUTPUT = 'OUTPUT'
+
+    def name(self):
+        return 'objetosvisiveis'
+
+    def displayName(self):
+        return self.tr('Objetos visíveis do observador')
+
+    def shortHelpString(self):
+        return self.tr(
+            'Seleciona os objetos (faróis, torres, picos) de uma camada de '
+            'pontos que são geometricamente visíveis do observador: a '
+            'distância até o objeto não passa da soma das distâncias ao '
+            'horizonte do observador e do objeto. Só os objetos dentro do '
+            'retângulo do maior alcance possível (observador contra o objeto '
+            'mais alto) são lidos da camada, com o filtro por retângulo do '
+            'provedor, que usa o índice espacial da camada quando ela tem um; '
+            'o teste exato só é feito com esses objetos.')
+
+    def initAlgorithm(self, config=None):
+        self.addParameter(QgsProcessingParameterPoint(
+            self.OBSERVADOR, self.tr('Posição do observador')))
+        self.addParameter(QgsProcessingParameterNumber(
+            self.ALTURA_OBS, self.tr('Altura do observador (m)'),
+            QgsProcessingParameterNumber.Double, defaultValue=1.7, minValue=0.0))
+        self.addParameter(QgsProcessingParameterFeatureSource(
+            self.INPUT, self.tr('Objetos'), [QgsProcessing.TypeVectorPoint]))
+        self.addParameter(QgsProcessingParameterField(
+            self.CAMPO_ALTURA_OBJ, self.tr('Campo da altura do objeto (m)'),
+            parentLayerParameterName=self.INPUT,
+            type=QgsProcessingParameterField.Numeric, optional=True))
+        self.addParameter(QgsProcessingParameterNumber(
+            self.ALTURA_OBJ, self.tr('Altura fixa do objeto (m)'),
+            QgsProcessingParameterNumber.Double, defaultValue=10.0, minValue=0.0))
+        self.adicionar_parametro_modelo()
+        self.addParameter(QgsProcessingParameterFeatureSink(
+            self.OUTPUT, self.tr('Objetos visíveis'), QgsProcessing.TypeVectorPoint))
+
+    def processAlgorithm(self, parameters, context, feedback):
+        source = self.parameterAsSource(parameters, self.INPUT, context)
+        if source is None:
+            raise QgsProcessingException(self.invalidSourceError(parameters, self.INPUT))
+
+        observador = self.parameterAsPoint(parameters, self.OBSERVADOR, context, EPSG4326)
+        altura_obs = self.parameterAsDouble(parameters, self.ALTURA_OBS, context)
+        campos = {'obj': self.valor_ou_campo(
+            parameters, self.CAMPO_ALTURA_OBJ, self.ALTURA_OBJ, context)}
+        modelo = self.modelo_geodesico(parameters, context)
+
+        # Só os objetos na caixa do maior alcance saem do provedor; o
+        # IndiceEspacial é montado com eles, a cada execução
+        request = self.requisicao_alcance(
+            source, campos['obj'], observador.y(), observador.x(), altura_obs, context)
+        if request is None:
+            feedback.pushInfo(self.tr(
+                'Sem filtro por retângulo (altura máxima desconhecida ou alcance '
+                'sobre o antimeridiano): todos os objetos serão lidos.'))
+        atributos, lats, lons, valores = self.ler_pontos(
+            source, campos, context, feedback, request=request)
+        if feedback.isCanceled():
+            return {}
+        alturas = valores['obj']
+
+        selecionados, distancias, azimutes, alcances = indice.objetos_visiveis(
+            indice.IndiceEspacial(lats, lons), alturas,
+            observador.y(), observador.x(), altura_obs, modelo)
+        feedback.pushInfo(self.tr('{} de {} objeto(s) visível(is).').format(
+            len(selecionados), len(lats)))
+
+        fields = self.campos_saida(source, [
+            ('distancia_km', QVariant.Double),
+            ('distancia_nm', QVariant.Double),
+            ('azimute', QVariant.Double),
+            ('alcance_km', QVariant.Double),
+            ('folga_km', QVariant.Double),
+            ('altura_obj_m', QVariant.Double),
+        ])
+        sink, dest_id = self.parameterAsSink(
+            parameters, self.OUTPUT, context, fields, QgsWkbTypes.Point, EPSG4326)
+        if sink is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, self.OUTPUT))
+
+        geometrias = [QgsGeometry.fromPointXY(QgsPointXY(lons[i], lats[i]))
+                      for i in selecionados.tolist()]
+        novos = [atributos[i] + [float(d), float(d / NM_TO_KM), float(az),
+                                 float(alcance), float(alcance - d), float(alturas[i])]
+                 for i, d, az, alcance in
+                 zip(selecionados.tolist(), distancias, azimutes, alcances)]
+        self.gravar(sink, fields, geometrias, novos, feedback)
+
+        return {self.OUTPUT: dest_id}
+
+    def requisicao_alcance(self, source, altura_obj, lat, lon, altura_obs, context):
+        """
+        QgsFeatureRequest filtrado pelo retângulo do maior alcance possível
+        (indice.caixas_busca), já no SRC da camada.
+
+        Returns:
+            O pedido, ou None (ler tudo) se a altura máxima dos objetos não é
+            conhecida ou se a caixa cruza o antimeridiano ou não pode ser
+            levada ao SRC da camada
+        """
+        campo, valor_fixo = altura_obj
+        if campo:
+            try:
+                altura_max = float(source.maximumValue(source.fields().lookupField(campo)))
+            except (TypeError, ValueError):
+                return None
+        else:
+            altura_max = valor_fixo
+        caixas = indice.caixas_busca(
+            lat, lon, horizonte.distancia_objeto(altura_obs, altura_max))
+        if len(caixas) > 1:
+            return None
+        transform = QgsCoordinateTransform(
+            EPSG4326, source.sourceCrs(), context.transformContext())
+        try:
+            retangulo = transform.transformBoundingBox(QgsRectangle(*caixas[0]))
+        except QgsCsException:
+            return None
+        request = QgsFeatureRequest()
+        request.setFilterRect(retangulo)
+        return request
+
+
+class VisibilidadeTrajetoAlgorithm(AlgoritmoHorizonBase):
+    """Quando cada objeto surge e some ao longo de um trajeto."""
+
+    TRAJETO = 'TRAJETO'
+    ALTURA_OBS = 'ALTURA_OBS'
+    INPUT = 'INPUT'
+    CAMPO_ALTURA_OBJ = 'CAMPO_ALTURA_OBJ'
+    ALTURA_OBJ = 'ALTURA_OBJ'
+    OUTPUT = 'OUTPUT'
+    TABELA = 'TABELA'
+
+    def name(self):
+        return 'visibilidadetrajeto'
+
+    def displayName(self):
+        return self.tr('Visibilidade ao longo do trajeto')
+
+    def shortHelpString(self):
+        return self.tr(
+            'Para um trajeto (p.ex. um track de GPS) e uma camada de objetos '
+            'com altura (faróis, torres), calcula onde cada objeto surge e '
+            'some no horizonte geométrico. Os pontos do trajeto são indexados '
+            'numa grade e cada objeto só é testado contra os pontos ao seu '
+            'alcance; a posição exata de cada evento é interpolada entre os '
+            'pontos vizinhos. Gera uma camada de pontos com os eventos, em '
+            'ordem ao longo do trajeto, e uma tabela com os trechos em que '
+            'cada objeto fica visível. Trajetos multiparte são tratados parte '
+            'a parte.')
+
+    def initAlgorithm(self, config=None):
+        self.addParameter(QgsProcessingParameterFeatureSource(
+            self.TRAJETO, self.tr('Trajeto'), [QgsProcessing.TypeVectorLine]))
+        self.addParameter(QgsProcessingParameterNumber(
+            self.ALTURA_OBS, self.tr('Altura do observador a bordo (m)'),
+            QgsProcessingParameterNumber.Double, defaultValue=10.0, minValue=0.0))
+        self.addParameter(QgsProcessingParameterFeatureSource(
+            self.INPUT, self.tr('Objetos'), [QgsProcessing.TypeVectorPoint]))
+        self.addParameter(QgsProcessingParameterField(
+            self.CAMPO_ALTURA_OBJ, self.tr('Campo da altura do objeto (m)'),
+            parentLayerParameterName=self.INPUT,
+            type=QgsProcessingParameterField.Numeric, optional=True))
+        self.addParameter(QgsProcessingParameterNumber(
+            self.ALTURA_OBJ, self.tr('Altura fixa do objeto (m)'),
+            QgsProcessingParameterNumber.Double, defaultValue=10.0, minValue=0.0))
+        self.adicionar_parametro_modelo()
+        self.addParameter(QgsProcessingParameterFeatureSink(
+            self.OUTPUT, self.tr('Eventos de visibilidade'), QgsProcessing.TypeVectorPoint))
+        self.addParameter(QgsProcessingParameterFeatureSink(
+            self.TABELA, self.tr('Trechos visíveis'), QgsProcessing.TypeVector))
+
+    def trajetos(self, source, context):
+        """Partes do trajeto, em WGS84: (fid, parte, lats, lons)."""
+        transform = QgsCoordinateTransform(
+            source.sourceCrs(), EPSG4326, context.transformContext())
+        for feature in source.getFeatures():
+            geometria = feature.geometry()
+            if geometria.isNull() or geometria.isEmpty():
+                continue
+            partes = (geometria.asMultiPolyline() if geometria.isMultipart()
+                      else [geometria.asPolyline()])
+            for numero, parte in enumerate(partes):
+                if len(parte) < 2:
+                    continue
+                pontos = [transform.transform(p) for p in parte]
+                yield (feature.id(), numero,
+                       np.array([p.y() for p in pontos]),
+                       np.array([p.x() for p in pontos]))
+
+    def processAlgorithm(self, parameters, context, feedback):
+        trajeto = self.parameterAsSource(parameters, self.TRAJETO, context)
+        if trajeto is None:
+            raise QgsProcessingException(self.invalidSourceError(parameters, self.TRAJETO))
+        source = self.parameterAsSource(parameters, self.INPUT, context)
+        if source is None:
+            raise QgsProcessingException(self.invalidSourceError(parameters, self.INPUT))
+
+        altura_obs = self.parameterAsDouble(parameters, self.ALTURA_OBS, context)
+        campos = {'obj': self.valor_ou_campo(
+            parameters, self.CAMPO_ALTURA_OBJ, self.ALTURA_OBJ, context)}
+        modelo = self.modelo_geodesico(parameters, context)
+
+        fields = self.campos_saida(source, [
+            ('trajeto_fid', QVariant.LongLong),
+            ('parte', QVariant.Int),
+            ('evento', QVariant.String),
+            ('km_trajeto', QVariant.Double),
+            ('posicao', QVariant.Double),
+            ('azimute', QVariant.Double),
+            ('alcance_km', QVariant.Double),
+            ('visiveis', QVariant.Int),
+        ])
+        sink, dest_id = self.parameterAsSink(
+            parameters, self.OUTPUT, context, fields, QgsWkbTypes.Point, EPSG4326)
+        if sink is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, self.OUTPUT))
+        fields_tabela = self.campos_saida(source, [
+            ('trajeto_fid', QVariant.LongLong),
+            ('parte', QVariant.Int),
+            ('inicio_km', QVariant.Double),
+            ('fim_km', QVariant.Double),
+            ('extensao_km', QVariant.Double),
+            ('visivel_no_inicio', QVariant.Bool),
+            ('visivel_no_fim', QVariant.Bool),
+        ])
+        sink_tabela, tabela_id = self.parameterAsSink(
+            parameters, self.TABELA, context, fields_tabela, QgsWkbTypes.NoGeometry)
+        if sink_tabela is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, self.TABELA))
+
+        passos = QgsProcessingMultiStepFeedback(2, feedback)
+        atributos, lats_obj, lons_obj, valores = self.ler_pontos(source, campos, context, passos)
+        if passos.isCanceled():
+            return {}
+        alcances = horizonte.distancias_objeto(altura_obs, valores['obj'])
+
+        passos.setCurrentStep(1)
+        partes = list(self.trajetos(trajeto, context))
+        for numero, (fid, parte, lats, lons) in enumerate(partes):
+            if passos.isCanceled():
+                break
+            eventos, intervalos = indice.eventos_trajeto(
+                lats, lons, lats_obj, lons_obj, valores['obj'], altura_obs, modelo)
+            km = indice.distancias_acumuladas(lats, lons, modelo)
+            posicoes = np.arange(lats.size)
+
+            # Eventos, em ordem ao longo do trajeto
+            objetos = eventos['objeto']
+            lats_ev, lons_ev = indice.posicoes_trajeto(lats, lons, eventos['posicao'])
+            _, azimutes, _ = modelo.inverso(lats_ev, lons_ev, lats_obj[objetos], lons_obj[objetos])
+            geometrias = [QgsGeometry.fromPointXY(QgsPointXY(lon, lat))
+                          for lat, lon in zip(lats_ev.tolist(), lons_ev.tolist())]
+            novos = [atributos[j] + [fid, parte,
+                                     'surge' if tipo == indice.SURGE else 'some',
+                                     float(np.interp(pos, posicoes, km)), float(pos),
+                                     float(az % 360.0), float(alcances[j]), int(vis)]
+                     for j, tipo, pos, az, vis in
+                     zip(objetos.tolist(), eventos['tipo'].tolist(),
+                         eventos['posicao'].tolist(), azimutes.tolist(),
+                         eventos['visiveis'].tolist())]
+            self.gravar(sink, fields, geometrias, novos, passos)
+
+            # Trechos visíveis de cada objeto
+            inicios_km = np.interp(intervalos['inicio'], posicoes, km)
+            fins_km = np.interp(intervalos['fim'], posicoes, km)
+            novos = [atributos[j] + [fid, parte, float(inicio), float(fim),
+                                     float(fim - inicio), bool(pos_inicio == 0.0),
+                                     bool(pos_fim == lats.size - 1)]
+                     for j, inicio, fim, pos_inicio, pos_fim in
+                     zip(intervalos['objeto'].tolist(), inicios_km, fins_km,
+                         intervalos['inicio'].tolist(), intervalos['fim'].tolist())]
+            self.gravar(sink_tabela, fields_tabela, [None] * len(novos), novos, passos)
+            passos.setProgress(100.0 * (numero + 1) / len(partes))
+
+        return {self.OUTPUT: dest_id, self.TABELA: tabela_id}
+
+
+class IntervisibilidadeAlgorithm(AlgoritmoHorizonBase):
+    """Pares de pontos que se enxergam mutuamente."""
+
+    INPUT = 'INPUT'
+    CAMPO_ID = 'CAMPO_ID'
+    CAMPO_ALTURA = 'CAMPO_ALTURA'
+    ALTURA = 'ALTURA'
+    OUTPUT = 'OUTPUT'
+
+    def name(self):
+        return 'intervisibilidade'
+
+    def displayName(self):
+        return self.tr('Intervisibilidade entre pontos')
+
+    def shortHelpString(self):
+        return self.tr(
+            'Liga por uma linha cada par de pontos (antenas, estações '
+            'costeiras) que se enxergam geometricamente: a distância entre '
+            'eles não passa da soma das distâncias ao horizonte das duas '
+            'alturas. Só os pares ao alcance, achados num índice espacial, '
+            'são testados, então o custo cresce quase linearmente com o '
+            'número de pontos em redes esparsas. O resultado é uma lista de '
+            'arestas, uma por par.')
+
+    def initAlgorithm(self, config=None):
+        self.addParameter(QgsProcessingParameterFeatureSource(
+            self.INPUT, self.tr('Pontos'), [QgsProcessing.TypeVectorPoint]))
+        self.addParameter(QgsProcessingParameterField(
+            self.CAMPO_ID, self.tr('Campo identificador (padrão: ordem de leitura)'),
+            parentLayerParameterName=self.INPUT, optional=True))
+        self.addParameter(QgsProcessingParameterField(
+            self.CAMPO_ALTURA, self.tr('Campo da altura (m)'),
+            parentLayerParameterName=self.INPUT,
+            type=QgsProcessingParameterField.Numeric, optional=True))
+        self.addParameter(QgsProcessingParameterNumber(
+            self.ALTURA, self.tr('Altura fixa (m)'),
+            QgsProcessingParameterNumber.Double, defaultValue=30.0, minValue=0.0))
+        self.adicionar_parametro_modelo()
+        self.addParameter(QgsProcessingParameterFeatureSink(
+            self.OUTPUT, self.tr('Pares intervisíveis'), QgsProcessing.TypeVectorLine))
+
+    def processAlgorithm(self, parameters, context, feedback):
+        source = self.parameterAsSource(parameters, self.INPUT, context)
+        if source is None:
+            raise QgsProcessingException(self.invalidSourceError(parameters, self.INPUT))
+
+        campo_id = self.parameterAsString(parameters, self.CAMPO_ID, context)
+        campos = {'altura': self.valor_ou_campo(
+            parameters, self.CAMPO_ALTURA, self.ALTURA, context)}
+        modelo = self.modelo_geodesico(parameters, context)
+
+        atributos, lats, lons, valores = self.ler_pontos(source, campos, context, feedback)
+        if feedback.isCanceled():
+            return {}
+        if campo_id:
+            posicao_id = source.fields().lookupField(campo_id)
+            ids = [str(attrs[posicao_id]) for attrs in atributos]
+        else:
+            ids = [str(numero) for numero in range(len(atributos))]
+        alturas = valores['altura']
+
+        origens, destinos, distancias, alcances = indice.pares_intervisiveis(
+            indice.IndiceEspacial(lats, lons), alturas, modelo)
+        feedback.pushInfo(self.tr('{} par(es) intervisível(is) entre {} ponto(s).').format(
+            len(origens), len(lats)))
+
+        fields = QgsFields()
+        for nome, tipo in [('origem', QVariant.String), ('destino', QVariant.String),
+                           ('altura_origem_m', QVariant.Double),
+                           ('altura_destino_m', QVariant.Double),
+                           ('distancia_km', QVariant.Double),
+                           ('distancia_nm', QVariant.Double),
+                           ('alcance_km', QVariant.Double),
+                           ('folga_km', QVariant.Double)]:
+            fields.append(QgsField(nome, tipo))
+        sink, dest_id = self.parameterAsSink(
+            parameters, self.OUTPUT, context, fields, QgsWkbTypes.LineString, EPSG4326)
+        if sink is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, self.OUTPUT))
+
+        for inicio in range(0, len(origens), self.TAMANHO_LOTE):
+            if feedback.isCanceled():
+                break
+            fatia = slice(inicio, inicio + self.TAMANHO_LOTE)
+            geometrias = [self.geometria_linha([lats[i], lats[j]], [lons[i], lons[j]])
+                          for i, j in zip(origens[fatia].tolist(), destinos[fatia].tolist())]
+            novos = [[ids[i], ids[j], float(alturas[i]), float(alturas[j]), float(d),
+                      float(d / NM_TO_KM), float(alcance), float(alcance - d)]
+                     for i, j, d, alcance in
+                     zip(origens[fatia].tolist(), destinos[fatia].tolist(),
+                         distancias[fatia].tolist(), alcances[fatia].tolist())]
+            self.gravar(sink, fields, geometrias, novos, feedback)
+            feedback.setProgress(100.0 * min(inicio + self.TAMANHO_LOTE, len(origens))
+                                 / len(origens))
+
+        return {self.OUTPUT: dest_id}
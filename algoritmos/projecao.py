@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ projecao
+                                 A QGIS plugin
+ Horizon Projector - Projeção de pontos por azimute e distância
+                             -------------------
+        begin                : 2026-01-11
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Alberto Rodrigues
+        email                : betorodriuges@msn.com
+ ***************************************************************************/
+"""
+
+import numpy as np
+from qgis.PyQt.QtCore import QVariant
+from qgis.core import (
+    QgsProcessing, QgsProcessingException, QgsProcessingParameterFeatureSink,
+    QgsProcessingParameterFeatureSource, QgsProcessingParameterField,
+    QgsProcessingParameterNumber, QgsWkbTypes,
+)
+
+from ..horizon_core import circulos, paralelo
+from .base import AlgoritmoHorizonBase, EPSG4326
+
+
+class ProjecaoAlgorithm(AlgoritmoHorizonBase):
+    """Linha de cada ponto até o destino dado por azimute e distância."""
+
+    INPUT = 'INPUT'
+    CAMPO_AZIMUTE = 'CAMPO_AZIMUTE'
+    AZIMUTE = 'AZIMUTE'
+    CAMPO_DISTANCIA = 'CAMPO_DISTANCIA'
+    DISTANCIA = 'DISTANCIA'
+    DECLINACAO = 'DECLINACAO'
+    OUTPUT = 'OUTPUT'
+
+    def name(self):
+        return 'projecao'
+
+    def displayName(self):
+        return self.tr('Projeção por azimute e distância')
+
+    def shortHelpString(self):
+        return self.tr(
+            'Projeta cada ponto ao longo de um azimute magnético (corrigido '
+            'pela declinação) por uma distância em km e desenha a linha '
+            'geodésica até o destino, com {} segmentos sobre a geodésica do '
+            'modelo da Terra escolhido. Em camadas muito grandes, o cálculo pode '
+            'ser distribuído entre vários processos (parâmetros avançados).'
+        ).format(circulos.SEGMENTOS_GEODESICA)
+
+    def initAlgorithm(self, config=None):
+        self.addParameter(QgsProcessingParameterFeatureSource(
+            self.INPUT, self.tr('Pontos de origem'), [QgsProcessing.TypeVectorPoint]))
+        self.addParameter(QgsProcessingParameterField(
+            self.CAMPO_AZIMUTE, self.tr('Campo do azimute magnético (°)'),
+            parentLayerParameterName=self.INPUT,
+            type=QgsProcessingParameterField.Numeric, optional=True))
+        self.addParameter(QgsProcessingParameterNumber(
+            self.AZIMUTE, self.tr('Azimute magnético fixo (°)'),
+            QgsProcessingParameterNumber.Double, defaultValue=0.0,
+            minValue=0.0, maxValue=360.0))
+        self.addParameter(QgsProcessingParameterField(
+            self.CAMPO_DISTANCIA, self.tr('Campo da distância (km)'),
+            parentLayerParameterName=self.INPUT,
+            type=QgsProcessingParameterField.Numeric, optional=True))
+        self.addParameter(QgsProcessingParameterNumber(
+            self.DISTANCIA, self.tr('Distância fixa (km)'),
+            QgsProcessingParameterNumber.Double, defaultValue=10.0, minValue=0.0))
+        self.addParameter(QgsProcessingParameterNumber(
+            self.DECLINACAO, self.tr('Declinação magnética (°)'),
+            QgsProcessingParameterNumber.Double, defaultValue=-23.0,
+            minValue=-180.0, maxValue=180.0))
+        self.adicionar_parametro_modelo()
+        self.adicionar_parametros_execucao()
+        self.addParameter(QgsProcessingParameterFeatureSink(
+            self.OUTPUT, self.tr('Projeções'), QgsProcessing.TypeVectorLine))
+
+    def processAlgorithm(self, parameters, context, feedback):
+        source = self.parameterAsSource(parameters, self.INPUT, context)
+        if source is None:
+            raise QgsProcessingException(self.invalidSourceError(parameters, self.INPUT))
+
+        campos = {
+            'azimute': self.valor_ou_campo(parameters, self.CAMPO_AZIMUTE, self.AZIMUTE, context),
+            'distancia': self.valor_ou_campo(parameters, self.CAMPO_DISTANCIA, self.DISTANCIA, context),
+        }
+        declinacao = self.parameterAsDouble(parameters, self.DECLINACAO, context)
+        modelo = self.MODELOS[self.parameterAsEnum(parameters, self.MODELO, context)]
+
+        fields = self.campos_saida(source, [
+            ('azimute_mag', QVariant.Double),
+            ('azimute_verd', QVariant.Double),
+            ('distancia_km', QVariant.Double),
+            ('lat_destino', QVariant.Double),
+            ('lon_destino', QVariant.Double),
+        ])
+        sink, dest_id = self.parameterAsSink(
+            parameters, self.OUTPUT, context, fields, QgsWkbTypes.LineString, EPSG4326)
+        if sink is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, self.OUTPUT))
+
+        with self.executor(parameters, context) as executor:
+            # Cada leitura alimenta um lote por processo de trabalho
+            tamanho = executor.tamanho_lote * executor.num_processos
+            for atributos, lats, lons, valores in self.lotes(
+                    source, campos, context, feedback, tamanho):
+                azimutes_mag = valores['azimute']
+                distancias = valores['distancia']
+                azimutes_verd = np.mod(azimutes_mag + declinacao, 360.0)
+                linhas = executor.mapear(
+                    paralelo.kernel_geodesicas,
+                    {'lat': lats, 'lon': lons, 'azimute': azimutes_verd,
+                     'distancia_km': distancias},
+                    {'modelo': modelo}, cancelado=feedback.isCanceled)
+                if linhas is None:
+                    break
+                lats_alvo, lons_alvo = linhas['lats'][:, -1], linhas['lons'][:, -1]
+
+                geometrias = [self.geometria_linha(lats_linha, lons_linha)
+                              for lats_linha, lons_linha in zip(linhas['lats'], linhas['lons'])]
+                novos = [attrs + [float(az_mag), float(az_verd), float(d),
+                                  float(lat_alvo), float(lon_alvo)]
+                         for attrs, az_mag, az_verd, d, lat_alvo, lon_alvo in
+                         zip(atributos, azimutes_mag, azimutes_verd, distancias,
+                             lats_alvo, lons_alvo)]
+                self.gravar(sink, fields, geometrias, novos, feedback)
+
+        return {self.OUTPUT: dest_id}
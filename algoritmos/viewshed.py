@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ viewshed
+                                 A QGIS plugin
+ Horizon Projector - Viewshed cumulativo de muitos observadores
+                             -------------------
+        begin                : 2026-01-11
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Alberto Rodrigues
+        email                : betorodriuges@msn.com
+ ***************************************************************************/
+"""
+
+import os
+
+import numpy as np
+from qgis.core import (
+    Qgis, QgsProcessing, QgsProcessingException, QgsProcessingMultiStepFeedback,
+    QgsProcessingParameterDefinition, QgsProcessingParameterFeatureSource,
+    QgsProcessingParameterField, QgsProcessingParameterNumber,
+    QgsProcessingParameterRasterDestination, QgsProcessingParameterRasterLayer,
+    QgsProcessingUtils,
+)
+
+from .. import terreno
+from ..horizon_core import horizonte, visibilidade
+from .base import AlgoritmoHorizonBase
+
+
+class ViewshedCumulativoAlgorithm(AlgoritmoHorizonBase):
+    """Quantos observadores enxergam cada célula do MDE."""
+
+    INPUT = 'INPUT'
+    MDE = 'MDE'
+    CAMPO_ALTURA_OBS = 'CAMPO_ALTURA_OBS'
+    ALTURA_OBS = 'ALTURA_OBS'
+    ALTURA_ALVO = 'ALTURA_ALVO'
+    REFRACAO = 'REFRACAO'
+    TAMANHO_BLOCO = 'TAMANHO_BLOCO'
+    MAX_BLOCOS = 'MAX_BLOCOS'
+    OUTPUT = 'OUTPUT'
+
+    TAMANHO_BLOCO_PADRAO = 512
+    MAX_BLOCOS_PADRAO = 4
+
+    def name(self):
+        return 'viewshedcumulativo'
+
+    def displayName(self):
+        return self.tr('Viewshed cumulativo')
+
+    def shortHelpString(self):
+        return self.tr(
+            'Conta, para cada célula do MDE, quantos observadores a enxergam, '
+            'considerando a curvatura da Terra. O MDE é lido em blocos e cada '
+            'observador só visita os blocos dentro do seu alcance (distância '
+            'geométrica até um alvo na maior altitude do MDE). As contagens '
+            'são somadas num arquivo mapeado em memória, então o consumo de '
+            'memória não cresce com o tamanho do MDE nem com o número de '
+            'observadores, mas sim com o alcance: cada observador monta uma '
+            'janela do retângulo do seu alcance, com cerca de {} bytes por '
+            'célula. O alcance é recortado para no máximo N blocos para cada '
+            'lado do observador, o que limita a janela a (2 × N × lado + 1)² '
+            'células (com os valores padrão, N = {} e lado = {}, cerca de {} '
+            'MB). Com N = 0 o alcance não é recortado e a janela pode cobrir '
+            'o MDE inteiro.').format(
+                visibilidade.BYTES_POR_CELULA_JANELA, self.MAX_BLOCOS_PADRAO,
+                self.TAMANHO_BLOCO_PADRAO, round(self.memoria_janela_mb(
+                    self.MAX_BLOCOS_PADRAO, self.TAMANHO_BLOCO_PADRAO)))
+
+    @staticmethod
+    def memoria_janela_mb(max_blocos, tamanho_bloco):
+        """Memória (MB) da maior janela de um observador com max_blocos."""
+        lado = 2 * max_blocos * tamanho_bloco + 1
+        return lado * lado * visibilidade.BYTES_POR_CELULA_JANELA / 2 ** 20
+
+    def initAlgorithm(self, config=None):
+        self.addParameter(QgsProcessingParameterFeatureSource(
+            self.INPUT, self.tr('Observadores'), [QgsProcessing.TypeVectorPoint]))
+        self.addParameter(QgsProcessingParameterRasterLayer(
+            self.MDE, self.tr('Modelo de elevação (MDE)')))
+        self.addParameter(QgsProcessingParameterField(
+            self.CAMPO_ALTURA_OBS, self.tr('Campo da altura do observador (m)'),
+            parentLayerParameterName=self.INPUT,
+            type=QgsProcessingParameterField.Numeric, optional=True))
+        self.addParameter(QgsProcessingParameterNumber(
+            self.ALTURA_OBS, self.tr('Altura fixa do observador (m)'),
+            QgsProcessingParameterNumber.Double, defaultValue=1.7, minValue=0.0))
+        self.addParameter(QgsProcessingParameterNumber(
+            self.ALTURA_ALVO, self.tr('Altura do alvo acima do terreno (m)'),
+            QgsProcessingParameterNumber.Double, defaultValue=0.0, minValue=0.0))
+        self.addParameter(QgsProcessingParameterNumber(
+            self.REFRACAO, self.tr('Coeficiente de refração'),
+            QgsProcessingParameterNumber.Double,
+            defaultValue=visibilidade.REFRACAO_PADRAO, minValue=0.0, maxValue=1.0))
+        bloco = QgsProcessingParameterNumber(
+            self.TAMANHO_BLOCO, self.tr('Lado dos blocos do MDE (células)'),
+            QgsProcessingParameterNumber.Integer,
+            defaultValue=self.TAMANHO_BLOCO_PADRAO, minValue=16)
+        bloco.setFlags(bloco.flags() | QgsProcessingParameterDefinition.FlagAdvanced)
+        self.addParameter(bloco)
+        max_blocos = QgsProcessingParameterNumber(
+            self.MAX_BLOCOS,
+            self.tr('Alcance máximo (blocos para cada lado do observador, 0 = sem limite)'),
+            QgsProcessingParameterNumber.Integer,
+            defaultValue=self.MAX_BLOCOS_PADRAO, minValue=0)
+        max_blocos.setFlags(max_blocos.flags() | QgsProcessingParameterDefinition.FlagAdvanced)
+        self.addParameter(max_blocos)
+        self.addParameter(QgsProcessingParameterRasterDestination(
+            self.OUTPUT, self.tr('Viewshed cumulativo')))
+
+    def processAlgorithm(self, parameters, context, feedback):
+        source = self.parameterAsSource(parameters, self.INPUT, context)
+        if source is None:
+            raise QgsProcessingException(self.invalidSourceError(parameters, self.INPUT))
+        camada_mde = self.parameterAsRasterLayer(parameters, self.MDE, context)
+        if camada_mde is None:
+            raise QgsProcessingException(self.invalidRasterError(parameters, self.MDE))
+
+        altura = self.valor_ou_campo(parameters, self.CAMPO_ALTURA_OBS, self.ALTURA_OBS, context)
+        altura_alvo = self.parameterAsDouble(parameters, self.ALTURA_ALVO, context)
+        refracao = self.parameterAsDouble(parameters, self.REFRACAO, context)
+        tamanho_bloco = self.parameterAsInt(parameters, self.TAMANHO_BLOCO, context)
+        max_blocos = self.parameterAsInt(parameters, self.MAX_BLOCOS, context) or None
+        destino = self.parameterAsOutputLayer(parameters, self.OUTPUT, context)
+
+        provedor = camada_mde.dataProvider().clone()
+        forma = (provedor.ySize(), provedor.xSize())
+        extent = provedor.extent()
+        res_y = extent.height() / forma[0]
+        z_max = terreno.altitude_maxima(provedor)
+        # Altitude do terreno sob os observadores, lida em blocos com cache
+        amostrador = terreno.AmostradorTerreno(provedor, max_blocos=16)
+
+        passos = QgsProcessingMultiStepFeedback(3, feedback)
+
+        # 1. Observadores -> células do MDE e alcance
+        observadores = []
+        fora = 0
+        for _, lats, lons, valores in self.lotes(
+                source, {'altura': altura}, context, passos):
+            for lat, lon, h in zip(lats, lons, valores['altura']):
+                celula = terreno.celula_do_ponto(provedor, lat, lon, context.transformContext())
+                if celula is None:
+                    fora += 1
+                    continue
+                linha, coluna = celula
+                z_chao = float(amostrador.mde.valores(linha, coluna))
+                if np.isnan(z_chao):
+                    fora += 1
+                    continue
+                alcance_km = horizonte.distancia_objeto(
+                    max(z_chao, 0.0) + h, z_max + altura_alvo)
+                observadores.append((linha, coluna, float(h), alcance_km * 1000.0))
+        if fora:
+            feedback.pushInfo(self.tr(
+                '{} observador(es) fora do MDE ou sobre células sem dados foram ignorados.'
+            ).format(fora))
+        if not observadores:
+            raise QgsProcessingException(self.tr('Nenhum observador sobre o MDE.'))
+
+        if provedor.crs().isGeographic():
+            def tamanho_celula(linha):
+                lat = extent.yMaximum() - (linha + 0.5) * res_y
+                return terreno.tamanho_celula_m(provedor, lat)
+        else:
+            tamanho_celula = terreno.tamanho_celula_m(provedor, 0.0)
+
+        if max_blocos is not None:
+            def recortado(observador):
+                linha, _, _, alcance_m = observador
+                dy, dx = tamanho_celula(linha) if callable(tamanho_celula) else tamanho_celula
+                return alcance_m > visibilidade.alcance_maximo_m(
+                    tamanho_bloco, max_blocos, dy, dx)
+
+            recortados = sum(1 for observador in observadores if recortado(observador))
+            if recortados:
+                feedback.pushInfo(self.tr(
+                    '{} observador(es) com alcance recortado a {} bloco(s) para cada '
+                    'lado (janela de até {:.0f} MB).').format(
+                        recortados, max_blocos,
+                        self.memoria_janela_mb(max_blocos, tamanho_bloco)))
+
+        def ler_bloco(bl, bc):
+            linha0, coluna0 = bl * tamanho_bloco, bc * tamanho_bloco
+            return terreno.ler_janela(
+                provedor, linha0, min(linha0 + tamanho_bloco, forma[0]),
+                coluna0, min(coluna0 + tamanho_bloco, forma[1]))
+
+        # 2. Varredura, somando num arquivo mapeado em memória
+        passos.setCurrentStep(1)
+        tipo = Qgis.UInt16 if len(observadores) < 65535 else Qgis.UInt32
+        caminho_contagem = QgsProcessingUtils.generateTempFilename('contagem.npy')
+        contagem = np.lib.format.open_memmap(
+            caminho_contagem, mode='w+', dtype=terreno.TIPOS_NUMPY[tipo], shape=forma)
+        try:
+            somados = visibilidade.viewshed_cumulativo(
+                ler_bloco, forma, tamanho_bloco, observadores, tamanho_celula, contagem,
+                altura_alvo, refracao=refracao,
+                progresso=lambda f: passos.setProgress(100.0 * f),
+                cancelado=passos.isCanceled, max_blocos=max_blocos)
+            if passos.isCanceled():
+                # A contagem parcial é descartada; nenhum raster é gravado
+                raise QgsProcessingException(
+                    self.tr('Viewshed cumulativo cancelado; nenhum raster foi gravado.'))
+            feedback.pushInfo(self.tr('{} observador(es) somados.').format(somados))
+
+            # 3. Contagens -> GeoTIFF, uma faixa de linhas por vez
+            passos.setCurrentStep(2)
+            try:
+                terreno.gravar_raster(destino, contagem, extent, provedor.crs(), tipo,
+                                      linhas_por_faixa=max(tamanho_bloco, 1))
+            except Exception:
+                # Não deixa um GeoTIFF pela metade no destino
+                if os.path.exists(destino):
+                    os.remove(destino)
+                raise
+        finally:
+            del contagem
+            if os.path.exists(caminho_contagem):
+                os.remove(caminho_contagem)
+
+        return {self.OUTPUT: destino}
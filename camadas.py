@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ camadas
+                                 A QGIS plugin
+ Horizon Projector - Camadas de resultado e seu ciclo de vida no projeto
+                             -------------------
+        begin                : 2026-01-11
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Alberto Rodrigues
+        email                : betorodriuges@msn.com
+ ***************************************************************************/
+
+ As camadas criadas pelo plugin ficam num grupo próprio da árvore de camadas
+ e são rastreadas pelo id, nunca por referência: quando o usuário remove uma
+ camada (ou fecha o projeto), os sinais do QgsProject a tiram da lista.
+
+ No modo acumulado, cada resultado vira feições anexadas a uma camada
+ persistente por tipo de geometria (com índice espacial), em vez de novas
+ camadas de memória a cada clique.
+"""
+
+import re
+
+from qgis.PyQt.QtCore import QObject, QVariant
+from qgis.core import (
+    QgsCategorizedSymbolRenderer, QgsFeature, QgsField, QgsProject,
+    QgsRendererCategory, QgsSymbol, QgsVectorLayer, QgsWkbTypes,
+)
+
+NOME_GRUPO = "Horizon Projector"
+
+# Nome das camadas persistentes por tipo de geometria
+NOMES_PERSISTENTES = {
+    QgsWkbTypes.PointGeometry: "Resultados - Pontos",
+    QgsWkbTypes.LineGeometry: "Resultados - Linhas",
+    QgsWkbTypes.PolygonGeometry: "Resultados - Polígonos",
+}
+
+# Campos próprios das camadas persistentes: o tipo de resultado (usado na
+# simbologia), o nome que a camada avulsa teria e o número do desenho
+CAMPO_CAMADA = "camada"
+CAMPO_RESULTADO = "resultado"
+CAMPO_LOTE = "lote"
+
+
+def tipo_resultado(nome):
+    """Tipo do resultado a partir do nome da camada: "Horizonte (12.34 km)" -> "Horizonte"."""
+    return re.sub(r'\s*\(.*\)\s*$', '', nome) or nome
+
+
+def _simbolo(camada):
+    """Símbolo que representa a camada avulsa na camada persistente."""
+    renderer = camada.renderer()
+    if renderer is not None:
+        if hasattr(renderer, 'symbol') and renderer.symbol() is not None:
+            return renderer.symbol().clone()
+        if isinstance(renderer, QgsCategorizedSymbolRenderer) and renderer.categories():
+            return renderer.categories()[0].symbol().clone()
+    return QgsSymbol.defaultSymbol(camada.geometryType())
+
+
+class GerenciadorCamadas(QObject):
+    """
+    Camadas criadas pelo plugin: adiciona no grupo do plugin, anexa
+    resultados às camadas persistentes e remove tudo de uma vez.
+    """
+
+    def __init__(self, projeto=None, parent=None):
+        super(GerenciadorCamadas, self).__init__(parent)
+        self.projeto = projeto or QgsProject.instance()
+        # Ids em ordem de criação e id da camada persistente por tipo de geometria
+        self._ids = []
+        self._persistentes = {}
+        self._lote = 0
+        self.projeto.layersWillBeRemoved.connect(self._removidas)
+        self.projeto.cleared.connect(self._esquecer)
+
+    def desconectar(self):
+        """Desliga os sinais do projeto (ao descarregar o plugin)."""
+        self.projeto.layersWillBeRemoved.disconnect(self._removidas)
+        self.projeto.cleared.disconnect(self._esquecer)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def camadas(self):
+        """Camadas do plugin ainda presentes no projeto, em ordem de criação."""
+        camadas = (self.projeto.mapLayer(id_) for id_ in self._ids)
+        return [camada for camada in camadas if camada is not None]
+
+    def grupo(self):
+        """Grupo do plugin na árvore de camadas (criado no topo se não existir)."""
+        raiz = self.projeto.layerTreeRoot()
+        grupo = raiz.findGroup(NOME_GRUPO)
+        if grupo is None:
+            grupo = raiz.insertGroup(0, NOME_GRUPO)
+        return grupo
+
+    def adicionar(self, camadas):
+        """Adiciona camadas avulsas ao projeto, dentro do grupo do plugin."""
+        grupo = self.grupo()
+        for camada in camadas:
+            self.projeto.addMapLayer(camada, False)
+            grupo.addLayer(camada)
+            self._ids.append(camada.id())
+        return camadas
+
+    def anexar(self, camadas):
+        """
+        Anexa as feições das camadas vetoriais às camadas persistentes do seu
+        tipo de geometria; as demais (rasters, tabelas) são adicionadas
+        avulsas. As camadas de entrada, de memória, são descartadas.
+
+        Returns:
+            Camadas do projeto que receberam os resultados
+        """
+        self._lote += 1
+        destino = []
+        for camada in camadas:
+            if (not isinstance(camada, QgsVectorLayer)
+                    or camada.geometryType() not in NOMES_PERSISTENTES):
+                destino.extend(self.adicionar([camada]))
+                continue
+            persistente = self._camada_persistente(camada)
+            self._anexar_feicoes(persistente, camada)
+            if persistente not in destino:
+                destino.append(persistente)
+        return destino
+
+    def remover_todas(self):
+        """Remove todas as camadas do plugin numa só operação e o grupo, se vazio."""
+        ids = [camada.id() for camada in self.camadas()]
+        if ids:
+            self.projeto.removeMapLayers(ids)
+        grupo = self.projeto.layerTreeRoot().findGroup(NOME_GRUPO)
+        if grupo is not None and not grupo.children():
+            self.projeto.layerTreeRoot().removeChildNode(grupo)
+        self._esquecer()
+        return len(ids)
+
+    # ============ CAMADAS PERSISTENTES ============
+
+    def _camada_persistente(self, modelo):
+        """Camada persistente do tipo de geometria de `modelo`, criada se preciso."""
+        tipo = modelo.geometryType()
+        id_ = self._persistentes.get(tipo)
+        camada = self.projeto.mapLayer(id_) if id_ is not None else None
+        if camada is not None:
+            return camada
+
+        geometria = QgsWkbTypes.displayString(modelo.wkbType())
+        camada = QgsVectorLayer(
+            f"{geometria}?crs={modelo.crs().authid()}&index=yes",
+            NOMES_PERSISTENTES[tipo], "memory")
+        camada.dataProvider().addAttributes([
+            QgsField(CAMPO_CAMADA, QVariant.String),
+            QgsField(CAMPO_RESULTADO, QVariant.String),
+            QgsField(CAMPO_LOTE, QVariant.Int),
+        ])
+        camada.updateFields()
+        camada.setRenderer(QgsCategorizedSymbolRenderer(CAMPO_CAMADA, []))
+        self.adicionar([camada])
+        self._persistentes[tipo] = camada.id()
+        return camada
+
+    def _anexar_feicoes(self, persistente, camada):
+        """Copia as feições, casando os atributos pelo nome (campos novos são criados)."""
+        provedor = persistente.dataProvider()
+        novos = [campo for campo in camada.fields()
+                 if persistente.fields().indexOf(campo.name()) < 0]
+        if novos:
+            provedor.addAttributes(novos)
+            persistente.updateFields()
+        campos = persistente.fields()
+        posicoes = [campos.indexOf(campo.name()) for campo in camada.fields()]
+
+        tipo = tipo_resultado(camada.name())
+        fixos = {campos.indexOf(CAMPO_CAMADA): tipo,
+                 campos.indexOf(CAMPO_RESULTADO): camada.name(),
+                 campos.indexOf(CAMPO_LOTE): self._lote}
+        feicoes = []
+        for origem in camada.getFeatures():
+            atributos = [None] * campos.count()
+            for posicao, valor in zip(posicoes, origem.attributes()):
+                atributos[posicao] = valor
+            for posicao, valor in fixos.items():
+                atributos[posicao] = valor
+            feature = QgsFeature(campos)
+            feature.setGeometry(origem.geometry())
+            feature.setAttributes(atributos)
+            feicoes.append(feature)
+        provedor.addFeatures(feicoes)
+        persistente.updateExtents()
+
+        # Uma categoria por tipo de resultado, com o símbolo da camada avulsa
+        renderer = persistente.renderer()
+        if isinstance(renderer, QgsCategorizedSymbolRenderer) \
+                and renderer.categoryIndexForValue(tipo) < 0:
+            renderer.addCategory(QgsRendererCategory(tipo, _simbolo(camada), tipo))
+            persistente.emitStyleChanged()
+        persistente.triggerRepaint()
+
+    # ============ SINAIS DO PROJETO ============
+
+    def _removidas(self, ids):
+        removidas = set(ids)
+        self._ids = [id_ for id_ in self._ids if id_ not in removidas]
+        self._persistentes = {tipo: id_ for tipo, id_ in self._persistentes.items()
+                              if id_ not in removidas}
+
+    def _esquecer(self):
+        self._ids = []
+        self._persistentes = {}
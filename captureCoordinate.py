@@ -13,6 +13,7 @@ from qgis.PyQt.QtGui import QColor
 from qgis.core import (
     QgsCoordinateReferenceSystem,
     QgsCoordinateTransform,
+    QgsCsException,
     QgsPointXY,
     QgsProject,
     QgsSettings,
@@ -26,12 +27,15 @@ class CaptureCoordinate(QgsMapToolEmitPoint):
     '''Class to interact with the map canvas to capture the coordinate
     when the mouse button is pressed.'''
     capturePoint = pyqtSignal(QgsPointXY)
+    pointMoved = pyqtSignal(QgsPointXY)
     captureStopped = pyqtSignal()
 
     def __init__(self, canvas):
         QgsMapToolEmitPoint.__init__(self, canvas)
         self.canvas = canvas
         self.vertex = None
+        # Reused across mouse moves while the canvas CRS stays the same
+        self.transform = None
 
     def activate(self):
         '''When activated set the cursor to a crosshair.'''
@@ -59,8 +63,17 @@ class CaptureCoordinate(QgsMapToolEmitPoint):
 
     def canvasMoveEvent(self, event):
         '''Capture the coordinate as the user moves the mouse over
-        the canvas.'''
-        self.snappoint(event.originalPixelPoint()) # input is QPoint
+        the canvas and emit it in WGS84 (used by the live preview).'''
+        pt = self.snappoint(event.originalPixelPoint()) # input is QPoint
+
+        try:
+            canvasCRS = self.canvas.mapSettings().destinationCrs()
+            if self.transform is None or self.transform.sourceCrs() != canvasCRS:
+                self.transform = QgsCoordinateTransform(canvasCRS, epsg4326, QgsProject.instance())
+            self.pointMoved.emit(self.transform.transform(pt.x(), pt.y()))
+        except QgsCsException:
+            # Cursor outside the valid area of the canvas CRS: no preview
+            pass
 
     def canvasReleaseEvent(self, event):
         '''Capture the coordinate when the mouse button has been released,
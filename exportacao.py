@@ -0,0 +1,637 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ exportacao
+                                 A QGIS plugin
+ Horizon Projector - Exportação das camadas criadas
+                             -------------------
+        begin                : 2026-01-11
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Alberto Rodrigues
+        email                : betorodriuges@msn.com
+ ***************************************************************************/
+
+ Grava todas as camadas da sessão num único arquivo, aberto uma só vez, em
+ vez de uma chamada de QgsVectorFileWriter.writeAsVectorFormat por camada:
+ o GeoPackage pelo OGR (que acompanha o QGIS) e o GPX e o KML/KMZ por um
+ serializador XML próprio, que escreve feição a feição direto no disco.
+ FlatGeobuf e GeoParquet, formatos de um arquivo por camada com índice
+ espacial ou colunas, e o MBTiles de vector tiles também são gravados pelo
+ OGR.
+
+ As camadas são lidas por FonteCamada, criada na thread principal a partir
+ da camada; a leitura das feições pode então rodar em segundo plano.
+"""
+
+import io
+import os
+import re
+import zipfile
+from xml.sax.saxutils import escape, quoteattr
+
+from osgeo import ogr, osr
+from qgis.PyQt.QtCore import QDate, QDateTime, QTime, QVariant, Qt
+from qgis.core import (
+    QgsCoordinateReferenceSystem, QgsCoordinateTransform, QgsFeatureSink,
+    QgsGeometry, QgsProject, QgsVectorFileWriter, QgsVectorLayerFeatureSource,
+    QgsWkbTypes,
+)
+
+# Tipos de campo do QGIS -> OGR
+TIPOS_OGR = {
+    QVariant.Int: ogr.OFTInteger,
+    QVariant.UInt: ogr.OFTInteger64,
+    QVariant.LongLong: ogr.OFTInteger64,
+    QVariant.ULongLong: ogr.OFTInteger64,
+    QVariant.Double: ogr.OFTReal,
+    QVariant.Bool: ogr.OFTInteger,
+    QVariant.Date: ogr.OFTDate,
+    QVariant.Time: ogr.OFTTime,
+    QVariant.DateTime: ogr.OFTDateTime,
+}
+
+
+class FonteCamada:
+    """
+    Instantâneo de uma camada vetorial para exportação: nome, campos, tipo
+    de geometria, SRC e uma QgsVectorLayerFeatureSource, que pode ser lida
+    fora da thread principal.
+    """
+
+    def __init__(self, camada):
+        self.nome = camada.name()
+        self.campos = camada.fields()
+        self.tipo_wkb = camada.wkbType()
+        self.tipo_geometria = camada.geometryType()
+        self.crs = camada.crs()
+        self.total = camada.featureCount()
+        self.contexto = QgsProject.instance().transformContext()
+        self._fonte = QgsVectorLayerFeatureSource(camada)
+
+    def feicoes(self):
+        """Iterador sobre as feições da camada."""
+        return self._fonte.getFeatures()
+
+
+class _Progresso:
+    """Conta feições gravadas, informa a fração concluída e consulta o cancelamento."""
+
+    def __init__(self, fontes, progresso=None, cancelado=None, passo=1000):
+        self.total = max(sum(fonte.total for fonte in fontes), 1)
+        self.progresso = progresso
+        self.cancelado = cancelado
+        self.passo = passo
+        self.gravadas = 0
+
+    def interrompido(self):
+        return self.cancelado is not None and self.cancelado()
+
+    def avancar(self):
+        self.gravadas += 1
+        if self.progresso is not None and self.gravadas % self.passo == 0:
+            self.progresso(self.gravadas / self.total)
+
+    def concluir(self):
+        if self.progresso is not None:
+            self.progresso(1.0)
+
+
+def nomes_unicos(nomes, maximo=63):
+    """
+    Nomes de tabela válidos e distintos: caracteres fora de [A-Za-z0-9_]
+    viram "_" e repetidos ganham um sufixo numérico.
+    """
+    vistos = set()
+    resultado = []
+    for nome in nomes:
+        base = re.sub(r'\W+', '_', nome, flags=re.ASCII).strip('_')[:maximo] or 'camada'
+        candidato = base
+        numero = 1
+        while candidato.lower() in vistos:
+            numero += 1
+            sufixo = f"_{numero}"
+            candidato = base[:maximo - len(sufixo)] + sufixo
+        vistos.add(candidato.lower())
+        resultado.append(candidato)
+    return resultado
+
+
+def _srs(crs):
+    """osr.SpatialReference equivalente ao QgsCoordinateReferenceSystem."""
+    srs = osr.SpatialReference()
+    srs.ImportFromWkt(crs.toWkt())
+    srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+    return srs
+
+
+def _criar_campos(camada_ogr, campos):
+    for campo in campos:
+        definicao = ogr.FieldDefn(campo.name(), TIPOS_OGR.get(campo.type(), ogr.OFTString))
+        if campo.type() == QVariant.Bool:
+            definicao.SetSubType(ogr.OFSTBoolean)
+        camada_ogr.CreateField(definicao)
+
+
+def _valor_ogr(valor):
+    """Converte um atributo do QGIS para um valor aceito por ogr.Feature.SetField."""
+    if isinstance(valor, (QDate, QDateTime, QTime)):
+        return valor.toString(Qt.ISODate)
+    if isinstance(valor, bool):
+        return int(valor)
+    if isinstance(valor, (int, float, str)):
+        return valor
+    return str(valor)
+
+
+def _feicao_ogr(definicao, feature):
+    """ogr.Feature com a geometria (WKB) e os atributos de uma QgsFeature."""
+    saida = ogr.Feature(definicao)
+    geometria = feature.geometry()
+    if not geometria.isNull():
+        saida.SetGeometryDirectly(ogr.CreateGeometryFromWkb(bytes(geometria.asWkb())))
+    for indice, valor in enumerate(feature.attributes()):
+        if valor is None or (isinstance(valor, QVariant) and valor.isNull()):
+            saida.SetFieldNull(indice)
+        else:
+            saida.SetField(indice, _valor_ogr(valor))
+    return saida
+
+
+def _copiar_feicoes(camada_ogr, fonte, andamento):
+    """Cria os campos e grava as feições da fonte; False se interrompido."""
+    _criar_campos(camada_ogr, fonte.campos)
+    definicao = camada_ogr.GetLayerDefn()
+    for feature in fonte.feicoes():
+        if andamento.interrompido():
+            return False
+        camada_ogr.CreateFeature(_feicao_ogr(definicao, feature))
+        andamento.avancar()
+    return True
+
+
+def gravar_geopackage(caminho, fontes, progresso=None, cancelado=None):
+    """
+    Grava todas as camadas num único GeoPackage, uma tabela por camada.
+
+    Todas as tabelas e feições são gravadas numa única transação; os índices
+    espaciais (R-tree) são criados uma vez, no fim, com a tabela já cheia, em
+    vez de atualizados a cada inserção.
+
+    Args:
+        caminho: Arquivo .gpkg (sobrescrito se existir)
+        fontes: Lista de FonteCamada
+        progresso: Função opcional (fração de 0 a 1)
+        cancelado: Função opcional; se devolver True, a gravação para
+
+    Returns:
+        Lista com o nome da tabela de cada fonte, ou None se cancelado
+    """
+    driver = ogr.GetDriverByName('GPKG')
+    if os.path.exists(caminho):
+        driver.DeleteDataSource(caminho)
+    dataset = driver.CreateDataSource(caminho)
+    if dataset is None:
+        raise IOError(f"Não foi possível criar o GeoPackage {caminho}")
+
+    nomes = nomes_unicos([fonte.nome for fonte in fontes])
+    andamento = _Progresso(fontes, progresso, cancelado)
+    interrompido = False
+    try:
+        dataset.StartTransaction()
+        for nome, fonte in zip(nomes, fontes):
+            camada = dataset.CreateLayer(
+                nome, _srs(fonte.crs), int(fonte.tipo_wkb),
+                options=['SPATIAL_INDEX=NO', 'GEOMETRY_NAME=geom'])
+            if not _copiar_feicoes(camada, fonte, andamento):
+                interrompido = True
+                break
+
+        if interrompido:
+            dataset.RollbackTransaction()
+        else:
+            dataset.CommitTransaction()
+            for nome, fonte in zip(nomes, fontes):
+                if fonte.tipo_wkb == QgsWkbTypes.NoGeometry:
+                    continue
+                resultado = dataset.ExecuteSQL(f"SELECT gpkgAddSpatialIndex('{nome}', 'geom')")
+                if resultado is not None:
+                    dataset.ReleaseResultSet(resultado)
+    finally:
+        dataset = None
+
+    if interrompido:
+        os.remove(caminho)
+        return None
+    andamento.concluir()
+    return nomes
+
+
+def gravar_arquivos(caminhos, fontes, formato, progresso=None, cancelado=None):
+    """
+    Grava cada fonte no seu arquivo com QgsVectorFileWriter (p.ex. Shapefile
+    ou GeoJSON), feição a feição, a partir das FonteCamada: ao contrário de
+    writeAsVectorFormat sobre a camada, pode rodar em segundo plano.
+
+    Returns:
+        Número de arquivos gravados, ou None se cancelado (os arquivos
+        parciais ficam para quem chamou apagar)
+    """
+    andamento = _Progresso(fontes, progresso, cancelado)
+    for caminho, fonte in zip(caminhos, fontes):
+        opcoes = QgsVectorFileWriter.SaveVectorOptions()
+        opcoes.driverName = formato
+        opcoes.fileEncoding = 'UTF-8'
+        escritor = QgsVectorFileWriter.create(
+            caminho, fonte.campos, fonte.tipo_wkb, fonte.crs, fonte.contexto, opcoes)
+        try:
+            if escritor.hasError() != QgsVectorFileWriter.NoError:
+                raise IOError(f"{caminho}: {escritor.errorMessage()}")
+            for feature in fonte.feicoes():
+                if andamento.interrompido():
+                    return None
+                escritor.addFeature(feature, QgsFeatureSink.FastInsert)
+                andamento.avancar()
+        finally:
+            # O arquivo só é fechado quando o escritor é destruído
+            del escritor
+    andamento.concluir()
+    return len(fontes)
+
+
+# ============ FLATGEOBUF E GEOPARQUET ============
+
+# Opções de criação de camada por driver OGR. FlatGeobuf: R-tree Hilbert
+# compactado no cabeçalho, para leitura por retângulo. GeoParquet: geometria
+# em WKB, grupos de linhas ordenados pelo retângulo envolvente e colunas
+# bbox.xmin/... por linha, para que os leitores descartem grupos inteiros
+# (GDAL >= 3.9; versões anteriores ignoram as opções que não conhecem).
+OPCOES_COLUNARES = {
+    'FlatGeobuf': ['SPATIAL_INDEX=YES'],
+    'Parquet': ['GEOMETRY_ENCODING=WKB', 'GEOMETRY_NAME=geometry',
+                'ROW_GROUP_SIZE=65536', 'SORT_BY_BBOX=YES',
+                'WRITE_COVERING_BBOX=YES'],
+}
+
+
+def driver_disponivel(driver):
+    """Se o GDAL em uso tem o driver (Parquet depende de Arrow no build)."""
+    return ogr.GetDriverByName(driver) is not None
+
+
+def gravar_colunar(caminhos, fontes, driver, progresso=None, cancelado=None):
+    """
+    Grava cada fonte no seu arquivo pelo OGR, em FlatGeobuf ('FlatGeobuf')
+    ou GeoParquet ('Parquet'), com as opções de OPCOES_COLUNARES.
+
+    O índice do FlatGeobuf e a ordenação do GeoParquet são montados pelo
+    driver quando o arquivo é fechado, com todas as feições já gravadas.
+
+    Returns:
+        Número de arquivos gravados, ou None se cancelado (os arquivos
+        parciais ficam para quem chamou apagar)
+    """
+    ogr_driver = ogr.GetDriverByName(driver)
+    if ogr_driver is None:
+        raise IOError(f"Driver OGR {driver} indisponível nesta instalação do GDAL")
+    andamento = _Progresso(fontes, progresso, cancelado)
+    for caminho, fonte in zip(caminhos, fontes):
+        if os.path.exists(caminho):
+            ogr_driver.DeleteDataSource(caminho)
+        dataset = ogr_driver.CreateDataSource(caminho)
+        if dataset is None:
+            raise IOError(f"Não foi possível criar {caminho}")
+        try:
+            nome = os.path.splitext(os.path.basename(caminho))[0]
+            camada = dataset.CreateLayer(
+                nome, _srs(fonte.crs), int(fonte.tipo_wkb),
+                options=OPCOES_COLUNARES.get(driver, []))
+            if camada is None:
+                raise IOError(f"Não foi possível criar a camada em {caminho}")
+            if not _copiar_feicoes(camada, fonte, andamento):
+                return None
+        finally:
+            dataset = None
+    andamento.concluir()
+    return len(fontes)
+
+
+# ============ MBTILES (VECTOR TILES) ============
+
+# Lado do tile em unidades inteiras do MVT: as coordenadas são quantizadas
+# nessa grade em cada zoom
+EXTENSAO_TILE = 4096
+
+# Tolerância de simplificação em unidades do tile (1/16 de pixel num tile de
+# 256 px). Como a grade acompanha o zoom, a tolerância em metros cai pela
+# metade a cada nível: tiles de zoom baixo levam anéis com poucos vértices
+SIMPLIFICACAO_TILE = 4.0
+
+
+def gravar_mbtiles(caminho, fontes, zoom_min, zoom_max, progresso=None,
+                   cancelado=None, simplificacao=SIMPLIFICACAO_TILE):
+    """
+    Grava todas as camadas num MBTiles de vector tiles (MVT), uma camada de
+    tile por fonte, pelo driver MBTiles do OGR.
+
+    Em cada zoom as geometrias são reprojetadas para Web Mercator,
+    recortadas por tile, quantizadas em EXTENSAO_TILE unidades e
+    simplificadas com `simplificacao` unidades de tolerância; no zoom
+    máximo a tolerância é mínima, para manter o detalhe. Os tiles são
+    montados pelo driver quando o arquivo é fechado, depois de todas as
+    feições gravadas (essa etapa não informa progresso).
+
+    Returns:
+        Lista com o nome da camada de tile de cada fonte, ou None se
+        cancelado (o arquivo parcial fica para quem chamou apagar)
+    """
+    driver = ogr.GetDriverByName('MBTiles')
+    if driver is None:
+        raise IOError("Driver OGR MBTiles indisponível nesta instalação do GDAL")
+    if os.path.exists(caminho):
+        driver.DeleteDataSource(caminho)
+    dataset = driver.CreateDataSource(caminho, options=[
+        f"NAME={os.path.splitext(os.path.basename(caminho))[0]}",
+        "TYPE=overlay",
+        f"MINZOOM={zoom_min}",
+        f"MAXZOOM={zoom_max}",
+        f"EXTENT={EXTENSAO_TILE}",
+        f"SIMPLIFICATION={simplificacao}",
+        "SIMPLIFICATION_MAX_ZOOM=0.5",
+    ])
+    if dataset is None:
+        raise IOError(f"Não foi possível criar o MBTiles {caminho}")
+
+    # Tabelas sem geometria não viram tiles
+    fontes = [fonte for fonte in fontes if fonte.tipo_wkb != QgsWkbTypes.NoGeometry]
+    nomes = nomes_unicos([fonte.nome for fonte in fontes])
+    andamento = _Progresso(fontes, progresso, cancelado)
+    try:
+        for nome, fonte in zip(nomes, fontes):
+            camada = dataset.CreateLayer(nome, _srs(fonte.crs), int(fonte.tipo_wkb))
+            if camada is None:
+                raise IOError(f"Não foi possível criar a camada {nome} em {caminho}")
+            if not _copiar_feicoes(camada, fonte, andamento):
+                return None
+    finally:
+        dataset = None
+    andamento.concluir()
+    return nomes
+
+
+# ============ GPX E KML (XML EM FLUXO) ============
+
+EPSG4326 = QgsCoordinateReferenceSystem("EPSG:4326")
+
+# Buffer do arquivo de saída: as feições vão para o disco à medida que são lidas
+_BUFFER = 1 << 20
+
+
+class _Interrompido(Exception):
+    """Exportação cancelada pelo usuário."""
+
+
+def _partes(geometria):
+    """
+    Partes de uma geometria em WGS84: listas de pontos (QgsPointXY) para
+    pontos e linhas, listas de anéis para polígonos.
+    """
+    tipo = geometria.type()
+    multi = geometria.isMultipart()
+    if tipo == QgsWkbTypes.PointGeometry:
+        return [[p] for p in geometria.asMultiPoint()] if multi else [[geometria.asPoint()]]
+    if tipo == QgsWkbTypes.LineGeometry:
+        return geometria.asMultiPolyline() if multi else [geometria.asPolyline()]
+    if tipo == QgsWkbTypes.PolygonGeometry:
+        return geometria.asMultiPolygon() if multi else [geometria.asPolygon()]
+    return []
+
+
+def _partes_gpx(fonte, geometria):
+    """
+    Partes não vazias de uma geometria para o GPX: os anéis dos polígonos
+    entram como partes soltas. Geometria nula ou vazia não tem partes, e a
+    feição é pulada (como no KML), em vez de virar um wpt, rte ou trk vazio.
+    """
+    if geometria.isNull() or geometria.isEmpty():
+        return []
+    partes = _partes(geometria)
+    if fonte.tipo_geometria == QgsWkbTypes.PolygonGeometry:
+        partes = [anel for poligono in partes for anel in poligono]
+    return [parte for parte in partes if parte]
+
+
+def _feicoes_wgs84(fonte, andamento):
+    """
+    Percorre as feições de uma fonte com a geometria em WGS84, contando o
+    progresso e interrompendo com _Interrompido se a exportação for cancelada.
+    """
+    transform = None
+    if fonte.crs != EPSG4326:
+        transform = QgsCoordinateTransform(fonte.crs, EPSG4326, fonte.contexto)
+    for feature in fonte.feicoes():
+        if andamento.interrompido():
+            raise _Interrompido()
+        geometria = QgsGeometry(feature.geometry())
+        if transform is not None and not geometria.isNull():
+            geometria.transform(transform)
+        yield feature, geometria
+        andamento.avancar()
+
+
+def _texto(valor):
+    """Atributo como texto (vazio para NULL)."""
+    if valor is None or (isinstance(valor, QVariant) and valor.isNull()):
+        return ''
+    return str(_valor_ogr(valor))
+
+
+def _nome_feicao(fonte, feature, numero):
+    """Nome de uma feição: o campo "nome"/"name", se houver, ou camada + número."""
+    for campo in ('nome', 'name'):
+        indice = fonte.campos.lookupField(campo)
+        if indice >= 0 and _texto(feature.attribute(indice)):
+            return _texto(feature.attribute(indice))
+    return f"{fonte.nome} {numero}"
+
+
+def _descricao(fonte, feature):
+    return '; '.join(f"{campo.name()}={_texto(valor)}"
+                     for campo, valor in zip(fonte.campos, feature.attributes()))
+
+
+def _gravar_em_fluxo(caminho, escrever, comprimir=False):
+    """
+    Abre o arquivo de saída (ou a entrada doc.kml de um KMZ) para escrita em
+    texto com buffer e chama escrever(arquivo). Se a exportação for cancelada,
+    o arquivo parcial é apagado.
+
+    Returns:
+        True se concluído, False se cancelado
+    """
+    try:
+        if comprimir:
+            with zipfile.ZipFile(caminho, 'w', zipfile.ZIP_DEFLATED) as kmz:
+                with kmz.open('doc.kml', 'w', force_zip64=True) as binario:
+                    with io.TextIOWrapper(binario, encoding='utf-8') as arquivo:
+                        escrever(arquivo)
+        else:
+            with open(caminho, 'w', encoding='utf-8', buffering=_BUFFER) as arquivo:
+                escrever(arquivo)
+    except _Interrompido:
+        if os.path.exists(caminho):
+            os.remove(caminho)
+        return False
+    return True
+
+
+def gravar_gpx(caminho, fontes, progresso=None, cancelado=None):
+    """
+    Grava todas as camadas num único GPX 1.1, em fluxo.
+
+    Pontos viram waypoints (wpt); linhas de uma só parte (p.ex. projeções)
+    viram rotas (rte); linhas multiparte e os contornos dos polígonos
+    (círculos, anéis) viram tracks (trk), com um trkseg por parte ou anel. O
+    GPX exige os wpt antes dos rte e dos trk, então as fontes são percorridas
+    por tipo; nenhuma camada é guardada inteira na memória.
+
+    Returns:
+        Número de elementos gravados, ou None se cancelado
+    """
+    pontos = [f for f in fontes if f.tipo_geometria == QgsWkbTypes.PointGeometry]
+    linhas = [f for f in fontes if f.tipo_geometria == QgsWkbTypes.LineGeometry]
+    poligonos = [f for f in fontes if f.tipo_geometria == QgsWkbTypes.PolygonGeometry]
+    # As camadas de linhas são lidas duas vezes (rotas e tracks)
+    andamento = _Progresso(pontos + linhas + linhas + poligonos, progresso, cancelado)
+    gravados = [0]
+
+    def ponto(arquivo, tag, p, recuo):
+        arquivo.write(f'{recuo}<{tag} lat="{p.y():.8f}" lon="{p.x():.8f}"/>\n')
+
+    def cabecalho(arquivo, fonte, feature, numero, recuo):
+        arquivo.write(f"{recuo}<name>{escape(_nome_feicao(fonte, feature, numero))}</name>\n")
+        arquivo.write(f"{recuo}<desc>{escape(_descricao(fonte, feature))}</desc>\n")
+        arquivo.write(f"{recuo}<type>{escape(fonte.nome)}</type>\n")
+
+    def escrever(arquivo):
+        arquivo.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                      '<gpx version="1.1" creator="Horizon Projector" '
+                      'xmlns="http://www.topografix.com/GPX/1/1">\n')
+        for fonte in pontos:
+            for numero, (feature, geometria) in enumerate(_feicoes_wgs84(fonte, andamento), 1):
+                for parte in _partes_gpx(fonte, geometria):
+                    p = parte[0]
+                    arquivo.write(f'  <wpt lat="{p.y():.8f}" lon="{p.x():.8f}">\n')
+                    cabecalho(arquivo, fonte, feature, numero, '    ')
+                    arquivo.write('  </wpt>\n')
+                    gravados[0] += 1
+        for fonte in linhas:
+            for numero, (feature, geometria) in enumerate(_feicoes_wgs84(fonte, andamento), 1):
+                partes = _partes_gpx(fonte, geometria)
+                if len(partes) == 1:
+                    arquivo.write('  <rte>\n')
+                    cabecalho(arquivo, fonte, feature, numero, '    ')
+                    for p in partes[0]:
+                        ponto(arquivo, 'rtept', p, '    ')
+                    arquivo.write('  </rte>\n')
+                    gravados[0] += 1
+        for fonte in linhas + poligonos:
+            for numero, (feature, geometria) in enumerate(_feicoes_wgs84(fonte, andamento), 1):
+                partes = _partes_gpx(fonte, geometria)
+                # Linhas de uma só parte já foram gravadas como rotas
+                if not partes or (len(partes) == 1
+                                  and fonte.tipo_geometria == QgsWkbTypes.LineGeometry):
+                    continue
+                arquivo.write('  <trk>\n')
+                cabecalho(arquivo, fonte, feature, numero, '    ')
+                for parte in partes:
+                    arquivo.write('    <trkseg>\n')
+                    for p in parte:
+                        ponto(arquivo, 'trkpt', p, '      ')
+                    arquivo.write('    </trkseg>\n')
+                arquivo.write('  </trk>\n')
+                gravados[0] += 1
+        arquivo.write('</gpx>\n')
+
+    if not _gravar_em_fluxo(caminho, escrever):
+        return None
+    andamento.concluir()
+    return gravados[0]
+
+
+# Estilo KML de cada tipo de geometria (cores aabbggrr, como no plugin)
+_ESTILOS_KML = {
+    QgsWkbTypes.PointGeometry: ('ponto', '<IconStyle><color>ff356bff</color>'
+                                '<scale>0.8</scale></IconStyle>'),
+    QgsWkbTypes.LineGeometry: ('linha', '<LineStyle><color>ff356bff</color>'
+                               '<width>2</width></LineStyle>'),
+    QgsWkbTypes.PolygonGeometry: ('poligono', '<LineStyle><color>fff5ff00</color>'
+                                  '<width>2</width></LineStyle><PolyStyle>'
+                                  '<color>32f5ff00</color></PolyStyle>'),
+}
+
+
+def _coordenadas(pontos):
+    return ' '.join(f"{p.x():.8f},{p.y():.8f}" for p in pontos)
+
+
+def _geometria_kml(tipo, partes):
+    """Elementos KML (Point, LineString, Polygon) das partes de uma geometria."""
+    elementos = []
+    for parte in partes:
+        if tipo == QgsWkbTypes.PointGeometry:
+            elementos.append(f"<Point><coordinates>{_coordenadas(parte)}</coordinates></Point>")
+        elif tipo == QgsWkbTypes.LineGeometry:
+            elementos.append(f"<LineString><tessellate>1</tessellate>"
+                             f"<coordinates>{_coordenadas(parte)}</coordinates></LineString>")
+        elif parte:
+            aneis = [f"<outerBoundaryIs><LinearRing><coordinates>{_coordenadas(parte[0])}"
+                     f"</coordinates></LinearRing></outerBoundaryIs>"]
+            aneis += [f"<innerBoundaryIs><LinearRing><coordinates>{_coordenadas(anel)}"
+                      f"</coordinates></LinearRing></innerBoundaryIs>" for anel in parte[1:]]
+            elementos.append(f"<Polygon><tessellate>1</tessellate>{''.join(aneis)}</Polygon>")
+    if len(elementos) == 1:
+        return elementos[0]
+    return f"<MultiGeometry>{''.join(elementos)}</MultiGeometry>"
+
+
+def gravar_kml(caminho, fontes, progresso=None, cancelado=None):
+    """
+    Grava todas as camadas num único documento KML, uma pasta (Folder) por
+    camada, em fluxo. Se o caminho terminar em .kmz, o documento é gravado
+    comprimido dentro do zip, também em fluxo.
+
+    Returns:
+        Número de placemarks gravados, ou None se cancelado
+    """
+    andamento = _Progresso(fontes, progresso, cancelado)
+    gravados = [0]
+
+    def escrever(arquivo):
+        arquivo.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                      '<kml xmlns="http://www.opengis.net/kml/2.2">\n<Document>\n'
+                      '  <name>Horizon Projector</name>\n')
+        for estilo, conteudo in _ESTILOS_KML.values():
+            arquivo.write(f'  <Style id="{estilo}">{conteudo}</Style>\n')
+        for fonte in fontes:
+            if fonte.tipo_geometria not in _ESTILOS_KML:
+                continue
+            estilo = _ESTILOS_KML[fonte.tipo_geometria][0]
+            arquivo.write(f"  <Folder>\n    <name>{escape(fonte.nome)}</name>\n")
+            for numero, (feature, geometria) in enumerate(_feicoes_wgs84(fonte, andamento), 1):
+                if geometria.isNull():
+                    continue
+                dados = ''.join(
+                    f'<Data name={quoteattr(campo.name())}><value>{escape(_texto(valor))}</value></Data>'
+                    for campo, valor in zip(fonte.campos, feature.attributes()))
+                arquivo.write(
+                    f"    <Placemark><name>{escape(_nome_feicao(fonte, feature, numero))}</name>"
+                    f"<styleUrl>#{estilo}</styleUrl><ExtendedData>{dados}</ExtendedData>"
+                    f"{_geometria_kml(fonte.tipo_geometria, _partes(geometria))}</Placemark>\n")
+                gravados[0] += 1
+            arquivo.write("  </Folder>\n")
+        arquivo.write('</Document>\n</kml>\n')
+
+    if not _gravar_em_fluxo(caminho, escrever, comprimir=caminho.lower().endswith('.kmz')):
+        return None
+    andamento.concluir()
+    return gravados[0]
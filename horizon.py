@@ -24,11 +24,10 @@
 from qgis.PyQt.QtCore import QSettings, QTranslator, QCoreApplication
 from qgis.PyQt.QtGui import QIcon
 from qgis.PyQt.QtWidgets import QAction
+from qgis.core import QgsApplication
 
-# Initialize Qt resources from file resources.py
-from .resources import *
-# Import the code for the dialog
-from .horizon_dialog import horizonDialog
+# O diálogo (e os recursos Qt) só são importados no primeiro run(), para não
+# custar nada na inicialização do QGIS quando o plugin não é usado.
 import os.path
 
 
@@ -67,6 +66,8 @@ class horizon:
         # Must be set in initGui() to survive plugin reloads
         self.first_start = None
 
+        self.provider = None
+
     # noinspection PyMethodMayBeStatic
     def tr(self, message):
         """Get the translation for a string using Qt translation API.
@@ -157,10 +158,17 @@ class horizon:
 
         return action
 
+    def initProcessing(self):
+        """Register the Processing provider with the batch algorithms."""
+        from .horizon_provider import horizonProvider
+        self.provider = horizonProvider()
+        QgsApplication.processingRegistry().addProvider(self.provider)
+
     def initGui(self):
         """Create the menu entries and toolbar icons inside the QGIS GUI."""
 
-        icon_path = ':/plugins/horizon/icon.png'
+        # Ícone lido do arquivo: dispensa carregar resources.py na inicialização
+        icon_path = os.path.join(self.plugin_dir, 'icon.png')
         self.add_action(
             icon_path,
             text=self.tr(u'Horizon Projector'),
@@ -171,6 +179,8 @@ class horizon:
         # will be set False in run()
         self.first_start = True
 
+        self.initProcessing()
+
 
     def unload(self):
         """Removes the plugin menu item and icon from QGIS GUI."""
@@ -179,6 +189,12 @@ class horizon:
                 self.tr(u'&Horizon Projector'),
                 action)
             self.iface.removeToolBarIcon(action)
+        if self.provider is not None:
+            QgsApplication.processingRegistry().removeProvider(self.provider)
+            self.provider = None
+        if getattr(self, 'dlg', None) is not None:
+            self.dlg.camadas.desconectar()
+            self.dlg.previa.remover()
 
 
     def run(self):
@@ -188,6 +204,10 @@ class horizon:
         # Only create GUI ONCE in callback, so that it will only load when the plugin is started
         if self.first_start == True:
             self.first_start = False
+            # Initialize Qt resources from file resources.py
+            from . import resources  # noqa: F401
+            # Import the code for the dialog
+            from .horizon_dialog import horizonDialog
             self.dlg = horizonDialog(self.iface)
 
         # show the dialog
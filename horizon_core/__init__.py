@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ horizon_core
+                                 A QGIS plugin
+ Horizon Projector - Núcleo de cálculo sem dependência de Qt/QGIS
+                             -------------------
+        begin                : 2026-01-11
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Alberto Rodrigues
+        email                : betorodriuges@msn.com
+ ***************************************************************************/
+
+ Geodésia, distâncias ao horizonte e tesselação de anéis em Python/NumPy
+ puro. Pode ser importado por processos de trabalho, benchmarks e rotinas
+ sem interface gráfica sem carregar o QGIS.
+"""
+
+from .geodesia import (
+    RAIO_TERRA_KM, WGS84_A_KM, WGS84_F,
+    GeodesicaEsferica, GeodesicaElipsoidal, LequeEsferico, LequeGeodesico,
+    criar_modelo_terra,
+)
+from .horizonte import (
+    distancia_horizonte, distancia_objeto,
+    distancias_horizonte, distancias_objeto,
+)
+from .circulos import (
+    TOLERANCIA_CORDA_KM, VERTICES_MIN, VERTICES_MAX,
+    num_vertices_circulo, num_vertices_circulos,
+    aneis_geodesicos, circulos_geodesicos, CacheAneis,
+    SEGMENTOS_GEODESICA, linhas_geodesicas,
+)
+from .paralelo import (
+    TAMANHO_LOTE_PADRAO, ExecutorProcessos,
+    kernel_horizonte, kernel_objeto, kernel_destino, kernel_circulos,
+    kernel_geodesicas, circulos_geodesicos_paralelo,
+)
+from .visibilidade import (
+    REFRACAO_PADRAO, VISIVEL, INVISIVEL, SEM_DADOS,
+    BYTES_POR_CELULA_JANELA, queda_curvatura, viewshed, viewshed_cumulativo,
+    alcance_maximo_m,
+    amostrar_bilinear, AmostradorBlocos, horizonte_terreno,
+)
+from .indice import (
+    KM_POR_GRAU, SURGE, SOME, IndiceEspacial, caixas_busca, chaves_morton,
+    objetos_visiveis,
+    distancias_acumuladas, posicoes_trajeto, eventos_trajeto,
+    pares_intervisiveis,
+)
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ circulos
+                                 A QGIS plugin
+ Horizon Projector - Tesselação de círculos e anéis geodésicos
+                             -------------------
+        begin                : 2026-01-11
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Alberto Rodrigues
+        email                : betorodriuges@msn.com
+ ***************************************************************************/
+
+ Este módulo não depende de Qt nem do QGIS.
+"""
+
+import math
+from collections import OrderedDict
+
+import numpy as np
+
+from .geodesia import RAIO_TERRA_KM
+
+# Tesselação dos círculos: erro máximo da corda e limites de vértices
+TOLERANCIA_CORDA_KM = 0.025
+VERTICES_MIN = 8
+VERTICES_MAX = 4096
+
+
+def num_vertices_circulo(raio_km, tolerancia_km=TOLERANCIA_CORDA_KM,
+                         raio_terra_km=RAIO_TERRA_KM):
+    """
+    Número de vértices para que a corda entre dois vértices vizinhos se
+    afaste no máximo tolerancia_km do círculo verdadeiro.
+
+    O círculo geodésico de raio r tem raio "plano" rho = R * sin(r / R);
+    com n vértices a flecha da corda é rho * (1 - cos(pi / n)).
+    """
+    rho = raio_terra_km * math.sin(min(raio_km / raio_terra_km, math.pi / 2))
+    if rho <= tolerancia_km:
+        return VERTICES_MIN
+
+    num_vertices = math.ceil(math.pi / math.acos(1 - tolerancia_km / rho))
+    return max(VERTICES_MIN, min(VERTICES_MAX, num_vertices))
+
+
+def aneis_geodesicos(modelo, lat, lon, raios_km, tolerancia_km=TOLERANCIA_CORDA_KM):
+    """
+    Calcula, numa única passada vetorizada, os vértices de todos os anéis
+    concêntricos de uma origem.
+
+    Os termos por azimute (e, no elipsoide, o preparo das séries da
+    origem) são calculados uma vez e reaproveitados para todos os raios.
+    Todos os anéis usam o número de vértices do maior raio, o que mantém
+    o erro da corda dentro da tolerância em todos eles.
+
+    Args:
+        modelo: GeodesicaEsferica ou GeodesicaElipsoidal
+        lat: Latitude do centro em graus
+        lon: Longitude do centro em graus
+        raios_km: Raios dos anéis em quilômetros
+        tolerancia_km: Erro máximo da corda
+
+    Returns:
+        Tupla (lats, lons) de arrays (num_aneis, num_vertices + 1), com o
+        primeiro vértice repetido no fim para fechar cada anel
+    """
+    raios_km = np.atleast_1d(np.asarray(raios_km, dtype=np.float64))
+    num_vertices = num_vertices_circulo(float(raios_km.max()), tolerancia_km)
+    azimutes = np.arange(num_vertices) * (360.0 / num_vertices)
+
+    leque = modelo.leque(lat, lon, azimutes)
+    lats, lons, _ = leque.posicoes(raios_km[:, np.newaxis])
+
+    lats = np.concatenate([lats, lats[:, :1]], axis=1)
+    lons = np.concatenate([lons, lons[:, :1]], axis=1)
+    return lats, lons
+
+
+def num_vertices_circulos(raios_km, tolerancia_km=TOLERANCIA_CORDA_KM,
+                          raio_terra_km=RAIO_TERRA_KM):
+    """Versão vetorizada de num_vertices_circulo (devolve array de inteiros)."""
+    raios_km = np.asarray(raios_km, dtype=np.float64)
+    rho = raio_terra_km * np.sin(np.minimum(raios_km / raio_terra_km, math.pi / 2))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        num_vertices = np.ceil(math.pi / np.arccos(1 - tolerancia_km / rho))
+    num_vertices = np.where(rho <= tolerancia_km, VERTICES_MIN, num_vertices)
+    return np.clip(num_vertices, VERTICES_MIN, VERTICES_MAX).astype(np.int64)
+
+
+def circulos_geodesicos(modelo, lats, lons, raios_km, tolerancia_km=TOLERANCIA_CORDA_KM):
+    """
+    Calcula os vértices de vários círculos, cada um com centro e raio próprios.
+
+    Os círculos são agrupados pelo número de vértices e cada grupo é
+    resolvido numa única chamada vetorizada (centros x azimutes).
+
+    Returns:
+        Lista, na ordem de entrada, de tuplas (lats, lons) com o primeiro
+        vértice repetido no fim para fechar cada anel
+    """
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    raios_km = np.asarray(raios_km, dtype=np.float64)
+    contagens = num_vertices_circulos(raios_km, tolerancia_km)
+
+    resultado = [None] * len(raios_km)
+    for num_vertices in np.unique(contagens):
+        indices = np.flatnonzero(contagens == num_vertices)
+        azimutes = np.arange(num_vertices) * (360.0 / num_vertices)
+        lats_g, lons_g, _ = modelo.destino(
+            lats[indices, np.newaxis], lons[indices, np.newaxis],
+            azimutes[np.newaxis, :], raios_km[indices, np.newaxis])
+        lats_g = np.concatenate([lats_g, lats_g[:, :1]], axis=1)
+        lons_g = np.concatenate([lons_g, lons_g[:, :1]], axis=1)
+        for linha, indice in enumerate(indices):
+            resultado[indice] = (lats_g[linha], lons_g[linha])
+    return resultado
+
+
+# Segmentos das linhas de projeção: cada vértice fica sobre a geodésica
+SEGMENTOS_GEODESICA = 64
+
+
+def linhas_geodesicas(modelo, lats, lons, azimutes, distancias_km,
+                      num_segmentos=SEGMENTOS_GEODESICA):
+    """
+    Vértices das geodésicas que partem de cada origem ao longo do azimute,
+    igualmente espaçados até a distância dada.
+
+    Returns:
+        Tupla (lats, lons) de arrays (n, num_segmentos + 1): a primeira
+        coluna é a origem e a última, o destino
+    """
+    lats = np.atleast_1d(np.asarray(lats, dtype=np.float64))
+    lons = np.atleast_1d(np.asarray(lons, dtype=np.float64))
+    azimutes = np.atleast_1d(np.asarray(azimutes, dtype=np.float64))
+    distancias_km = np.atleast_1d(np.asarray(distancias_km, dtype=np.float64))
+    fracoes = np.linspace(0.0, 1.0, num_segmentos + 1)
+    lats_g, lons_g, _ = modelo.destino(
+        lats[:, np.newaxis], lons[:, np.newaxis], azimutes[:, np.newaxis],
+        distancias_km[:, np.newaxis] * fracoes[np.newaxis, :])
+    lats_g[:, 0] = lats
+    lons_g[:, 0] = lons
+    return lats_g, lons_g
+
+
+class CacheAneis:
+    """
+    Anéis concêntricos para pré-visualização, com as formas em cache.
+
+    No modelo da Terra, mudar a longitude do centro só desloca os vértices
+    em longitude; a forma depende da latitude. A forma é calculada uma vez
+    por latitude quantizada em `passo_lat` graus (com centro na longitude
+    0) e guardada relativa ao centro; cada pedido só soma o centro. Com o
+    passo padrão (~110 m) a diferença de forma é muito menor que um pixel
+    em qualquer escala em que o anel inteiro caiba na tela.
+    """
+
+    def __init__(self, passo_lat=1e-3, max_formas=64):
+        self.passo_lat = passo_lat
+        self.max_formas = max_formas
+        self._formas = OrderedDict()
+        self.calculadas = 0
+
+    def limpar(self):
+        self._formas.clear()
+
+    def aneis(self, modelo, lat, lon, raios_km, tolerancia_km=TOLERANCIA_CORDA_KM):
+        """
+        Mesmo formato de aneis_geodesicos: (lats, lons) com forma
+        (num_aneis, num_vertices + 1) e os anéis fechados.
+        """
+        raios_km = tuple(float(r) for r in np.atleast_1d(raios_km))
+        lat_q = round(lat / self.passo_lat) * self.passo_lat
+        chave = (id(modelo), raios_km, float(tolerancia_km), lat_q)
+        forma = self._formas.get(chave)
+        if forma is None:
+            lats, lons = aneis_geodesicos(modelo, lat_q, 0.0, raios_km, tolerancia_km)
+            forma = (lats - lat_q, lons)
+            self._formas[chave] = forma
+            self.calculadas += 1
+            if len(self._formas) > self.max_formas:
+                self._formas.popitem(last=False)
+        else:
+            self._formas.move_to_end(chave)
+        return forma[0] + lat, forma[1] + lon
@@ -0,0 +1,838 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ geodesia
+                                 A QGIS plugin
+ Horizon Projector - Geodésicas na esfera e no elipsoide (WGS84)
+                             -------------------
+        begin                : 2026-01-11
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Alberto Rodrigues
+        email                : betorodriuges@msn.com
+ ***************************************************************************/
+
+ Solução vetorizada (NumPy) dos problemas direto e inverso sobre a esfera
+ (fórmulas de navegação ortodrômica) e sobre o elipsoide, seguindo as
+ séries de C. F. F. Karney, "Algorithms for geodesics", J. Geodesy 87,
+ 43-55 (2013), até a ordem 6 em n/eps.
+
+ Os dois modelos têm a mesma interface: leque(), destino() e inverso().
+
+ Este módulo não depende de Qt nem do QGIS.
+"""
+
+import math
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Raio médio da Terra para o modelo esférico (km)
+RAIO_TERRA_KM = 6371.0
+
+# Elipsoide WGS84 (semi-eixo maior em km, como o restante do plugin)
+WGS84_A_KM = 6378.137
+WGS84_F = 1 / 298.257223563
+
+# Ordem das séries (nA1 = nC1 = nC1p = nA2 = nC2 = nA3 = nC3 = 6)
+_ORDEM = 6
+
+_TINY = math.sqrt(np.finfo(float).tiny)
+_TOL0 = np.finfo(float).eps
+_TOL2 = math.sqrt(_TOL0)
+_TOLB = _TOL0
+_MAXIT1 = 20
+_MAXIT2 = _MAXIT1 + np.finfo(float).nmant + 11
+
+_COEF_A1M1 = [1, 4, 64, 0, 256]
+_COEF_C1 = [
+    -1, 6, -16, 32,
+    -9, 64, -128, 2048,
+    9, -16, 768,
+    3, -5, 512,
+    -7, 1280,
+    -7, 2048,
+]
+_COEF_C1P = [
+    205, -432, 768, 1536,
+    4005, -4736, 3840, 12288,
+    -225, 116, 384,
+    -7173, 2695, 7680,
+    3467, 7680,
+    38081, 61440,
+]
+_COEF_A2M1 = [-11, -28, -192, 0, 256]
+_COEF_C2 = [
+    1, 2, 16, 32,
+    35, 64, 384, 2048,
+    15, 80, 768,
+    7, 35, 512,
+    63, 1280,
+    77, 2048,
+]
+_COEF_A3 = [
+    -3, 128,
+    -2, -3, 64,
+    -1, -3, -1, 16,
+    3, -1, -2, 8,
+    1, -1, 2,
+    1, 1,
+]
+_COEF_C3 = [
+    3, 128,
+    2, 5, 128,
+    -1, 3, 3, 64,
+    -1, 0, 1, 8,
+    -1, 1, 4,
+    5, 256,
+    1, 3, 128,
+    -3, -2, 3, 64,
+    1, -3, 2, 32,
+    7, 512,
+    -10, 9, 384,
+    5, -9, 5, 192,
+    7, 512,
+    -14, 7, 512,
+    21, 2560,
+]
+
+
+# ============ FUNÇÕES AUXILIARES ============
+
+def _polyval(grau, coef, inicio, x):
+    """Avalia um polinômio pelo método de Horner (coeficiente maior primeiro)."""
+    y = coef[inicio] if grau >= 0 else 0.0
+    for i in range(1, grau + 1):
+        y = y * x + coef[inicio + i]
+    return y
+
+
+def _normalizar(s, c):
+    """Normaliza o par (seno, cosseno) para norma unitária."""
+    r = np.hypot(s, c)
+    return s / r, c / r
+
+
+def _sincosd(graus):
+    """Seno e cosseno de ângulos em graus com redução exata de quadrante."""
+    graus = np.asarray(graus, dtype=np.float64)
+    r = np.fmod(graus, 360.0)
+    q = np.round(r / 90.0)
+    r = np.radians(r - 90.0 * q)
+    s = np.sin(r)
+    c = np.cos(r)
+    q = np.mod(q, 4).astype(np.int64)
+    seno = np.choose(q, [s, c, -s, -c])
+    cosseno = np.choose(q, [c, -s, -c, s]) + 0.0
+    seno = np.where(seno == 0, np.copysign(seno, graus), seno)
+    return seno, cosseno
+
+
+def _arredondar_angulo(graus):
+    """Faz ângulos minúsculos (graus) virarem zero, evitando casos quase singulares."""
+    z = 1 / 16.0
+    y = np.abs(graus)
+    y = np.where(y < z, z - (z - y), y)
+    return np.copysign(y, graus)
+
+
+def _sin_cos_series(seno, sinx, cosx, c):
+    """
+    Soma de Clenshaw de uma série trigonométrica.
+    c tem forma (n+1, ...); c[0] é ignorado na série em seno.
+    """
+    k = len(c)
+    n = k - (1 if seno else 0)
+    ar = 2 * (cosx - sinx) * (cosx + sinx)
+    y1 = np.zeros_like(ar)
+    if n & 1:
+        k -= 1
+        y0 = c[k] + y1
+    else:
+        y0 = np.zeros_like(ar)
+    n //= 2
+    while n:
+        n -= 1
+        k -= 1
+        y1 = ar * y0 - y1 + c[k]
+        k -= 1
+        y0 = ar * y1 - y0 + c[k]
+    if seno:
+        return 2 * sinx * cosx * y0
+    return cosx * (y0 - y1)
+
+
+def _serie_eps2(coef, eps, ordem):
+    """Coeficientes C1, C1' ou C2 (polinômios em eps²) para arrays de eps."""
+    eps2 = eps * eps
+    c = np.zeros((ordem + 1,) + np.shape(eps))
+    d = eps
+    o = 0
+    for l in range(1, ordem + 1):
+        m = (ordem - l) // 2
+        c[l] = d * _polyval(m, coef, o, eps2) / coef[o + m + 1]
+        o += m + 2
+        d = d * eps
+    return c
+
+
+def _a1m1(eps):
+    """A1 - 1."""
+    m = _ORDEM // 2
+    t = _polyval(m, _COEF_A1M1, 0, eps * eps) / _COEF_A1M1[m + 1]
+    return (t + eps) / (1 - eps)
+
+
+def _a2m1(eps):
+    """A2 - 1."""
+    m = _ORDEM // 2
+    t = _polyval(m, _COEF_A2M1, 0, eps * eps) / _COEF_A2M1[m + 1]
+    return (t - eps) / (1 + eps)
+
+
+class LequeEsferico(object):
+    """Feixe de ortodromias que partem de uma mesma origem com vários azimutes."""
+
+    def __init__(self, esfera, lat1, lon1, azimutes):
+        self.esfera = esfera
+        self.lat1 = lat1
+        self.lon1 = lon1
+        self.azimutes = np.asarray(azimutes, dtype=np.float64)
+
+        # Termos que dependem só da origem e dos azimutes
+        self._lat1 = np.radians(np.asarray(lat1, dtype=np.float64))
+        self._lon1 = np.radians(np.asarray(lon1, dtype=np.float64))
+        brng = np.radians(self.azimutes)
+        self._sin_lat1 = np.sin(self._lat1)
+        self._cos_lat1 = np.cos(self._lat1)
+        self._sin_brng = np.sin(brng)
+        self._cos_brng = np.cos(brng)
+
+    def posicoes(self, distancias_km):
+        """
+        Calcula os pontos ao longo das ortodromias do leque.
+
+        Args:
+            distancias_km: Distâncias em km, com broadcasting contra o array
+                de azimutes (ex.: dist[:, np.newaxis] gera anéis x vértices)
+
+        Returns:
+            Tupla (lats, lons, azimutes_finais) de arrays NumPy em graus
+        """
+        # Distância angular (distância / raio da Terra)
+        dist_angular = np.asarray(distancias_km, dtype=np.float64) / self.esfera.raio
+        sin_dist = np.sin(dist_angular)
+        cos_dist = np.cos(dist_angular)
+
+        # Calcular novas latitudes
+        lat2 = np.arcsin(self._sin_lat1 * cos_dist +
+                         self._cos_lat1 * sin_dist * self._cos_brng)
+
+        # Calcular novas longitudes
+        lon2 = self._lon1 + np.arctan2(
+            self._sin_brng * sin_dist * self._cos_lat1,
+            cos_dist - self._sin_lat1 * np.sin(lat2)
+        )
+
+        # Azimute final (rumo de chegada ao ponto destino)
+        azi2 = np.arctan2(
+            self._sin_brng * self._cos_lat1,
+            self._cos_lat1 * cos_dist * self._cos_brng - self._sin_lat1 * sin_dist
+        )
+
+        # Converter de volta para graus
+        return np.degrees(lat2), np.degrees(lon2), np.degrees(azi2)
+
+
+class GeodesicaEsferica(object):
+    """
+    Navegação ortodrômica vetorizada sobre uma esfera de raio fixo.
+
+    Tem a mesma interface de GeodesicaElipsoidal, para que o modelo da
+    Terra possa ser trocado sem mudar quem o usa.
+    """
+
+    def __init__(self, raio_km=RAIO_TERRA_KM):
+        self.raio = float(raio_km)
+
+    def leque(self, lat1, lon1, azimutes):
+        """Devolve o LequeEsferico de uma origem para um conjunto de azimutes."""
+        return LequeEsferico(self, lat1, lon1, azimutes)
+
+    def destino(self, lats, lons, azimutes, distancias_km):
+        """
+        Resolve o problema direto com broadcasting entre todos os argumentos.
+
+        Returns:
+            Tupla (lats_destino, lons_destino, azimutes_finais) em graus
+        """
+        return LequeEsferico(self, lats, lons, azimutes).posicoes(distancias_km)
+
+    def inverso(self, lat1, lon1, lat2, lon2):
+        """
+        Distância ortodrômica (fórmula haversine) e azimutes inicial e final.
+
+        Returns:
+            Tupla (distancias_km, azimutes_iniciais, azimutes_finais)
+        """
+        phi1 = np.radians(np.asarray(lat1, dtype=np.float64))
+        phi2 = np.radians(np.asarray(lat2, dtype=np.float64))
+        dlon = np.radians(np.asarray(lon2, dtype=np.float64) -
+                          np.asarray(lon1, dtype=np.float64))
+        sin_phi1 = np.sin(phi1)
+        cos_phi1 = np.cos(phi1)
+        sin_phi2 = np.sin(phi2)
+        cos_phi2 = np.cos(phi2)
+        sin_dlon = np.sin(dlon)
+        cos_dlon = np.cos(dlon)
+
+        hav = (np.sin((phi2 - phi1) / 2) ** 2 +
+               cos_phi1 * cos_phi2 * np.sin(dlon / 2) ** 2)
+        dist_angular = 2 * np.arcsin(np.sqrt(np.clip(hav, 0.0, 1.0)))
+
+        azi1 = np.arctan2(sin_dlon * cos_phi2,
+                          cos_phi1 * sin_phi2 - sin_phi1 * cos_phi2 * cos_dlon)
+        azi2 = np.arctan2(sin_dlon * cos_phi1,
+                          -cos_phi2 * sin_phi1 + sin_phi2 * cos_phi1 * cos_dlon)
+        return dist_angular * self.raio, np.degrees(azi1), np.degrees(azi2)
+
+
+class _Leque(object):
+    """Termos de preparação de um leque de geodésicas (independem da longitude)."""
+    pass
+
+
+class LequeGeodesico(object):
+    """
+    Feixe de geodésicas que partem de uma mesma origem com vários azimutes.
+
+    Toda a preparação das séries (por latitude e azimute) é feita uma única
+    vez; posicoes() só avalia o trecho que depende da distância.
+    """
+
+    def __init__(self, geodesica, preparo, lat1, lon1):
+        self.geodesica = geodesica
+        self._p = preparo
+        self.lat1 = lat1
+        self.lon1 = lon1
+
+    @property
+    def azimutes(self):
+        """Azimutes de partida (graus) do leque."""
+        return self._p.azi1
+
+    def posicoes(self, distancias_km):
+        """
+        Calcula os pontos ao longo das geodésicas do leque.
+
+        Args:
+            distancias_km: Distâncias em km, com broadcasting contra o array
+                de azimutes (ex.: dist[:, np.newaxis] gera anéis x vértices)
+
+        Returns:
+            Tupla (lats, lons, azimutes_finais) de arrays NumPy em graus
+        """
+        g = self.geodesica
+        p = self._p
+        s12 = np.asarray(distancias_km, dtype=np.float64)
+
+        tau12 = s12 / (g.b * (1 + p.a1m1))
+        stau12 = np.sin(tau12)
+        ctau12 = np.cos(tau12)
+        b12 = -_sin_cos_series(
+            True,
+            p.stau1 * ctau12 + p.ctau1 * stau12,
+            p.ctau1 * ctau12 - p.stau1 * stau12,
+            p.c1pa)
+        sig12 = tau12 - (b12 - p.b11)
+        ssig12 = np.sin(sig12)
+        csig12 = np.cos(sig12)
+
+        ssig2 = p.ssig1 * csig12 + p.csig1 * ssig12
+        csig2 = p.csig1 * csig12 - p.ssig1 * ssig12
+        sbet2 = p.calp0 * ssig2
+        cbet2 = np.hypot(p.salp0, p.calp0 * csig2)
+        polo = cbet2 == 0
+        cbet2 = np.where(polo, _TINY, cbet2)
+        csig2 = np.where(polo, _TINY, csig2)
+
+        somg2 = p.salp0 * ssig2
+        comg2 = csig2
+        salp2 = p.salp0 + 0.0 * csig2
+        calp2 = p.calp0 * csig2
+
+        # Longitude "desenrolada": contínua ao longo da geodésica
+        e = np.copysign(1.0, p.salp0)
+        omg12 = e * (sig12
+                     - (np.arctan2(ssig2, csig2) - np.arctan2(p.ssig1, p.csig1))
+                     + (np.arctan2(e * somg2, comg2) - np.arctan2(e * p.somg1, p.comg1)))
+        lam12 = omg12 + p.a3c * (
+            sig12 + (_sin_cos_series(True, ssig2, csig2, p.c3a) - p.b31))
+
+        lats = np.degrees(np.arctan2(sbet2, g.f1 * cbet2))
+        lons = self.lon1 + np.degrees(lam12)
+        azimutes = np.degrees(np.arctan2(salp2, calp2))
+        return lats, lons, azimutes
+
+
+class GeodesicaElipsoidal(object):
+    """
+    Motor geodésico vetorizado sobre um elipsoide de revolução.
+
+    As distâncias são em km e os ângulos em graus, como no restante do
+    plugin. O preparo das séries de cada origem é guardado em um cache LRU
+    indexado por (latitude, azimutes): um leque de raios ou os vértices de
+    vários anéis a partir do mesmo observador reaproveitam esse trabalho,
+    inclusive para origens em outras longitudes na mesma latitude. O cache é
+    protegido por um lock, pois o mesmo motor é usado pelas tarefas em
+    segundo plano e pela thread principal.
+    """
+
+    def __init__(self, a_km=WGS84_A_KM, f=WGS84_F, tamanho_cache=64):
+        self.a = float(a_km)
+        self.f = float(f)
+        self.f1 = 1 - self.f
+        self.e2 = self.f * (2 - self.f)
+        self.ep2 = self.e2 / (self.f1 * self.f1)
+        self.n = self.f / (2 - self.f)
+        self.b = self.a * self.f1
+        self.tamanho_cache = tamanho_cache
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        # Coeficientes de A3 e C3 dependem apenas de n: calcular uma vez
+        self._a3x = []
+        o = 0
+        for j in range(_ORDEM - 1, -1, -1):
+            m = min(_ORDEM - j - 1, j)
+            self._a3x.append(_polyval(m, _COEF_A3, o, self.n) / _COEF_A3[o + m + 1])
+            o += m + 2
+        self._c3x = []
+        o = 0
+        for l in range(1, _ORDEM):
+            for j in range(_ORDEM - 1, l - 1, -1):
+                m = min(_ORDEM - j - 1, j)
+                self._c3x.append(_polyval(m, _COEF_C3, o, self.n) / _COEF_C3[o + m + 1])
+                o += m + 2
+
+    # ============ SÉRIES ============
+
+    def _a3f(self, eps):
+        """A3(eps)."""
+        return _polyval(_ORDEM - 1, self._a3x, 0, eps)
+
+    def _c3f(self, eps):
+        """Coeficientes C3[1..5](eps); c[0] fica zerado."""
+        c = np.zeros((_ORDEM,) + np.shape(eps))
+        mult = 1.0
+        o = 0
+        for l in range(1, _ORDEM):
+            m = _ORDEM - l - 1
+            mult = mult * eps
+            c[l] = mult * _polyval(m, self._c3x, o, eps)
+            o += m + 1
+        return c
+
+    def _eps(self, calp0):
+        """Parâmetro de expansão eps a partir de cos(alfa0)."""
+        k2 = calp0 * calp0 * self.ep2
+        return k2 / (2 * (1 + np.sqrt(1 + k2)) + k2)
+
+    # ============ PROBLEMA DIRETO ============
+
+    def _preparar(self, lat1, azi1):
+        """Termos das séries que dependem só da latitude e do azimute de partida."""
+        p = _Leque()
+        p.azi1 = azi1
+        salp1, calp1 = _sincosd(_arredondar_angulo(azi1))
+        sbet1, cbet1 = _sincosd(_arredondar_angulo(lat1))
+        sbet1 = self.f1 * sbet1
+        sbet1, cbet1 = _normalizar(sbet1, cbet1)
+        cbet1 = np.maximum(_TINY, cbet1)
+
+        p.salp0 = salp1 * cbet1
+        p.calp0 = np.hypot(calp1, salp1 * sbet1)
+        p.ssig1 = sbet1 + 0.0 * salp1
+        p.somg1 = p.salp0 * sbet1
+        p.csig1 = np.where((sbet1 != 0) | (calp1 != 0), cbet1 * calp1, 1.0)
+        p.comg1 = p.csig1
+        p.ssig1, p.csig1 = _normalizar(p.ssig1, p.csig1)
+
+        eps = self._eps(p.calp0)
+        p.a1m1 = _a1m1(eps)
+        p.c1a = _serie_eps2(_COEF_C1, eps, _ORDEM)
+        p.b11 = _sin_cos_series(True, p.ssig1, p.csig1, p.c1a)
+        s = np.sin(p.b11)
+        c = np.cos(p.b11)
+        p.stau1 = p.ssig1 * c + p.csig1 * s
+        p.ctau1 = p.csig1 * c - p.ssig1 * s
+        p.c1pa = _serie_eps2(_COEF_C1P, eps, _ORDEM)
+        p.a3c = -self.f * p.salp0 * self._a3f(eps)
+        p.c3a = self._c3f(eps)
+        p.b31 = _sin_cos_series(True, p.ssig1, p.csig1, p.c3a)
+        return p
+
+    def leque(self, lat1, lon1, azimutes):
+        """
+        Devolve o LequeGeodesico de uma origem para um conjunto de azimutes.
+
+        Args:
+            lat1: Latitude da origem em graus (escalar)
+            lon1: Longitude da origem em graus (escalar)
+            azimutes: Azimutes verdadeiros em graus (escalar ou array)
+        """
+        azimutes = np.asarray(azimutes, dtype=np.float64)
+        chave = (float(lat1), azimutes.shape, azimutes.tobytes())
+        with self._cache_lock:
+            preparo = self._cache.get(chave)
+            if preparo is not None:
+                self._cache.move_to_end(chave)
+        if preparo is None:
+            preparo = self._preparar(float(lat1), azimutes)
+            with self._cache_lock:
+                self._cache[chave] = preparo
+                if len(self._cache) > self.tamanho_cache:
+                    self._cache.popitem(last=False)
+        return LequeGeodesico(self, preparo, float(lat1), float(lon1))
+
+    def destino(self, lats, lons, azimutes, distancias_km):
+        """
+        Resolve o problema direto com broadcasting entre todos os argumentos.
+
+        Args:
+            lats: Latitudes iniciais em graus
+            lons: Longitudes iniciais em graus
+            azimutes: Azimutes verdadeiros em graus
+            distancias_km: Distâncias em quilômetros
+
+        Returns:
+            Tupla (lats_destino, lons_destino, azimutes_finais) em graus
+        """
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        if lats.ndim == 0 and lons.ndim == 0:
+            # Origem única: aproveita o cache por latitude
+            return self.leque(lats, lons, azimutes).posicoes(distancias_km)
+
+        azimutes = np.asarray(azimutes, dtype=np.float64)
+        lats_b, azimutes_b = np.broadcast_arrays(lats, azimutes)
+        preparo = self._preparar(lats_b, azimutes_b)
+        leque = LequeGeodesico(self, preparo, lats_b, lons)
+        return leque.posicoes(distancias_km)
+
+    # ============ PROBLEMA INVERSO ============
+
+    def _comprimentos(self, eps, sig12, ssig1, csig1, dn1, ssig2, csig2, dn2,
+                      reduzido=False):
+        """Distância (e comprimento reduzido) em unidades de b."""
+        a1 = _a1m1(eps)
+        c1a = _serie_eps2(_COEF_C1, eps, _ORDEM)
+        b1 = (_sin_cos_series(True, ssig2, csig2, c1a) -
+              _sin_cos_series(True, ssig1, csig1, c1a))
+        s12b = (1 + a1) * (sig12 + b1)
+        if not reduzido:
+            return s12b, None
+        a2 = _a2m1(eps)
+        c2a = _serie_eps2(_COEF_C2, eps, _ORDEM)
+        b2 = (_sin_cos_series(True, ssig2, csig2, c2a) -
+              _sin_cos_series(True, ssig1, csig1, c2a))
+        j12 = (a1 - a2) * sig12 + ((1 + a1) * b1 - (1 + a2) * b2)
+        m12b = (dn2 * (csig1 * ssig2) - dn1 * (ssig1 * csig2) -
+                csig1 * csig2 * j12)
+        return s12b, m12b
+
+    def _lambda12(self, sbet1, cbet1, dn1, sbet2, cbet2, dn2,
+                  salp1, calp1, slam120, clam120):
+        """Diferença de longitude (e sua derivada) para um azimute de partida."""
+        calp1 = np.where((sbet1 == 0) & (calp1 == 0), -_TINY, calp1)
+
+        salp0 = salp1 * cbet1
+        calp0 = np.hypot(calp1, salp1 * sbet1)
+
+        ssig1 = sbet1
+        somg1 = salp0 * sbet1
+        csig1 = comg1 = calp1 * cbet1
+        ssig1, csig1 = _normalizar(ssig1, csig1)
+
+        salp2 = np.where(cbet2 != cbet1, salp0 / cbet2, salp1)
+        radicando = (calp1 * cbet1) ** 2 + np.where(
+            cbet1 < -sbet1,
+            (cbet2 - cbet1) * (cbet1 + cbet2),
+            (sbet1 - sbet2) * (sbet1 + sbet2))
+        calp2 = np.where(
+            (cbet2 != cbet1) | (np.abs(sbet2) != -sbet1),
+            np.sqrt(np.maximum(radicando, 0.0)) / cbet2,
+            np.abs(calp1))
+
+        ssig2 = sbet2
+        somg2 = salp0 * sbet2
+        csig2 = comg2 = calp2 * cbet2
+        ssig2, csig2 = _normalizar(ssig2, csig2)
+
+        sig12 = np.arctan2(np.maximum(0.0, csig1 * ssig2 - ssig1 * csig2) + 0.0,
+                           csig1 * csig2 + ssig1 * ssig2)
+        somg12 = np.maximum(0.0, comg1 * somg2 - somg1 * comg2) + 0.0
+        comg12 = comg1 * comg2 + somg1 * somg2
+        eta = np.arctan2(somg12 * clam120 - comg12 * slam120,
+                         comg12 * clam120 + somg12 * slam120)
+
+        eps = self._eps(calp0)
+        c3a = self._c3f(eps)
+        b312 = (_sin_cos_series(True, ssig2, csig2, c3a) -
+                _sin_cos_series(True, ssig1, csig1, c3a))
+        domg12 = -self.f * self._a3f(eps) * salp0 * (sig12 + b312)
+        lam12 = eta + domg12
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            _, m12b = self._comprimentos(eps, sig12, ssig1, csig1, dn1,
+                                         ssig2, csig2, dn2, reduzido=True)
+            dlam12 = np.where(
+                calp2 == 0,
+                -2 * self.f1 * dn1 / sbet1,
+                m12b * self.f1 / (calp2 * cbet2))
+
+        return (lam12, salp2, calp2, sig12, ssig1, csig1, ssig2, csig2,
+                eps, dlam12)
+
+    def inverso(self, lat1, lon1, lat2, lon2):
+        """
+        Resolve o problema inverso com broadcasting entre os argumentos.
+
+        Args:
+            lat1, lon1: Coordenadas do primeiro ponto em graus
+            lat2, lon2: Coordenadas do segundo ponto em graus
+
+        Returns:
+            Tupla (distancias_km, azimutes_iniciais, azimutes_finais)
+        """
+        lat1, lon1, lat2, lon2 = np.broadcast_arrays(
+            *[np.asarray(v, dtype=np.float64) for v in (lat1, lon1, lat2, lon2)])
+        forma = lat1.shape
+        lat1, lon1, lat2, lon2 = [np.ravel(v).copy() for v in (lat1, lon1, lat2, lon2)]
+
+        # Diferença de longitude em [-180, 180], tornada positiva
+        lon12 = np.remainder(lon2 - lon1 + 180.0, 360.0) - 180.0
+        lon12 = np.where(lon12 == -180.0, 180.0, lon12)
+        sinal_lon = np.copysign(1.0, lon12)
+        lon12 = sinal_lon * lon12
+        lam12 = np.radians(lon12)
+        slam12, clam12 = _sincosd(_arredondar_angulo(lon12))
+        lon12s = 180.0 - lon12
+
+        # Ponto de maior |latitude| vira o ponto 1, com lat1 <= 0
+        lat1 = _arredondar_angulo(lat1)
+        lat2 = _arredondar_angulo(lat2)
+        troca = np.where(np.abs(lat1) < np.abs(lat2), -1.0, 1.0)
+        sinal_lon = sinal_lon * troca
+        lat1, lat2 = np.where(troca < 0, lat2, lat1), np.where(troca < 0, lat1, lat2)
+        sinal_lat = np.copysign(1.0, -lat1)
+        lat1 = lat1 * sinal_lat
+        lat2 = lat2 * sinal_lat
+
+        sbet1, cbet1 = _sincosd(lat1)
+        sbet1, cbet1 = _normalizar(self.f1 * sbet1, cbet1)
+        cbet1 = np.maximum(_TINY, cbet1)
+        sbet2, cbet2 = _sincosd(lat2)
+        sbet2, cbet2 = _normalizar(self.f1 * sbet2, cbet2)
+        cbet2 = np.maximum(_TINY, cbet2)
+
+        sbet2 = np.where((cbet1 < -sbet1) & (cbet2 == cbet1),
+                         np.copysign(sbet1, sbet2), sbet2)
+        cbet2 = np.where((cbet1 >= -sbet1) & (np.abs(sbet2) == -sbet1),
+                         cbet1, cbet2)
+
+        dn1 = np.sqrt(1 + self.ep2 * sbet1 * sbet1)
+        dn2 = np.sqrt(1 + self.ep2 * sbet2 * sbet2)
+
+        n = lat1.size
+        s12x = np.full(n, np.nan)
+        salp1 = np.full(n, np.nan)
+        calp1 = np.full(n, np.nan)
+        salp2 = np.full(n, np.nan)
+        calp2 = np.full(n, np.nan)
+        resolvido = np.zeros(n, dtype=bool)
+
+        # --- Geodésicas meridionais ---
+        meridiano = (lat1 == -90) | (slam12 == 0)
+        if meridiano.any():
+            i = meridiano
+            c1 = clam12[i]
+            s1 = slam12[i]
+            ssig1 = sbet1[i]
+            csig1 = c1 * cbet1[i]
+            ssig2 = sbet2[i]
+            csig2 = cbet2[i]
+            sig12 = np.arctan2(np.maximum(0.0, csig1 * ssig2 - ssig1 * csig2) + 0.0,
+                               csig1 * csig2 + ssig1 * ssig2)
+            s12b, m12b = self._comprimentos(
+                self.n + 0.0 * sig12, sig12, ssig1, csig1, dn1[i],
+                ssig2, csig2, dn2[i], reduzido=True)
+            ok = (sig12 < _TOL2) | (m12b >= 0)
+            nulo = ok & ((sig12 < 3 * _TINY) |
+                         ((sig12 < _TOL0) & ((s12b < 0) | (m12b < 0))))
+            s12b = np.where(nulo, 0.0, s12b)
+            idx = np.flatnonzero(i)[ok]
+            s12x[idx] = s12b[ok] * self.b
+            salp1[idx] = s1[ok]
+            calp1[idx] = c1[ok]
+            salp2[idx] = 0.0
+            calp2[idx] = 1.0
+            resolvido[idx] = True
+
+        # --- Geodésicas ao longo do equador ---
+        equador = (~resolvido) & (sbet1 == 0) & (lon12s >= self.f * 180)
+        if equador.any():
+            s12x[equador] = self.a * lam12[equador]
+            salp1[equador] = salp2[equador] = 1.0
+            calp1[equador] = calp2[equador] = 0.0
+            resolvido |= equador
+
+        # --- Caso geral: Newton sobre o azimute de partida ---
+        geral = np.flatnonzero(~resolvido)
+        if geral.size:
+            resultado = self._inverso_geral(
+                sbet1[geral], cbet1[geral], dn1[geral],
+                sbet2[geral], cbet2[geral], dn2[geral],
+                lam12[geral], slam12[geral], clam12[geral])
+            s12x[geral], salp1[geral], calp1[geral], salp2[geral], calp2[geral] = resultado
+
+        s12 = 0.0 + s12x
+
+        # Desfazer as trocas da forma canônica
+        t_salp1 = np.where(troca < 0, salp2, salp1)
+        t_calp1 = np.where(troca < 0, calp2, calp1)
+        t_salp2 = np.where(troca < 0, salp1, salp2)
+        t_calp2 = np.where(troca < 0, calp1, calp2)
+        t_salp1 = t_salp1 * troca * sinal_lon
+        t_calp1 = t_calp1 * troca * sinal_lat
+        t_salp2 = t_salp2 * troca * sinal_lon
+        t_calp2 = t_calp2 * troca * sinal_lat
+
+        azi1 = np.degrees(np.arctan2(t_salp1, t_calp1))
+        azi2 = np.degrees(np.arctan2(t_salp2, t_calp2))
+        return s12.reshape(forma), azi1.reshape(forma), azi2.reshape(forma)
+
+    def _inverso_geral(self, sbet1, cbet1, dn1, sbet2, cbet2, dn2,
+                       lam12, slam12, clam12):
+        """Caso geral do problema inverso (nem meridional nem equatorial)."""
+        # Estimativa inicial pela aproximação esférica
+        sbet12 = sbet2 * cbet1 - cbet2 * sbet1
+        cbet12 = cbet2 * cbet1 + sbet2 * sbet1
+        sbet12a = sbet2 * cbet1 + cbet2 * sbet1
+        curta = (cbet12 >= 0) & (sbet12 < 0.5) & (cbet2 * lam12 < 0.5)
+
+        sbetm2 = (sbet1 + sbet2) ** 2
+        sbetm2 = sbetm2 / (sbetm2 + (cbet1 + cbet2) ** 2)
+        dnm = np.sqrt(1 + self.ep2 * sbetm2)
+        omg12 = lam12 / (self.f1 * dnm)
+        somg12 = np.where(curta, np.sin(omg12), slam12)
+        comg12 = np.where(curta, np.cos(omg12), clam12)
+
+        salp1 = cbet2 * somg12
+        with np.errstate(divide='ignore', invalid='ignore'):
+            calp1 = np.where(
+                comg12 >= 0,
+                sbet12 + cbet2 * sbet1 * somg12 ** 2 / (1 + comg12),
+                sbet12a - cbet2 * sbet1 * somg12 ** 2 / (1 - comg12))
+        ssig12 = np.hypot(salp1, calp1)
+        csig12 = sbet1 * sbet2 + cbet1 * cbet2 * comg12
+
+        # Linhas muito curtas: solução esférica com raio local já é exata
+        etol2 = 0.1 * _TOL2 / math.sqrt(
+            max(0.001, abs(self.f)) * min(1.0, 1 - self.f / 2) / 2)
+        muito_curta = curta & (ssig12 < etol2)
+        salp2_c = cbet1 * somg12
+        with np.errstate(divide='ignore', invalid='ignore'):
+            calp2_c = sbet12 - cbet1 * sbet2 * np.where(
+                comg12 >= 0, somg12 ** 2 / (1 + comg12), 1 - comg12)
+        salp2_c, calp2_c = _normalizar(salp2_c, calp2_c)
+        sig12_c = np.arctan2(ssig12, csig12)
+
+        valido = salp1 > 0
+        salp1, calp1 = _normalizar(np.where(valido, salp1, 1.0),
+                                   np.where(valido, calp1, 0.0))
+
+        # Newton com intervalo de segurança (bisseção quando necessário)
+        salp1a = np.full_like(salp1, _TINY)
+        calp1a = np.ones_like(salp1)
+        salp1b = np.full_like(salp1, _TINY)
+        calp1b = -np.ones_like(salp1)
+        tripn = np.zeros(salp1.shape, dtype=bool)
+        tripb = np.zeros(salp1.shape, dtype=bool)
+        ativo = ~muito_curta
+
+        saida = None
+        for numit in range(_MAXIT2 + 1):
+            (v, salp2, calp2, sig12, ssig1, csig1, ssig2, csig2,
+             eps, dv) = self._lambda12(sbet1, cbet1, dn1, sbet2, cbet2, dn2,
+                                       salp1, calp1, slam12, clam12)
+            v = v - 0.0
+            convergiu = tripb | ~(np.abs(v) >= np.where(tripn, 8.0, 1.0) * _TOL0)
+            if saida is None:
+                saida = [salp2, calp2, sig12, ssig1, csig1, ssig2, csig2, eps]
+            terminou = ativo & (convergiu | (numit == _MAXIT2))
+            for destino, valor in zip(saida, (salp2, calp2, sig12, ssig1,
+                                              csig1, ssig2, csig2, eps)):
+                destino[terminou] = valor[terminou]
+            ativo = ativo & ~terminou
+            if not ativo.any():
+                break
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                maior_b = ativo & (v > 0) & ((numit > _MAXIT1) |
+                                             (calp1 / salp1 > calp1b / salp1b))
+                menor_a = ativo & (v < 0) & ((numit > _MAXIT1) |
+                                             (calp1 / salp1 < calp1a / salp1a))
+            salp1b = np.where(maior_b, salp1, salp1b)
+            calp1b = np.where(maior_b, calp1, calp1b)
+            salp1a = np.where(menor_a, salp1, salp1a)
+            calp1a = np.where(menor_a, calp1, calp1a)
+
+            newton = ativo & (numit + 1 < _MAXIT1) & (dv > 0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                dalp1 = np.where(newton, -v / dv, 0.0)
+            newton &= np.abs(dalp1) < math.pi
+            sdalp1 = np.sin(dalp1)
+            cdalp1 = np.cos(dalp1)
+            nsalp1 = salp1 * cdalp1 + calp1 * sdalp1
+            newton &= nsalp1 > 0
+            ncalp1 = calp1 * cdalp1 - salp1 * sdalp1
+            ns, nc = _normalizar(nsalp1, ncalp1)
+
+            bissecao = ativo & ~newton
+            ms, mc = _normalizar((salp1a + salp1b) / 2, (calp1a + calp1b) / 2)
+
+            salp1 = np.where(newton, ns, np.where(bissecao, ms, salp1))
+            calp1 = np.where(newton, nc, np.where(bissecao, mc, calp1))
+            tripn = np.where(newton, np.abs(v) <= 16 * _TOL0,
+                             np.where(bissecao, False, tripn))
+            tripb = np.where(
+                bissecao,
+                (np.abs(salp1a - salp1) + (calp1a - calp1) < _TOLB) |
+                (np.abs(salp1 - salp1b) + (calp1 - calp1b) < _TOLB),
+                tripb)
+
+        salp2, calp2, sig12, ssig1, csig1, ssig2, csig2, eps = saida
+        s12b, _ = self._comprimentos(eps, sig12, ssig1, csig1, dn1,
+                                     ssig2, csig2, dn2)
+        s12x = s12b * self.b
+
+        # Linhas muito curtas
+        s12x = np.where(muito_curta, sig12_c * self.b * dnm, s12x)
+        salp2 = np.where(muito_curta, salp2_c, salp2)
+        calp2 = np.where(muito_curta, calp2_c, calp2)
+        return s12x, salp1, calp1, salp2, calp2
+
+
+def criar_modelo_terra(nome):
+    """
+    Cria o motor geodésico de um modelo da Terra.
+
+    Args:
+        nome: 'esfera' ou 'wgs84'
+    """
+    if nome == 'esfera':
+        return GeodesicaEsferica()
+    if nome == 'wgs84':
+        return GeodesicaElipsoidal()
+    raise ValueError(f"Modelo da Terra desconhecido: {nome}")
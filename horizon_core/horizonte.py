@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ horizonte
+                                 A QGIS plugin
+ Horizon Projector - Distâncias ao horizonte e de visibilidade
+                             -------------------
+        begin                : 2026-01-11
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Alberto Rodrigues
+        email                : betorodriuges@msn.com
+ ***************************************************************************/
+
+ Distância geométrica ao horizonte, d = sqrt(2 * R * h + h²), e distância
+ máxima de visibilidade entre observador e objeto. As versões vetorizadas
+ usam a mesma ordem de operações das escalares e dão resultados idênticos.
+
+ Este módulo não depende de Qt nem do QGIS.
+"""
+
+import math
+
+import numpy as np
+
+from .geodesia import RAIO_TERRA_KM
+
+
+def distancia_horizonte(altura_m, raio_km=RAIO_TERRA_KM):
+    """
+    Calcula a distância ao horizonte baseado na altura do observador.
+    Fórmula: d = sqrt(2 * R * h + h²)
+    onde R é o raio da Terra em km e h é a altura em km
+    """
+    h_km = altura_m / 1000.0
+    distancia_km = math.sqrt(2 * raio_km * h_km + h_km * h_km)
+    return distancia_km
+
+
+def distancia_objeto(altura_obs_m, altura_obj_m, raio_km=RAIO_TERRA_KM):
+    """
+    Calcula a distância máxima para ver um objeto.
+    É a soma das distâncias ao horizonte do observador e do objeto.
+    """
+    dist_obs = distancia_horizonte(altura_obs_m, raio_km)
+    dist_obj = distancia_horizonte(altura_obj_m, raio_km)
+    return dist_obs + dist_obj
+
+
+def distancias_horizonte(alturas_m, raio_km=RAIO_TERRA_KM):
+    """
+    Versão vetorizada de distancia_horizonte.
+    Aceita arrays NumPy, listas ou buffers de alturas (m) e devolve um
+    array de distâncias (km) idêntico ao cálculo escalar, elemento a elemento.
+    """
+    h_km = np.asarray(alturas_m, dtype=np.float64) / 1000.0
+    distancias_km = np.sqrt(2 * raio_km * h_km + h_km * h_km)
+    return distancias_km
+
+
+def distancias_objeto(alturas_obs_m, alturas_obj_m, raio_km=RAIO_TERRA_KM):
+    """
+    Versão vetorizada de distancia_objeto.
+    As alturas do observador e do objeto seguem as regras de broadcasting
+    do NumPy (ex.: um observador contra uma lista de faróis).
+    """
+    dist_obs = distancias_horizonte(alturas_obs_m, raio_km)
+    dist_obj = distancias_horizonte(alturas_obj_m, raio_km)
+    return dist_obs + dist_obj
@@ -0,0 +1,442 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ indice
+                                 A QGIS plugin
+ Horizon Projector - Índice espacial e consultas de visibilidade
+                             -------------------
+        begin                : 2026-01-11
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Alberto Rodrigues
+        email                : betorodriuges@msn.com
+ ***************************************************************************/
+
+ Índice em grade regular de latitude/longitude, guardado como uma lista
+ ordenada por célula (estilo CSR): cada consulta visita só as células da
+ caixa que envolve o círculo de busca e devolve os candidatos em O(k), sem
+ percorrer todos os pontos. O teste exato é feito depois, só com eles.
+
+ Este módulo não depende de Qt nem do QGIS.
+"""
+
+import math
+
+import numpy as np
+
+from .geodesia import RAIO_TERRA_KM, GeodesicaEsferica
+from .horizonte import distancia_objeto, distancias_horizonte, distancias_objeto
+
+# Quilômetros por grau de arco na esfera do plugin
+KM_POR_GRAU = RAIO_TERRA_KM * math.pi / 180.0
+
+# Folga da caixa de busca: cobre o achatamento do elipsoide WGS84
+_FOLGA = 1.01
+
+# Filtro barato (haversine) antes do motor geodésico escolhido
+_ESFERA = GeodesicaEsferica()
+
+
+def _espalhar_bits(valores):
+    """Intercala zeros entre os 32 bits baixos de cada valor (uint64)."""
+    v = valores.astype(np.uint64) & np.uint64(0xFFFFFFFF)
+    for deslocamento, mascara in ((16, 0x0000FFFF0000FFFF), (8, 0x00FF00FF00FF00FF),
+                                  (4, 0x0F0F0F0F0F0F0F0F), (2, 0x3333333333333333),
+                                  (1, 0x5555555555555555)):
+        v = (v | (v << np.uint64(deslocamento))) & np.uint64(mascara)
+    return v
+
+
+def chaves_morton(lats, lons, bits=16):
+    """
+    Chave de Morton (curva Z) de cada ponto, com bits de resolução por eixo.
+    Ordenar por ela deixa pontos próximos no mapa próximos na lista: é a
+    partição espacial usada para unir geometrias vizinhas em grupos.
+    """
+    escala = (1 << bits) - 1
+    linhas = np.round((np.clip(np.asarray(lats, dtype=np.float64), -90.0, 90.0) + 90.0)
+                      / 180.0 * escala)
+    colunas = np.round(np.remainder(np.asarray(lons, dtype=np.float64) + 180.0, 360.0)
+                       / 360.0 * escala)
+    return (_espalhar_bits(linhas) << np.uint64(1)) | _espalhar_bits(colunas)
+
+
+def _extensao_busca(lat, raio_km):
+    """
+    Faixa de latitudes (lat_min, lat_max) e meia largura em longitude (dlon,
+    180 se a caixa alcança um polo) da caixa que envolve o círculo de raio_km.
+    """
+    dlat = raio_km / KM_POR_GRAU * _FOLGA
+    lat_min, lat_max = lat - dlat, lat + dlat
+    lat_extrema = max(abs(lat_min), abs(lat_max))
+    if lat_extrema >= 90.0:
+        dlon = 180.0
+    else:
+        dlon = min(dlat / math.cos(math.radians(lat_extrema)), 180.0)
+    return max(lat_min, -90.0), min(lat_max, 90.0), dlon
+
+
+def caixas_busca(lat, lon, raio_km):
+    """
+    Retângulos (lon_min, lat_min, lon_max, lat_max) em graus que cobrem o
+    círculo de raio_km em torno de (lat, lon), com a mesma folga de
+    IndiceEspacial.candidatos: um só, ou dois se a caixa cruza o antimeridiano.
+    """
+    lat_min, lat_max, dlon = _extensao_busca(lat, raio_km)
+    if dlon >= 180.0:
+        return [(-180.0, lat_min, 180.0, lat_max)]
+    lon = (lon + 180.0) % 360.0 - 180.0
+    lon_min, lon_max = lon - dlon, lon + dlon
+    if lon_min < -180.0:
+        return [(lon_min + 360.0, lat_min, 180.0, lat_max), (-180.0, lat_min, lon_max, lat_max)]
+    if lon_max > 180.0:
+        return [(lon_min, lat_min, 180.0, lat_max), (-180.0, lat_min, lon_max - 360.0, lat_max)]
+    return [(lon_min, lat_min, lon_max, lat_max)]
+
+
+class IndiceEspacial:
+    """
+    Índice espacial de pontos (lat, lon) em graus, numa grade regular.
+
+    Args:
+        lats, lons: Coordenadas dos pontos em graus
+        tamanho_celula_graus: Lado da célula da grade; da ordem do raio típico
+            de busca (0,5° ≈ 55 km, o alcance de um farol alto)
+    """
+
+    def __init__(self, lats, lons, tamanho_celula_graus=0.5):
+        self.lats = np.asarray(lats, dtype=np.float64).ravel()
+        self.lons = np.asarray(lons, dtype=np.float64).ravel()
+        self.tamanho_celula = float(tamanho_celula_graus)
+        self.n_linhas = int(math.ceil(180.0 / self.tamanho_celula))
+        self.n_colunas = int(math.ceil(360.0 / self.tamanho_celula))
+
+        chaves = (self._linhas(self.lats) * self.n_colunas
+                  + self._colunas(self.lons))
+        self._ordem = np.argsort(chaves, kind='stable')
+        self._inicios = np.searchsorted(
+            chaves[self._ordem], np.arange(self.n_linhas * self.n_colunas + 1))
+
+    def __len__(self):
+        return self.lats.size
+
+    def _linhas(self, lats):
+        linhas = np.floor((np.asarray(lats) + 90.0) / self.tamanho_celula).astype(np.intp)
+        return np.clip(linhas, 0, self.n_linhas - 1)
+
+    def _colunas(self, lons):
+        lons = np.remainder(np.asarray(lons) + 180.0, 360.0)
+        colunas = np.floor(lons / self.tamanho_celula).astype(np.intp)
+        return np.clip(colunas, 0, self.n_colunas - 1)
+
+    def candidatos(self, lat, lon, raio_km):
+        """
+        Índices dos pontos dentro da caixa que envolve o círculo de raio_km em
+        torno de (lat, lon). Inclui todos os pontos a até raio_km (e alguns
+        além, nos cantos da caixa).
+        """
+        lat_min, lat_max, dlon = _extensao_busca(lat, raio_km)
+        linhas = np.arange(self._linhas(lat_min), self._linhas(lat_max) + 1)
+
+        if dlon >= 180.0:
+            colunas = np.arange(self.n_colunas)
+        else:
+            # Passa pelo antimeridiano com o resto da divisão
+            inicio = int(math.floor((lon - dlon + 180.0) / self.tamanho_celula))
+            fim = int(math.floor((lon + dlon + 180.0) / self.tamanho_celula))
+            colunas = np.unique(np.remainder(np.arange(inicio, fim + 1), self.n_colunas))
+
+        celulas = (linhas[:, None] * self.n_colunas + colunas[None, :]).ravel()
+        inicios = self._inicios[celulas]
+        fins = self._inicios[celulas + 1]
+        cheias = fins > inicios
+        if not cheias.any():
+            return np.empty(0, dtype=np.intp)
+        return np.concatenate([self._ordem[i:f] for i, f in
+                               zip(inicios[cheias].tolist(), fins[cheias].tolist())])
+
+
+def objetos_visiveis(indice, alturas_obj_m, lat, lon, altura_obs_m, modelo,
+                     raio_km=RAIO_TERRA_KM):
+    """
+    Objetos geometricamente visíveis de um observador.
+
+    Os candidatos são os pontos do índice dentro do maior alcance possível
+    (observador contra o objeto mais alto); o teste exato, distância
+    geodésica contra a soma das distâncias ao horizonte, é feito só com eles.
+
+    Args:
+        indice: IndiceEspacial com as posições dos objetos
+        alturas_obj_m: Altura de cada objeto do índice (m)
+        lat, lon: Posição do observador em graus
+        altura_obs_m: Altura dos olhos do observador (m)
+        modelo: Motor geodésico (GeodesicaEsferica ou GeodesicaElipsoidal)
+
+    Returns:
+        Tupla (indices, distancias_km, azimutes, alcances_km) dos objetos
+        visíveis, do mais próximo ao mais distante
+    """
+    alturas_obj_m = np.asarray(alturas_obj_m, dtype=np.float64)
+    vazio = np.empty(0)
+    if len(indice) == 0:
+        return np.empty(0, dtype=np.intp), vazio, vazio, vazio
+
+    alcance_max = distancia_objeto(altura_obs_m, float(alturas_obj_m.max()), raio_km)
+    candidatos = indice.candidatos(lat, lon, alcance_max)
+    if candidatos.size == 0:
+        return candidatos, vazio, vazio, vazio
+
+    distancias, azimutes, _ = modelo.inverso(
+        lat, lon, indice.lats[candidatos], indice.lons[candidatos])
+    alcances = distancias_objeto(altura_obs_m, alturas_obj_m[candidatos], raio_km)
+    visiveis = np.flatnonzero(distancias <= alcances)
+    visiveis = visiveis[np.argsort(distancias[visiveis], kind='stable')]
+    return (candidatos[visiveis], distancias[visiveis],
+            np.mod(azimutes[visiveis], 360.0), alcances[visiveis])
+
+
+# Tipos de evento ao longo de um trajeto
+SURGE = 1
+SOME = -1
+
+# Pares (objeto, ponto do trajeto) testados por chamada ao motor geodésico
+_PARES_POR_LOTE = 500000
+
+
+def distancias_acumuladas(lats, lons, modelo):
+    """Distância (km) percorrida até cada ponto de um trajeto, a partir do primeiro."""
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    if lats.size < 2:
+        return np.zeros(lats.size)
+    trechos, _, _ = modelo.inverso(lats[:-1], lons[:-1], lats[1:], lons[1:])
+    return np.concatenate([[0.0], np.cumsum(trechos)])
+
+
+def posicoes_trajeto(lats, lons, posicoes):
+    """
+    Lat/lon em posições fracionárias do trajeto (2.25 = um quarto do caminho
+    entre os pontos 2 e 3), por interpolação linear entre pontos vizinhos.
+    """
+    posicoes = np.asarray(posicoes, dtype=np.float64)
+    i = np.clip(np.floor(posicoes).astype(np.intp), 0, max(len(lats) - 2, 0))
+    j = np.minimum(i + 1, len(lats) - 1)
+    t = posicoes - i
+    dlon = np.remainder(lons[j] - lons[i] + 180.0, 360.0) - 180.0
+    lon = np.remainder(lons[i] + t * dlon + 180.0, 360.0) - 180.0
+    return lats[i] + t * (lats[j] - lats[i]), lon
+
+
+def _dentro_do_alcance(modelo, lats1, lons1, lats2, lons2, alcances):
+    """
+    distância <= alcance para cada par. Fora da esfera, o haversine decide
+    os pares longe da borda (a distância no WGS84 difere menos de 1%) e só
+    os demais vão para o motor geodésico, bem mais caro.
+    """
+    if isinstance(modelo, GeodesicaEsferica):
+        return modelo.inverso(lats1, lons1, lats2, lons2)[0] <= alcances
+    distancias = _ESFERA.inverso(lats1, lons1, lats2, lons2)[0]
+    dentro = distancias <= alcances / _FOLGA
+    duvida = np.flatnonzero(~dentro & (distancias <= alcances * _FOLGA))
+    if duvida.size:
+        dentro[duvida] = modelo.inverso(
+            lats1[duvida], lons1[duvida], lats2[duvida], lons2[duvida])[0] <= alcances[duvida]
+    return dentro
+
+
+def _trechos_visiveis(obj, pt, lats, lons, lats_obj, lons_obj, alcances, modelo):
+    """
+    Trechos contínuos do trajeto em que cada objeto é visível, a partir de
+    pares (objeto, ponto) candidatos.
+
+    Returns:
+        Tupla (objetos, inicios, fins, some): posições fracionárias de cada
+        trecho e se ele termina antes do último ponto do trajeto
+    """
+    n = lats.size
+    visivel = _dentro_do_alcance(
+        modelo, lats_obj[obj], lons_obj[obj], lats[pt], lons[pt], alcances[obj])
+    obj, pt = obj[visivel], pt[visivel]
+    ordem = np.lexsort((pt, obj))
+    obj, pt = obj[ordem], pt[ordem]
+    if obj.size == 0:
+        return obj, np.empty(0), np.empty(0), np.empty(0, dtype=bool)
+
+    novo = np.r_[True, (obj[1:] != obj[:-1]) | (pt[1:] - pt[:-1] > 1)]
+    primeiros = np.flatnonzero(novo)
+    ultimos = np.r_[primeiros[1:] - 1, obj.size - 1]
+    objetos, inicios, fins = obj[primeiros], pt[primeiros], pt[ultimos]
+    surge, some = inicios > 0, fins < n - 1
+
+    # Cruzamento do alcance entre pontos vizinhos: f = distância - alcance
+    # troca de sinal entre a e a + 1, e a posição é a + f(a) / (f(a) - f(a + 1))
+    a = np.r_[inicios[surge] - 1, fins[some]]
+    a_obj = np.r_[objetos[surge], objetos[some]]
+    f, _, _ = modelo.inverso(lats_obj[np.r_[a_obj, a_obj]], lons_obj[np.r_[a_obj, a_obj]],
+                             lats[np.r_[a, a + 1]], lons[np.r_[a, a + 1]])
+    f = f - alcances[np.r_[a_obj, a_obj]]
+    fa, fb = f[:a.size], f[a.size:]
+    cruzamentos = a + np.clip(fa / np.where(fa != fb, fa - fb, 1.0), 0.0, 1.0)
+
+    n_surge = int(np.count_nonzero(surge))
+    pos_inicios = np.zeros(objetos.size)
+    pos_inicios[surge] = cruzamentos[:n_surge]
+    pos_fins = np.full(objetos.size, float(n - 1))
+    pos_fins[some] = cruzamentos[n_surge:]
+    return objetos, pos_inicios, pos_fins, some
+
+
+def eventos_trajeto(lats, lons, lats_obj, lons_obj, alturas_obj_m, altura_obs_m,
+                    modelo, raio_km=RAIO_TERRA_KM, tamanho_celula_graus=0.5):
+    """
+    Quando cada objeto surge e some ao longo de um trajeto.
+
+    Os pontos do trajeto vão para um IndiceEspacial; os objetos cujo alcance
+    não chega à caixa do trajeto são descartados de uma vez, e dos demais só
+    os pares (objeto, ponto candidato do índice) recebem o teste exato,
+    numa chamada vetorizada ao motor geodésico por lote de pares. Cada
+    trecho contínuo de pontos visíveis vira um intervalo; o instante exato em
+    que o objeto cruza o alcance é interpolado entre o último ponto de um lado
+    e o primeiro do outro. Os eventos são então ordenados ao longo do trajeto e
+    varridos em ordem, contando quantos objetos estão visíveis após cada um.
+
+    Args:
+        lats, lons: Pontos do trajeto, em ordem, em graus
+        lats_obj, lons_obj: Posição dos objetos em graus
+        alturas_obj_m: Altura de cada objeto (m)
+        altura_obs_m: Altura dos olhos do observador a bordo (m)
+        modelo: Motor geodésico (GeodesicaEsferica ou GeodesicaElipsoidal)
+
+    Returns:
+        Tupla (eventos, intervalos) de dicionários de arrays. eventos, em ordem
+        ao longo do trajeto: 'objeto', 'tipo' (SURGE ou SOME), 'posicao'
+        (fracionária, ver posicoes_trajeto) e 'visiveis' (objetos visíveis
+        depois do evento). Um objeto já visível no primeiro ponto surge na
+        posição 0; um ainda visível no último ponto não tem evento SOME.
+        intervalos: 'objeto', 'inicio' e 'fim' (posições fracionárias).
+    """
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    lats_obj = np.asarray(lats_obj, dtype=np.float64)
+    lons_obj = np.asarray(lons_obj, dtype=np.float64)
+    alcances = distancias_objeto(altura_obs_m, alturas_obj_m, raio_km) * np.ones(lats_obj.shape)
+    n = lats.size
+
+    # Poda grossa: objetos cujo alcance não toca a caixa do trajeto
+    candidatos = np.arange(lats_obj.size)
+    if n and lats_obj.size:
+        dlat = alcances / KM_POR_GRAU * _FOLGA
+        candidatos = np.flatnonzero((lats_obj + dlat >= lats.min())
+                                    & (lats_obj - dlat <= lats.max()))
+        lat_extrema = np.abs(lats_obj[candidatos]) + dlat[candidatos]
+        if lons.max() - lons.min() <= 180.0:
+            cos_lat = np.cos(np.radians(np.minimum(lat_extrema, 89.9)))
+            dlon = np.where(lat_extrema < 89.9, dlat[candidatos] / cos_lat, 360.0)
+            centro = (lons.max() + lons.min()) / 2.0
+            meia = (lons.max() - lons.min()) / 2.0
+            afastamento = np.abs(np.remainder(lons_obj[candidatos] - centro + 180.0, 360.0) - 180.0)
+            candidatos = candidatos[afastamento <= meia + dlon]
+
+    # Pares (objeto, ponto candidato) são testados juntos, em lotes limitados;
+    # os pares de um mesmo objeto ficam sempre no mesmo lote
+    indice = IndiceEspacial(lats, lons, tamanho_celula_graus)
+    trechos = []
+    pares_obj, pares_pt, total = [], [], 0
+    for j in candidatos.tolist():
+        pontos = indice.candidatos(lats_obj[j], lons_obj[j], alcances[j])
+        if pontos.size:
+            pares_obj.append(np.full(pontos.size, j, dtype=np.intp))
+            pares_pt.append(pontos)
+            total += pontos.size
+        if total >= _PARES_POR_LOTE:
+            trechos.append(_trechos_visiveis(
+                np.concatenate(pares_obj), np.concatenate(pares_pt),
+                lats, lons, lats_obj, lons_obj, alcances, modelo))
+            pares_obj, pares_pt, total = [], [], 0
+    if pares_obj:
+        trechos.append(_trechos_visiveis(
+            np.concatenate(pares_obj), np.concatenate(pares_pt),
+            lats, lons, lats_obj, lons_obj, alcances, modelo))
+
+    def juntar(indice_parte, dtype):
+        partes = [parte[indice_parte] for parte in trechos]
+        return np.concatenate(partes).astype(dtype) if partes else np.empty(0, dtype=dtype)
+
+    int_objetos = juntar(0, np.intp)
+    int_inicios = juntar(1, np.float64)
+    int_fins = juntar(2, np.float64)
+    some = juntar(3, bool)
+
+    objetos = np.r_[int_objetos, int_objetos[some]]
+    tipos = np.r_[np.full(int_objetos.size, SURGE, dtype=np.int8),
+                  np.full(int(np.count_nonzero(some)), SOME, dtype=np.int8)]
+    posicoes = np.r_[int_inicios, int_fins[some]]
+    # Varredura em ordem ao longo do trajeto (quem some sai antes de quem surge)
+    ordem = np.lexsort((tipos, posicoes))
+    eventos = {
+        'objeto': objetos[ordem],
+        'tipo': tipos[ordem],
+        'posicao': posicoes[ordem],
+        'visiveis': np.cumsum(tipos[ordem], dtype=np.int64),
+    }
+    intervalos = {'objeto': int_objetos, 'inicio': int_inicios, 'fim': int_fins}
+    return eventos, intervalos
+
+
+def pares_intervisiveis(indice, alturas_m, modelo, raio_km=RAIO_TERRA_KM):
+    """
+    Todos os pares de pontos do índice que se enxergam mutuamente (distância
+    até a soma das distâncias ao horizonte das duas alturas).
+
+    Cada ponto i só busca no índice até o seu horizonte mais o maior
+    horizonte do conjunto, e só os pares i < j assim encontrados recebem o
+    teste exato, em lotes vetorizados. Em redes esparsas (alcance pequeno
+    perto da extensão total) o custo cresce quase linearmente com N.
+
+    Args:
+        indice: IndiceEspacial com as posições dos pontos
+        alturas_m: Altura de cada ponto (m)
+        modelo: Motor geodésico (GeodesicaEsferica ou GeodesicaElipsoidal)
+
+    Returns:
+        Tupla (origens, destinos, distancias_km, alcances_km) com uma aresta
+        por par (origem < destino), em ordem de origem e destino
+    """
+    vazio = np.empty(0)
+    sem_pares = np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp), vazio, vazio
+    if len(indice) < 2:
+        return sem_pares
+
+    horizontes = distancias_horizonte(alturas_m, raio_km) * np.ones(len(indice))
+    maior = float(horizontes.max())
+    partes = []
+    origens, destinos, total = [], [], 0
+
+    def testar():
+        i = np.concatenate(origens)
+        j = np.concatenate(destinos)
+        alcances = horizontes[i] + horizontes[j]
+        dentro = _dentro_do_alcance(modelo, indice.lats[i], indice.lons[i],
+                                    indice.lats[j], indice.lons[j], alcances)
+        i, j, alcances = i[dentro], j[dentro], alcances[dentro]
+        distancias, _, _ = modelo.inverso(indice.lats[i], indice.lons[i],
+                                          indice.lats[j], indice.lons[j])
+        partes.append((i, j, distancias, alcances))
+
+    for i in range(len(indice)):
+        candidatos = indice.candidatos(indice.lats[i], indice.lons[i], horizontes[i] + maior)
+        candidatos = candidatos[candidatos > i]
+        if candidatos.size:
+            origens.append(np.full(candidatos.size, i, dtype=np.intp))
+            destinos.append(candidatos)
+            total += candidatos.size
+        if total >= _PARES_POR_LOTE:
+            testar()
+            origens, destinos, total = [], [], 0
+    if origens:
+        testar()
+
+    if not partes:
+        return sem_pares
+    i, j, distancias, alcances = (np.concatenate(v) for v in zip(*partes))
+    ordem = np.lexsort((j, i))
+    return i[ordem], j[ordem], distancias[ordem], alcances[ordem]
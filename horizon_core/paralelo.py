@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ paralelo
+                                 A QGIS plugin
+ Horizon Projector - Execução em lotes num pool de processos
+                             -------------------
+        begin                : 2026-01-11
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Alberto Rodrigues
+        email                : betorodriuges@msn.com
+ ***************************************************************************/
+
+ Este módulo não depende de Qt nem do QGIS.
+
+ As entradas são copiadas uma única vez para memória compartilhada; cada
+ processo de trabalho lê o seu intervalo [i0, i1) e grava o resultado no
+ mesmo intervalo das saídas, também em memória compartilhada. Como cada lote
+ tem lugar fixo, a saída fica na ordem da entrada qualquer que seja a ordem
+ em que os lotes terminam.
+"""
+
+import multiprocessing
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from . import horizonte
+from .circulos import (
+    SEGMENTOS_GEODESICA, TOLERANCIA_CORDA_KM, linhas_geodesicas, num_vertices_circulos,
+)
+from .geodesia import RAIO_TERRA_KM, criar_modelo_terra
+
+TAMANHO_LOTE_PADRAO = 50000
+
+
+# ============ KERNELS ============
+# Funções de módulo (serializáveis) que recebem {nome: array} de um lote.
+
+def kernel_horizonte(entradas, raio_km=RAIO_TERRA_KM):
+    """Distância ao horizonte de cada altura em entradas['altura_m']."""
+    return {'distancia_km': horizonte.distancias_horizonte(entradas['altura_m'], raio_km)}
+
+
+def kernel_objeto(entradas, raio_km=RAIO_TERRA_KM):
+    """Alcance de visibilidade entre entradas['altura_obs_m'] e ['altura_obj_m']."""
+    return {'distancia_km': horizonte.distancias_objeto(
+        entradas['altura_obs_m'], entradas['altura_obj_m'], raio_km)}
+
+
+_MODELOS = {}
+
+
+def _modelo(nome):
+    """Motor geodésico do processo de trabalho, criado uma vez por nome."""
+    if nome not in _MODELOS:
+        _MODELOS[nome] = criar_modelo_terra(nome)
+    return _MODELOS[nome]
+
+
+def kernel_destino(entradas, modelo='esfera'):
+    """Problema direto para entradas 'lat', 'lon', 'azimute' e 'distancia_km'."""
+    lat, lon, azimute = _modelo(modelo).destino(
+        entradas['lat'], entradas['lon'], entradas['azimute'], entradas['distancia_km'])
+    return {'lat': lat, 'lon': lon, 'azimute': azimute}
+
+
+def kernel_geodesicas(entradas, modelo='esfera', num_segmentos=SEGMENTOS_GEODESICA):
+    """
+    Linhas geodésicas (circulos.linhas_geodesicas) para entradas 'lat',
+    'lon', 'azimute' e 'distancia_km'. Devolve 'lats' e 'lons' com forma
+    (n, num_segmentos + 1); a última coluna é o destino.
+    """
+    lats, lons = linhas_geodesicas(
+        _modelo(modelo), entradas['lat'], entradas['lon'], entradas['azimute'],
+        entradas['distancia_km'], num_segmentos)
+    return {'lats': lats, 'lons': lons}
+
+
+def kernel_circulos(entradas, modelo='esfera', num_vertices=8):
+    """
+    Vértices de círculos com num_vertices lados, para entradas 'lat', 'lon'
+    e 'raio_km'. Devolve 'lats' e 'lons' com forma (n, num_vertices + 1),
+    cada anel fechado, como circulos.circulos_geodesicos.
+    """
+    azimutes = np.arange(num_vertices) * (360.0 / num_vertices)
+    lats, lons, _ = _modelo(modelo).destino(
+        entradas['lat'][:, np.newaxis], entradas['lon'][:, np.newaxis],
+        azimutes[np.newaxis, :], entradas['raio_km'][:, np.newaxis])
+    return {'lats': np.concatenate([lats, lats[:, :1]], axis=1),
+            'lons': np.concatenate([lons, lons[:, :1]], axis=1)}
+
+
+# ============ MEMÓRIA COMPARTILHADA ============
+
+def _criar_compartilhado(forma, dtype):
+    """Cria um bloco de memória compartilhada e o array que o usa."""
+    dtype = np.dtype(dtype)
+    tamanho = max(int(np.prod(forma)) * dtype.itemsize, 1)
+    shm = shared_memory.SharedMemory(create=True, size=tamanho)
+    array = np.ndarray(forma, dtype=dtype, buffer=shm.buf)
+    return shm, array, (shm.name, forma, dtype.str)
+
+
+def _processar_lote(funcao, parametros, entradas, saidas, i0, i1):
+    """Roda no processo de trabalho: calcula o lote [i0, i1) no lugar."""
+    blocos = []
+    try:
+        lote = {}
+        for nome, (shm_nome, forma, dtype) in entradas.items():
+            shm = shared_memory.SharedMemory(name=shm_nome)
+            blocos.append(shm)
+            lote[nome] = np.ndarray(forma, dtype=dtype, buffer=shm.buf)[i0:i1]
+        resultado = funcao(lote, **parametros)
+        for nome, (shm_nome, forma, dtype) in saidas.items():
+            shm = shared_memory.SharedMemory(name=shm_nome)
+            blocos.append(shm)
+            np.ndarray(forma, dtype=dtype, buffer=shm.buf)[i0:i1] = resultado[nome]
+        # As views precisam sumir antes de fechar os blocos
+        del lote, resultado
+    finally:
+        for shm in blocos:
+            shm.close()
+    return i1 - i0
+
+
+def interpretador_python():
+    """
+    Interpretador usado para iniciar os processos de trabalho. Dentro do QGIS
+    sys.executable é o próprio QGIS, então procura-se o Python ao lado dele;
+    devolve None se não houver (p.ex. no pacote .app do macOS).
+    """
+    if 'python' in os.path.basename(sys.executable).lower():
+        return sys.executable
+    for nome in ('python.exe', 'pythonw.exe', os.path.join('bin', 'python3')):
+        candidato = os.path.join(sys.exec_prefix, nome)
+        if os.path.exists(candidato):
+            return candidato
+    return None
+
+
+# ============ EXECUÇÃO ============
+
+class ExecutorProcessos(object):
+    """
+    Pool de processos para kernels vetorizados de horizon_core.
+
+    Use como gerenciador de contexto para reaproveitar o pool em várias
+    chamadas de mapear(). Com num_processos=1 tudo roda no processo atual,
+    sem pool nem memória compartilhada, com o mesmo resultado.
+
+    Args:
+        num_processos: Número de processos de trabalho (None = todos os núcleos)
+        tamanho_lote: Número de linhas por lote enviado a um processo
+    """
+
+    def __init__(self, num_processos=None, tamanho_lote=TAMANHO_LOTE_PADRAO):
+        if num_processos is None:
+            num_processos = os.cpu_count() or 1
+        if num_processos < 1 or tamanho_lote < 1:
+            raise ValueError("num_processos e tamanho_lote devem ser positivos")
+        self.num_processos = int(num_processos)
+        self.tamanho_lote = int(tamanho_lote)
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fechar()
+
+    def fechar(self):
+        """Encerra o pool, se houver."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def _obter_pool(self):
+        if self._pool is None:
+            contexto = multiprocessing.get_context('spawn')
+            python = interpretador_python()
+            if python is None:
+                # Sem isso o spawn abriria outra instância do próprio QGIS
+                raise RuntimeError(
+                    f"Nenhum interpretador Python encontrado junto de {sys.executable} "
+                    "para os processos de trabalho; use um único processo.")
+            contexto.set_executable(python)
+            self._pool = ProcessPoolExecutor(self.num_processos, mp_context=contexto)
+        return self._pool
+
+    def mapear(self, funcao, entradas, parametros=None, progresso=None, cancelado=None):
+        """
+        Aplica funcao(lote, **parametros) a todos os lotes das entradas.
+
+        Args:
+            funcao: Kernel de nível de módulo que recebe {nome: array} e
+                devolve {nome: array} com o mesmo número de linhas
+            entradas: Dicionário {nome: array}; todos com o mesmo comprimento
+            parametros: Argumentos nomeados extras para o kernel
+            progresso: Função opcional chamada com a fração concluída (0-1)
+            cancelado: Função opcional; se devolver True, o restante é abortado
+
+        Returns:
+            Dicionário {nome: array} na ordem das entradas, ou None se cancelado
+        """
+        parametros = parametros or {}
+        entradas = {nome: np.ascontiguousarray(v) for nome, v in entradas.items()}
+        comprimentos = {len(v) for v in entradas.values()}
+        if len(comprimentos) != 1:
+            raise ValueError("todas as entradas devem ter o mesmo comprimento")
+        n = comprimentos.pop()
+        limites = [(i0, min(i0 + self.tamanho_lote, n))
+                   for i0 in range(0, n, self.tamanho_lote)]
+
+        if self.num_processos == 1 or len(limites) <= 1:
+            return self._mapear_local(funcao, entradas, parametros, limites,
+                                      progresso, cancelado)
+        return self._mapear_pool(funcao, entradas, parametros, limites, n,
+                                 progresso, cancelado)
+
+    def _mapear_local(self, funcao, entradas, parametros, limites, progresso, cancelado):
+        partes = []
+        for k, (i0, i1) in enumerate(limites):
+            if cancelado is not None and cancelado():
+                return None
+            partes.append(funcao({nome: v[i0:i1] for nome, v in entradas.items()},
+                                 **parametros))
+            if progresso is not None:
+                progresso((k + 1) / len(limites))
+        if not partes:
+            partes = [funcao({nome: v[:0] for nome, v in entradas.items()}, **parametros)]
+        return {nome: np.concatenate([np.asarray(p[nome]) for p in partes])
+                for nome in partes[0]}
+
+    def _mapear_pool(self, funcao, entradas, parametros, limites, n, progresso, cancelado):
+        # A forma e o tipo das saídas vêm do kernel aplicado à primeira linha
+        amostra = funcao({nome: v[:1] for nome, v in entradas.items()}, **parametros)
+
+        blocos = []
+        saidas = {}
+        try:
+            desc_entradas = {}
+            for nome, valor in entradas.items():
+                shm, array, desc = _criar_compartilhado(valor.shape, valor.dtype)
+                blocos.append(shm)
+                array[...] = valor
+                desc_entradas[nome] = desc
+                del array
+
+            desc_saidas = {}
+            for nome, valor in amostra.items():
+                valor = np.asarray(valor)
+                shm, saidas[nome], desc = _criar_compartilhado(
+                    (n,) + valor.shape[1:], valor.dtype)
+                blocos.append(shm)
+                desc_saidas[nome] = desc
+
+            pool = self._obter_pool()
+            pendentes = {pool.submit(_processar_lote, funcao, parametros,
+                                     desc_entradas, desc_saidas, i0, i1)
+                         for i0, i1 in limites}
+            feitos = 0
+            try:
+                while pendentes:
+                    prontos, pendentes = wait(pendentes, timeout=0.2,
+                                              return_when=FIRST_COMPLETED)
+                    for futuro in prontos:
+                        futuro.result()
+                        feitos += 1
+                    if progresso is not None and prontos:
+                        progresso(feitos / len(limites))
+                    if cancelado is not None and cancelado():
+                        return None
+            finally:
+                for futuro in pendentes:
+                    futuro.cancel()
+                wait(pendentes)
+
+            return {nome: np.array(array) for nome, array in saidas.items()}
+        finally:
+            # As views precisam sumir antes de fechar os blocos
+            saidas.clear()
+            for shm in blocos:
+                shm.close()
+                shm.unlink()
+
+
+def circulos_geodesicos_paralelo(executor, modelo, lats, lons, raios_km,
+                                 tolerancia_km=TOLERANCIA_CORDA_KM, cancelado=None):
+    """
+    circulos.circulos_geodesicos distribuído pelo executor: os círculos são
+    agrupados pelo número de vértices e cada grupo vira um mapear() de
+    kernel_circulos, com saídas de largura fixa.
+
+    Args:
+        executor: ExecutorProcessos
+        modelo: Nome do modelo da Terra ('esfera' ou 'wgs84')
+
+    Returns:
+        Lista, na ordem de entrada, de tuplas (lats, lons), ou None se cancelado
+    """
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    raios_km = np.asarray(raios_km, dtype=np.float64)
+    contagens = num_vertices_circulos(raios_km, tolerancia_km)
+
+    resultado = [None] * len(raios_km)
+    for num_vertices in np.unique(contagens):
+        indices = np.flatnonzero(contagens == num_vertices)
+        grupo = executor.mapear(
+            kernel_circulos,
+            {'lat': lats[indices], 'lon': lons[indices], 'raio_km': raios_km[indices]},
+            {'modelo': modelo, 'num_vertices': int(num_vertices)}, cancelado=cancelado)
+        if grupo is None:
+            return None
+        for linha, indice in enumerate(indices):
+            resultado[indice] = (grupo['lats'][linha], grupo['lons'][linha])
+    return resultado
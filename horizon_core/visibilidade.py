@@ -0,0 +1,459 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ visibilidade
+                                 A QGIS plugin
+ Horizon Projector - Viewshed sobre MDE com curvatura da Terra
+                             -------------------
+        begin                : 2026-01-11
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Alberto Rodrigues
+        email                : betorodriuges@msn.com
+ ***************************************************************************/
+
+ Este módulo não depende de Qt nem do QGIS.
+
+ O viewshed varre o MDE em frentes de onda a partir do observador, um octante
+ por vez (estilo R2 / XDraw de Van Kreveld e Franklin). Em cada octante o eixo
+ principal é percorrido coluna a coluna; a linha de visada de cada célula da
+ coluna i cruza a coluna i-1 num ponto cujo "horizonte" (maior tangente do
+ ângulo de elevação já vista) é interpolado linearmente entre as duas células
+ vizinhas. Assim cada célula custa O(1) e a coluna inteira é uma operação
+ vetorizada: o MDE todo é resolvido em 8·N passos NumPy, sem um raio de
+ visada por célula.
+"""
+
+import math
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .geodesia import RAIO_TERRA_KM
+
+# Coeficiente de refração padrão (0 = horizonte puramente geométrico)
+REFRACAO_PADRAO = 0.0
+
+VISIVEL = 1
+INVISIVEL = 0
+SEM_DADOS = 255
+
+# Horizonte inicial: nada bloqueia (finito, para a interpolação não gerar NaN)
+_SEM_HORIZONTE = -1e30
+
+# Folga na comparação com o horizonte do mar (o mar liso o toca exatamente)
+_TOLERANCIA_TANGENTE = 1e-12
+
+
+def queda_curvatura(distancias_m, raio_km=RAIO_TERRA_KM, refracao=REFRACAO_PADRAO):
+    """
+    Queda aparente do terreno (m) devida à curvatura da Terra:
+    d² / (2R), reduzida pelo coeficiente de refração.
+    """
+    distancias_m = np.asarray(distancias_m, dtype=np.float64)
+    return distancias_m * distancias_m * (1.0 - refracao) / (2.0 * raio_km * 1000.0)
+
+
+def _octantes(linha, coluna, linhas, colunas):
+    """
+    Fatias (linhas, colunas) e transposição de cada octante, orientadas para
+    que o observador fique em [0, 0] e o eixo principal seja o primeiro.
+    """
+    fatias_l = (slice(linha, linhas), slice(linha, None, -1))
+    fatias_c = (slice(coluna, colunas), slice(coluna, None, -1))
+    for fl in fatias_l:
+        for fc in fatias_c:
+            yield fl, fc, False
+            yield fl, fc, True
+
+
+def viewshed(mde, linha, coluna, altura_obs_m, tamanho_celula_m,
+             altura_alvo_m=0.0, raio_max_m=None, raio_km=RAIO_TERRA_KM,
+             refracao=REFRACAO_PADRAO, sem_dados=None):
+    """
+    Calcula o viewshed de um observador sobre um MDE.
+
+    Args:
+        mde: Array 2-D de altitudes (m); NaN marca células sem dados
+        linha, coluna: Célula do observador
+        altura_obs_m: Altura do observador acima do terreno (m)
+        tamanho_celula_m: Tamanho da célula (m), escalar ou (dy, dx)
+        altura_alvo_m: Altura do alvo acima do terreno (m)
+        raio_max_m: Alcance máximo (m); além dele as células ficam INVISIVEL
+        raio_km: Raio da Terra
+        refracao: Coeficiente de refração atmosférica
+        sem_dados: Valor do MDE tratado como sem dados (além de NaN)
+
+    Returns:
+        Array uint8 com VISIVEL, INVISIVEL ou SEM_DADOS
+    """
+    mde = np.asarray(mde, dtype=np.float64)
+    if sem_dados is not None:
+        mde = np.where(mde == sem_dados, np.nan, mde)
+    linhas, colunas = mde.shape
+    if not (0 <= linha < linhas and 0 <= coluna < colunas):
+        raise ValueError("observador fora do MDE")
+    dy, dx = np.broadcast_to(np.asarray(tamanho_celula_m, dtype=np.float64), (2,))
+
+    resultado = np.full(mde.shape, INVISIVEL, dtype=np.uint8)
+    z_obs = mde[linha, coluna] + altura_obs_m
+    if np.isnan(z_obs):
+        raise ValueError("observador sobre célula sem dados")
+
+    for fl, fc, transpor in _octantes(linha, coluna, linhas, colunas):
+        z = mde[fl, fc]
+        saida = resultado[fl, fc]
+        da, db = dy, dx
+        if transpor:
+            z, saida, da, db = z.T, saida.T, dx, dy
+        _varrer_octante(z, saida, z_obs, da, db, altura_alvo_m,
+                        raio_max_m, raio_km, refracao)
+
+    resultado[linha, coluna] = VISIVEL
+    resultado[np.isnan(mde)] = SEM_DADOS
+    return resultado
+
+
+def _varrer_octante(z, saida, z_obs, da, db, altura_alvo_m, raio_max_m,
+                    raio_km, refracao):
+    """Varre um octante coluna a coluna (escreve em `saida`, uma view)."""
+    n_principal, n_secundario = z.shape
+    if raio_max_m is not None:
+        n_principal = min(n_principal, int(np.ceil(raio_max_m / da)) + 1)
+
+    horizonte = np.full(1, _SEM_HORIZONTE)
+    for i in range(1, n_principal):
+        m = min(i, n_secundario - 1)
+        j = np.arange(m + 1)
+
+        distancias = np.hypot(i * da, j * db)
+        queda = queda_curvatura(distancias, raio_km, refracao)
+        terreno = z[i, :m + 1] - queda
+        tangente = (terreno - z_obs) / distancias
+        tangente_alvo = (terreno + altura_alvo_m - z_obs) / distancias
+
+        # Onde a visada cruza a coluna anterior
+        jp = j * ((i - 1) / i)
+        j0 = np.floor(jp).astype(np.intp)
+        t = jp - j0
+        j1 = np.minimum(j0 + 1, len(horizonte) - 1)
+        j0 = np.minimum(j0, len(horizonte) - 1)
+        anterior = horizonte[j0] * (1.0 - t) + horizonte[j1] * t
+
+        visivel = tangente_alvo >= anterior
+        if raio_max_m is not None:
+            visivel &= distancias <= raio_max_m
+        saida[i, :m + 1] = visivel
+
+        # Células sem dados não bloqueiam a visada
+        horizonte = np.fmax(anterior, tangente)
+
+
+# ============ VIEWSHED CUMULATIVO ============
+
+# Memória por célula da janela de um observador: o MDE em float64, o
+# resultado uint8 do viewshed e as máscaras booleanas temporárias
+BYTES_POR_CELULA_JANELA = 11
+
+def _bloco_no_alcance(linha, coluna, bl, bc, tamanho_bloco, forma, dy, dx, alcance_m):
+    """Indica se algum ponto do bloco (bl, bc) fica a até alcance_m do observador."""
+    l0, c0 = bl * tamanho_bloco, bc * tamanho_bloco
+    l1 = min(l0 + tamanho_bloco, forma[0]) - 1
+    c1 = min(c0 + tamanho_bloco, forma[1]) - 1
+    dl = max(l0 - linha, 0, linha - l1)
+    dc = max(c0 - coluna, 0, coluna - c1)
+    return math.hypot(dl * dy, dc * dx) <= alcance_m
+
+
+def alcance_maximo_m(tamanho_bloco, max_blocos, dy, dx):
+    """Maior alcance (m) cuja janela cabe em max_blocos blocos para cada lado do observador."""
+    return max_blocos * tamanho_bloco * min(dy, dx)
+
+
+def viewshed_cumulativo(ler_bloco, forma, tamanho_bloco, observadores, tamanho_celula_m,
+                        saida, altura_alvo_m=0.0, raio_km=RAIO_TERRA_KM,
+                        refracao=REFRACAO_PADRAO, progresso=None, cancelado=None,
+                        max_blocos=None):
+    """
+    Soma em `saida` quantos observadores veem cada célula do MDE.
+
+    O MDE é lido em blocos de tamanho_bloco x tamanho_bloco por
+    ler_bloco(bl, bc), e cada observador só lê os blocos que tocam o disco do
+    seu alcance. Os blocos em comum com o observador anterior são
+    reaproveitados (os observadores são processados na ordem dos blocos).
+
+    Com `saida` num np.memmap, a memória não depende do tamanho do MDE nem do
+    número de observadores, mas sim do alcance: cada observador monta uma
+    janela float64 do retângulo do seu alcance, mais o resultado do viewshed
+    e máscaras temporárias, cerca de BYTES_POR_CELULA_JANELA bytes por
+    célula. Com max_blocos, o alcance é recortado (alcance_maximo_m) para que
+    a janela tenha no máximo (2 * max_blocos * tamanho_bloco + 1) células de
+    lado; sem ele, a janela pode cobrir o MDE inteiro.
+
+    Args:
+        ler_bloco: Função (bl, bc) -> array float64 do bloco (NaN = sem dados)
+        forma: (linhas, colunas) do MDE
+        tamanho_bloco: Lado dos blocos em células
+        observadores: Sequência de (linha, coluna, altura_obs_m, alcance_m)
+        tamanho_celula_m: (dy, dx) em metros, ou função (linha) -> (dy, dx)
+        saida: Array 2-D inteiro com a forma do MDE (p.ex. np.memmap)
+        altura_alvo_m: Altura do alvo acima do terreno (m)
+        progresso: Função opcional chamada com a fração concluída (0-1)
+        cancelado: Função opcional; se devolver True, a varredura para
+        max_blocos: Alcance máximo, em blocos para cada lado do observador
+
+    Returns:
+        Número de observadores efetivamente somados
+    """
+    observadores = sorted(
+        observadores,
+        key=lambda o: (int(o[0]) // tamanho_bloco, int(o[1]) // tamanho_bloco))
+    blocos = {}
+    somados = 0
+
+    for k, (linha, coluna, altura_obs_m, alcance_m) in enumerate(observadores):
+        if cancelado is not None and cancelado():
+            break
+        linha, coluna = int(linha), int(coluna)
+        if callable(tamanho_celula_m):
+            dy, dx = tamanho_celula_m(linha)
+        else:
+            dy, dx = np.broadcast_to(np.asarray(tamanho_celula_m, dtype=np.float64), (2,))
+        if max_blocos is not None:
+            alcance_m = min(alcance_m, alcance_maximo_m(tamanho_bloco, max_blocos, dy, dx))
+
+        # Janela retangular do alcance, recortada ao MDE
+        l0 = max(linha - int(math.ceil(alcance_m / dy)), 0)
+        l1 = min(linha + int(math.ceil(alcance_m / dy)) + 1, forma[0])
+        c0 = max(coluna - int(math.ceil(alcance_m / dx)), 0)
+        c1 = min(coluna + int(math.ceil(alcance_m / dx)) + 1, forma[1])
+        janela = np.full((l1 - l0, c1 - c0), np.nan)
+
+        usados = {}
+        for bl in range(l0 // tamanho_bloco, (l1 - 1) // tamanho_bloco + 1):
+            for bc in range(c0 // tamanho_bloco, (c1 - 1) // tamanho_bloco + 1):
+                if not _bloco_no_alcance(linha, coluna, bl, bc, tamanho_bloco,
+                                         forma, dy, dx, alcance_m):
+                    continue
+                bloco = blocos.get((bl, bc))
+                if bloco is None:
+                    bloco = ler_bloco(bl, bc)
+                usados[(bl, bc)] = bloco
+                bl0, bc0 = bl * tamanho_bloco, bc * tamanho_bloco
+                il0, il1 = max(l0, bl0), min(l1, bl0 + bloco.shape[0])
+                ic0, ic1 = max(c0, bc0), min(c1, bc0 + bloco.shape[1])
+                janela[il0 - l0:il1 - l0, ic0 - c0:ic1 - c0] = \
+                    bloco[il0 - bl0:il1 - bl0, ic0 - bc0:ic1 - bc0]
+        # Só os blocos deste observador ficam guardados para o próximo
+        blocos = usados
+
+        if not np.isnan(janela[linha - l0, coluna - c0]):
+            visivel = viewshed(janela, linha - l0, coluna - c0, altura_obs_m, (dy, dx),
+                               altura_alvo_m, alcance_m, raio_km, refracao)
+            saida[l0:l1, c0:c1] += (visivel == VISIVEL)
+            somados += 1
+
+        if progresso is not None:
+            progresso((k + 1) / len(observadores))
+
+    return somados
+
+
+# ============ HORIZONTE DO TERRENO ============
+
+def _cantos_bilinear(forma, linhas, colunas):
+    """Células vizinhas e pesos da interpolação bilinear num MDE de forma dada."""
+    linhas = np.asarray(linhas, dtype=np.float64)
+    colunas = np.asarray(colunas, dtype=np.float64)
+    n_linhas, n_colunas = forma
+    dentro = ((linhas >= 0) & (linhas <= n_linhas - 1)
+              & (colunas >= 0) & (colunas <= n_colunas - 1))
+    l = np.where(dentro, linhas, 0.0)
+    c = np.where(dentro, colunas, 0.0)
+    l0 = np.minimum(np.floor(l).astype(np.intp), max(n_linhas - 2, 0))
+    c0 = np.minimum(np.floor(c).astype(np.intp), max(n_colunas - 2, 0))
+    l1 = np.minimum(l0 + 1, n_linhas - 1)
+    c1 = np.minimum(c0 + 1, n_colunas - 1)
+    return dentro, l0, c0, l1, c1, l - l0, c - c0
+
+
+def _interpolar(z00, z01, z10, z11, tl, tc):
+    return (z00 * (1.0 - tc) + z01 * tc) * (1.0 - tl) + (z10 * (1.0 - tc) + z11 * tc) * tl
+
+
+def amostrar_bilinear(mde, linhas, colunas):
+    """
+    Interpolação bilinear vetorizada de um MDE em coordenadas fracionárias de
+    célula (o centro da célula [i, j] fica em (i, j)). Pontos fora do MDE, ou
+    com algum vizinho sem dados, recebem NaN.
+    """
+    dentro, l0, c0, l1, c1, tl, tc = _cantos_bilinear(mde.shape, linhas, colunas)
+    z = _interpolar(mde[l0, c0], mde[l0, c1], mde[l1, c0], mde[l1, c1], tl, tc)
+    return np.where(dentro, z, np.nan)
+
+
+class AmostradorBlocos:
+    """
+    Amostragem de um MDE lido em blocos alinhados, com cache LRU.
+
+    O MDE é dividido em blocos quadrados de tamanho_bloco células, lidos sob
+    demanda por ler_bloco(bl, bc) (a mesma função de viewshed_cumulativo) e
+    guardados num cache limitado a max_blocos; o bloco menos usado recentemente
+    é descartado primeiro. Consultas repetidas em torno do mesmo ponto não
+    voltam ao disco. Cache e leituras ficam sob um lock: o diálogo usa o mesmo
+    amostrador na QgsTask do horizonte do terreno e, na thread principal, para
+    mostrar a altitude do ponto clicado, e o provedor raster por trás de
+    ler_bloco não pode ser lido por duas threads ao mesmo tempo.
+    """
+
+    def __init__(self, ler_bloco, forma, tamanho_bloco=256, max_blocos=64):
+        self.ler_bloco = ler_bloco
+        self.forma = (int(forma[0]), int(forma[1]))
+        self.tamanho_bloco = int(tamanho_bloco)
+        self.max_blocos = max(int(max_blocos), 1)
+        self.leituras = 0
+        self._blocos_por_linha = -(-self.forma[1] // self.tamanho_bloco)
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def bloco(self, bl, bc):
+        """Bloco (bl, bc) do MDE como array float64, do cache ou do disco."""
+        chave = (int(bl), int(bc))
+        with self._cache_lock:
+            bloco = self._cache.get(chave)
+            if bloco is not None:
+                self._cache.move_to_end(chave)
+                return bloco
+            bloco = np.asarray(self.ler_bloco(*chave), dtype=np.float64)
+            self.leituras += 1
+            self._cache[chave] = bloco
+            if len(self._cache) > self.max_blocos:
+                self._cache.popitem(last=False)
+        return bloco
+
+    def limpar(self):
+        """Esvazia o cache (p.ex. quando o raster de origem muda)."""
+        with self._cache_lock:
+            self._cache.clear()
+
+    def valores(self, linhas, colunas):
+        """Altitudes das células inteiras (linhas, colunas); NaN fora do MDE."""
+        linhas = np.asarray(linhas, dtype=np.intp)
+        colunas = np.asarray(colunas, dtype=np.intp)
+        saida = np.full(linhas.shape, np.nan)
+        dentro = ((linhas >= 0) & (linhas < self.forma[0])
+                  & (colunas >= 0) & (colunas < self.forma[1]))
+        indices = np.flatnonzero(dentro)
+        if indices.size == 0:
+            return saida
+        l = linhas.ravel()[indices]
+        c = colunas.ravel()[indices]
+        chaves = (l // self.tamanho_bloco) * self._blocos_por_linha + c // self.tamanho_bloco
+        # Agrupa os pontos por bloco: cada bloco é consultado uma só vez
+        ordem = np.argsort(chaves, kind='stable')
+        chaves = chaves[ordem]
+        inicios = np.flatnonzero(np.r_[True, chaves[1:] != chaves[:-1]])
+        fins = np.r_[inicios[1:], chaves.size]
+        plana = saida.ravel()
+        for inicio, fim in zip(inicios, fins):
+            bl, bc = divmod(int(chaves[inicio]), self._blocos_por_linha)
+            bloco = self.bloco(bl, bc)
+            sel = ordem[inicio:fim]
+            plana[indices[sel]] = bloco[l[sel] - bl * self.tamanho_bloco,
+                                        c[sel] - bc * self.tamanho_bloco]
+        return saida
+
+    def amostrar(self, linhas, colunas):
+        """Como amostrar_bilinear, mas lendo só os blocos necessários."""
+        dentro, l0, c0, l1, c1, tl, tc = _cantos_bilinear(self.forma, linhas, colunas)
+        z = self.valores(np.stack([l0, l0, l1, l1]), np.stack([c0, c1, c0, c1]))
+        return np.where(dentro, _interpolar(z[0], z[1], z[2], z[3], tl, tc), np.nan)
+
+    def janela(self, linha0, linha1, coluna0, coluna1):
+        """Células [linha0:linha1, coluna0:coluna1], montadas a partir dos blocos."""
+        linhas, colunas = np.mgrid[linha0:linha1, coluna0:coluna1]
+        return self.valores(linhas, colunas)
+
+
+def horizonte_terreno(amostrar, linha, coluna, z_obs_m, tamanho_celula_m, z_max_m,
+                      num_raios=360, passo_m=None, raio_km=RAIO_TERRA_KM,
+                      refracao=REFRACAO_PADRAO, passos_por_lote=64):
+    """
+    Horizonte visível sobre o terreno por marcha vetorizada de raios.
+
+    N raios partem do observador; cada um é amostrado a cada passo_m e para no
+    primeiro ponto de terreno que aparece acima do horizonte do mar (a
+    obstrução). Os raios são marchados juntos, em lotes de passos; um raio sai
+    do lote seguinte quando nenhum terreno adiante (limitado por z_max_m) pode
+    mais subir acima do maior ângulo já visto nele. O custo cresce com o número
+    e o comprimento dos raios, não com a área do MDE.
+
+    Args:
+        amostrar: Função (linhas, colunas) -> altitudes, em coordenadas
+            fracionárias de célula (p.ex. amostrar_bilinear sobre uma janela)
+        linha, coluna: Posição fracionária do observador
+        z_obs_m: Altitude absoluta dos olhos do observador (terreno + altura)
+        tamanho_celula_m: Tamanho da célula (m), escalar ou (dy, dx)
+        z_max_m: Maior altitude do MDE (limita o alcance dos raios)
+        num_raios: Número de azimutes, igualmente espaçados a partir do norte
+        passo_m: Passo da marcha (padrão: menor lado da célula)
+
+    Returns:
+        Tupla (azimutes, distancias_m, angulos_graus, obstruido): a distância
+        até a obstrução (ou até o horizonte geométrico, se nada obstruir), o
+        ângulo de elevação do horizonte aparente e se o raio foi obstruído
+    """
+    dy, dx = np.broadcast_to(np.asarray(tamanho_celula_m, dtype=np.float64), (2,))
+    passo_m = float(passo_m or min(dy, dx))
+    raio_ef_m = raio_km * 1000.0 / (1.0 - refracao) if refracao < 1.0 else np.inf
+    z_obs_m = max(float(z_obs_m), 1e-3)
+
+    # Horizonte do mar: distância e tangente do ângulo de depressão
+    distancia_mar = math.sqrt(2.0 * raio_ef_m * z_obs_m + z_obs_m * z_obs_m)
+    tangente_mar = -math.sqrt(2.0 * z_obs_m / raio_ef_m)
+    # Nada além deste alcance consegue aparecer acima do horizonte do mar
+    alcance_m = distancia_mar + math.sqrt(2.0 * raio_ef_m * max(z_max_m, 0.0))
+
+    azimutes = np.arange(num_raios) * (360.0 / num_raios)
+    seno = np.sin(np.radians(azimutes))
+    cosseno = np.cos(np.radians(azimutes))
+
+    distancias = np.full(num_raios, distancia_mar)
+    maximo = np.full(num_raios, tangente_mar)
+    obstruido = np.zeros(num_raios, dtype=bool)
+    ativos = np.arange(num_raios)
+
+    # Maior tangente possível além de uma distância (terreno em z_max_m)
+    pico = math.sqrt(2.0 * raio_ef_m * max(z_obs_m - z_max_m, 0.0))
+
+    def teto(d):
+        d = max(d, pico)
+        return (z_max_m - queda_curvatura(d, raio_km, refracao) - z_obs_m) / d
+
+    total_passos = int(math.ceil(alcance_m / passo_m))
+    for inicio in range(1, total_passos + 1, passos_por_lote):
+        if len(ativos) == 0:
+            break
+        d = np.arange(inicio, min(inicio + passos_por_lote, total_passos + 1)) * passo_m
+        linhas = linha - np.outer(cosseno[ativos], d) / dy
+        colunas = coluna + np.outer(seno[ativos], d) / dx
+        z = amostrar(linhas, colunas) - queda_curvatura(d, raio_km, refracao)
+        tangente = (z - z_obs_m) / d
+        tangente[np.isnan(tangente)] = -np.inf
+
+        # Primeira obstrução: terreno acima do horizonte do mar
+        acima = tangente > tangente_mar + _TOLERANCIA_TANGENTE
+        tem = acima.any(axis=1) & ~obstruido[ativos]
+        novos = ativos[tem]
+        distancias[novos] = d[np.argmax(acima[tem], axis=1)]
+        obstruido[novos] = True
+        maximo[ativos] = np.maximum(maximo[ativos], tangente.max(axis=1))
+
+        # Sai o raio cujo terreno adiante não muda mais o resultado
+        limite = teto(d[-1])
+        if limite <= tangente_mar:
+            break
+        ativos = ativos[~obstruido[ativos] | (maximo[ativos] < limite)]
+
+    angulos = np.degrees(np.arctan(maximo))
+    return azimutes, distancias, angulos, obstruido
@@ -13,35 +13,53 @@
 """
 
 import os
-import math
+import tempfile
+import numpy as np
 from qgis.PyQt import uic
 from qgis.PyQt.QtWidgets import QApplication, QDialog, QMessageBox, QFileDialog
 from qgis.PyQt.QtCore import pyqtSignal
 from qgis.core import (
-    QgsProject, QgsVectorLayer, QgsFeature, QgsGeometry, 
+    QgsVectorLayer, QgsFeature, QgsGeometry, 
     QgsPointXY, QgsField, QgsFields, QgsCoordinateReferenceSystem,
     QgsMarkerSymbol, QgsLineSymbol, QgsFillSymbol,
-    QgsSingleSymbolRenderer, QgsVectorFileWriter, QgsWkbTypes
+    QgsSingleSymbolRenderer, QgsWkbTypes,
+    QgsApplication, QgsTask, QgsMapLayerProxyModel
 )
 from qgis.PyQt.QtCore import QVariant
 from qgis.PyQt.QtGui import QColor
 
 from .captureCoordinate import CaptureCoordinate
+from .camadas import GerenciadorCamadas
+from .previa import PreviaMapa, geometria_linhas
+from .tarefas import TarefaDesenho, TarefaExportacao
+from . import exportacao, terreno
+from .horizon_core import geodesia, horizonte, circulos, visibilidade
 
-FORM_CLASS, _ = uic.loadUiType(os.path.join(
-    os.path.dirname(__file__), 'horizon_dialog_base.ui'))
+try:
+    # Interface pré-compilada (pyuic5) por "make compile" / "pb_tool compile"
+    from .horizon_dialog_base import Ui_horizonDialogBase as FORM_CLASS
+except ImportError:
+    FORM_CLASS, _ = uic.loadUiType(os.path.join(
+        os.path.dirname(__file__), 'horizon_dialog_base.ui'))
 
 
 class horizonDialog(QDialog, FORM_CLASS):
     """Dialog principal do Horizon Projector"""
     
     # Constantes
-    RAIO_TERRA = 6371.0  # km
+    RAIO_TERRA = geodesia.RAIO_TERRA_KM  # km
     # Mantido por compatibilidade (botão virou "capturar no mapa").
     ABROLHOS_LAT = -17.5392
     ABROLHOS_LNG = -39.7277
     NM_TO_KM = 1.852
     NM_TO_M = 1852.0
+    # Índices do combo "Modelo da Terra"
+    MODELO_ESFERA = 0
+    MODELO_WGS84 = 1
+    # Tesselação dos círculos: erro máximo da corda e limites de vértices
+    TOLERANCIA_CORDA_KM = circulos.TOLERANCIA_CORDA_KM
+    VERTICES_MIN = circulos.VERTICES_MIN
+    VERTICES_MAX = circulos.VERTICES_MAX
     
     def __init__(self, iface, parent=None):
         """Constructor."""
@@ -50,15 +68,34 @@ class horizonDialog(QDialog, FORM_CLASS):
         self.iface = iface
         self.canvas = iface.mapCanvas()
         
-        # Lista para rastrear camadas criadas
-        self.created_layers = []
+        # Camadas criadas (rastreadas pelo id, no grupo do plugin)
+        self.camadas = GerenciadorCamadas(parent=self)
+        # Tarefas de desenho em andamento (QgsTask)
+        self._tarefas = []
+        # Amostrador (cache de blocos) do MDE selecionado
+        self._amostrador = None
+        self._amostrador_id = None
+
+        # Motores geodésicos (o do elipsoide guarda o preparo das séries por latitude)
+        self.esfera = geodesia.GeodesicaEsferica(self.RAIO_TERRA)
+        self.geodesica = geodesia.GeodesicaElipsoidal()
 
         # Ferramenta para capturar coordenadas no mapa (clique)
         self._previous_map_tool = None
         self._capture_tool = CaptureCoordinate(self.canvas)
         self._capture_tool.capturePoint.connect(self._on_capture_point)
+        self._capture_tool.pointMoved.connect(self._on_capture_move)
         self._capture_tool.captureStopped.connect(self._on_capture_stopped)
         
+        # Pré-visualização no mapa: formas dos anéis em cache e, enquanto a
+        # ferramenta de captura estiver ativa, o centro segue o mouse
+        self.previa = PreviaMapa(self.canvas, parent=self)
+        self.cache_aneis = circulos.CacheAneis()
+        self._ponto_previa = None
+        
+        # Só rasters servem de MDE
+        self.comboMDE.setFilters(QgsMapLayerProxyModel.RasterLayer)
+        
         # Conectar sinais dos botões
         self.connect_signals()
         
@@ -69,6 +106,8 @@ class horizonDialog(QDialog, FORM_CLASS):
         self.btnUsarAbrolhos.clicked.connect(self.usar_abrolhos)
         self.btnCalcularHorizonte.clicked.connect(self.calcular_horizonte)
         self.btnDesenharHorizonte.clicked.connect(self.desenhar_horizonte)
+        self.btnViewshed.clicked.connect(self.desenhar_viewshed)
+        self.btnHorizonteTerreno.clicked.connect(self.desenhar_horizonte_terreno)
         
         # Tab Objeto
         self.btnCalcularObjeto.clicked.connect(self.calcular_objeto)
@@ -86,9 +125,27 @@ class horizonDialog(QDialog, FORM_CLASS):
         self.btnExportarKML.clicked.connect(self.exportar_kml)
         self.btnExportarShapefile.clicked.connect(self.exportar_shapefile)
         self.btnExportarJSON.clicked.connect(self.exportar_geojson)
+        self.btnExportarGPKG.clicked.connect(self.exportar_geopackage)
+        self.btnExportarFGB.clicked.connect(self.exportar_flatgeobuf)
+        self.btnExportarParquet.clicked.connect(self.exportar_geoparquet)
+        self.btnExportarMBTiles.clicked.connect(self.exportar_mbtiles)
         self.btnLimparCamadas.clicked.connect(self.limpar_camadas)
+        
+        # Pré-visualização: qualquer parâmetro que muda a forma
+        for spin in (self.spinLatitude, self.spinLongitude, self.spinAlturaObservador,
+                     self.spinLatitudeObj, self.spinLongitudeObj,
+                     self.spinAlturaObservadorObj, self.spinAlturaObjeto,
+                     self.spinLatitudeProj, self.spinLongitudeProj, self.spinAzimute,
+                     self.spinDistancia, self.spinDeclinacao,
+                     self.spinLatitudeAneis, self.spinLongitudeAneis,
+                     self.spinNumAneis, self.spinIntervalo):
+            spin.valueChanged.connect(self.atualizar_previa)
+        self.comboModeloTerra.currentIndexChanged.connect(self.atualizar_previa)
+        self.tabWidget.currentChanged.connect(self.atualizar_previa)
+        self.checkPrevia.toggled.connect(self.atualizar_previa)
     
     # ============ FUNÇÕES DE CÁLCULO ============
+    # Os cálculos ficam em horizon_core (sem Qt); aqui só se escolhe o modelo.
     
     def calcular_distancia_horizonte(self, altura_m):
         """
@@ -96,23 +153,45 @@ class horizonDialog(QDialog, FORM_CLASS):
         Fórmula: d = sqrt(2 * R * h + h²)
         onde R é o raio da Terra em km e h é a altura em km
         """
-        h_km = altura_m / 1000.0
-        distancia_km = math.sqrt(2 * self.RAIO_TERRA * h_km + h_km * h_km)
-        return distancia_km
+        return horizonte.distancia_horizonte(altura_m, self.RAIO_TERRA)
     
     def calcular_distancia_objeto(self, altura_obs_m, altura_obj_m):
         """
         Calcula a distância máxima para ver um objeto.
         É a soma das distâncias ao horizonte do observador e do objeto.
         """
-        dist_obs = self.calcular_distancia_horizonte(altura_obs_m)
-        dist_obj = self.calcular_distancia_horizonte(altura_obj_m)
-        return dist_obs + dist_obj
+        return horizonte.distancia_objeto(altura_obs_m, altura_obj_m, self.RAIO_TERRA)
+    
+    def calcular_distancia_horizonte_vetorizado(self, alturas_m):
+        """
+        Versão vetorizada de calcular_distancia_horizonte.
+        Aceita arrays NumPy, listas ou buffers de alturas (m) e devolve um
+        array de distâncias (km) idêntico ao cálculo escalar, elemento a elemento.
+        """
+        return horizonte.distancias_horizonte(alturas_m, self.RAIO_TERRA)
+    
+    def calcular_distancia_objeto_vetorizado(self, alturas_obs_m, alturas_obj_m):
+        """
+        Versão vetorizada de calcular_distancia_objeto.
+        As alturas do observador e do objeto seguem as regras de broadcasting
+        do NumPy (ex.: um observador contra uma lista de faróis).
+        """
+        return horizonte.distancias_objeto(alturas_obs_m, alturas_obj_m, self.RAIO_TERRA)
+    
+    def usar_elipsoide(self):
+        """Indica se o modelo da Terra selecionado é o elipsoide WGS84."""
+        return self.comboModeloTerra.currentIndex() == self.MODELO_WGS84
+    
+    def modelo_geodesico(self):
+        """Motor geodésico (esfera ou elipsoide) do modelo da Terra selecionado."""
+        return self.geodesica if self.usar_elipsoide() else self.esfera
     
     def calcular_ponto_destino(self, lat, lon, azimute_verdadeiro, distancia_km):
         """
-        Calcula um ponto destino dado um ponto inicial, azimute e distância.
-        Usa a fórmula haversine para cálculo preciso.
+        Calcula um ponto destino dado um ponto inicial, azimute e distância,
+        na esfera ou no elipsoide WGS84, conforme o modelo da Terra
+        selecionado. Delega para calcular_pontos_destino, que resolve lotes
+        de pontos.
         
         Args:
             lat: Latitude inicial em graus
@@ -123,31 +202,64 @@ class horizonDialog(QDialog, FORM_CLASS):
         Returns:
             Tupla (lat_destino, lon_destino)
         """
-        # Converter para radianos
-        lat1 = math.radians(lat)
-        lon1 = math.radians(lon)
-        brng = math.radians(azimute_verdadeiro)
-        
-        # Distância angular (distância / raio da Terra)
-        dist_angular = distancia_km / self.RAIO_TERRA
-        
-        # Calcular nova latitude
-        lat2 = math.asin(
-            math.sin(lat1) * math.cos(dist_angular) +
-            math.cos(lat1) * math.sin(dist_angular) * math.cos(brng)
+        lat_dest, lon_dest = self.calcular_pontos_destino(
+            lat, lon, azimute_verdadeiro, distancia_km
         )
+        return float(lat_dest), float(lon_dest)
+    
+    def calcular_pontos_destino(self, lats, lons, azimutes_verdadeiros, distancias_km):
+        """
+        Versão em lote de calcular_ponto_destino.
+        Usa a esfera (RAIO_TERRA) ou o elipsoide WGS84, conforme o modelo
+        da Terra selecionado no diálogo.
+        Todos os argumentos aceitam escalares ou arrays e seguem as regras de
+        broadcasting do NumPy: uma origem com vários azimutes (leque de raios),
+        vários azimutes x várias distâncias (anéis), ou listas pareadas.
         
-        # Calcular nova longitude
-        lon2 = lon1 + math.atan2(
-            math.sin(brng) * math.sin(dist_angular) * math.cos(lat1),
-            math.cos(dist_angular) - math.sin(lat1) * math.sin(lat2)
-        )
+        Args:
+            lats: Latitudes iniciais em graus
+            lons: Longitudes iniciais em graus
+            azimutes_verdadeiros: Azimutes em graus (0-360)
+            distancias_km: Distâncias em quilômetros
         
-        # Converter de volta para graus
-        lat_dest = math.degrees(lat2)
-        lon_dest = math.degrees(lon2)
+        Returns:
+            Tupla (lats_destino, lons_destino) de arrays NumPy
+        """
+        lats_dest, lons_dest, _ = self.modelo_geodesico().destino(
+            lats, lons, azimutes_verdadeiros, distancias_km)
+        return lats_dest, lons_dest
+    
+    def calcular_num_vertices(self, raio_km, tolerancia_km=None):
+        """
+        Número de vértices para que a corda entre dois vértices vizinhos se
+        afaste no máximo tolerancia_km do círculo verdadeiro.
+        """
+        if tolerancia_km is None:
+            tolerancia_km = self.TOLERANCIA_CORDA_KM
+        return circulos.num_vertices_circulo(raio_km, tolerancia_km, self.RAIO_TERRA)
+    
+    def calcular_aneis_geodesicos(self, lat, lon, raios_km, tolerancia_km=None):
+        """
+        Calcula, numa única passada vetorizada, os vértices de todos os anéis
+        concêntricos de uma origem no modelo da Terra selecionado.
         
-        return lat_dest, lon_dest
+        Returns:
+            Tupla (lats, lons) de arrays (num_aneis, num_vertices + 1), com o
+            primeiro vértice repetido no fim para fechar cada anel
+        """
+        if tolerancia_km is None:
+            tolerancia_km = self.TOLERANCIA_CORDA_KM
+        return circulos.aneis_geodesicos(
+            self.modelo_geodesico(), lat, lon, raios_km, tolerancia_km)
+    
+    def criar_circulo_geodesico(self, lat, lon, raio_km, tolerancia_km=None):
+        """
+        Cria o anel (lista de QgsPointXY fechada) de um círculo geodésico.
+        Cada vértice fica exatamente a raio_km do centro no modelo da Terra
+        selecionado; o número de vértices vem de calcular_num_vertices.
+        """
+        lats, lons = self.calcular_aneis_geodesicos(lat, lon, [raio_km], tolerancia_km)
+        return [QgsPointXY(x, y) for x, y in zip(lons[0].tolist(), lats[0].tolist())]
     
     # ============ SLOTS - TAB HORIZONTE ============
     
@@ -180,10 +292,17 @@ class horizonDialog(QDialog, FORM_CLASS):
             "As coordenadas serão copiadas para a área de transferência e preenchidas nos campos.",
         )
 
+    def _on_capture_move(self, pt4326):
+        """Leva a pré-visualização para a posição do mouse (EPSG:4326)."""
+        self._ponto_previa = (float(pt4326.y()), float(pt4326.x()))
+        self.atualizar_previa()
+
     def _on_capture_point(self, pt4326):
         """Recebe ponto capturado (EPSG:4326) e atualiza campos."""
         lat = float(pt4326.y())
         lon = float(pt4326.x())
+        # A pré-visualização volta a seguir os campos (já com o ponto capturado)
+        self._ponto_previa = None
 
         # Atualizar todos os spin boxes de latitude/longitude
         self.spinLatitude.setValue(lat)
@@ -198,6 +317,14 @@ class horizonDialog(QDialog, FORM_CLASS):
         # Copiar para clipboard
         QApplication.clipboard().setText(f"{lat:.6f}, {lon:.6f}")
 
+        # Altitude do terreno no ponto, se houver MDE selecionado
+        texto_terreno = ""
+        camada_mde = self.comboMDE.currentLayer()
+        if camada_mde is not None:
+            z_chao = self.amostrador_terreno(camada_mde).altitude(lat, lon)
+            texto_terreno = ("\nTerreno: fora do MDE" if z_chao is None
+                             else f"\nTerreno: {z_chao:.1f} m")
+
         # Restaurar ferramenta anterior
         if self._previous_map_tool is not None:
             self.canvas.setMapTool(self._previous_map_tool)
@@ -207,11 +334,13 @@ class horizonDialog(QDialog, FORM_CLASS):
         QMessageBox.information(
             self,
             "Coordenadas capturadas",
-            f"Lat: {lat:.6f}\nLng: {lon:.6f}\n\n(Copiado para a área de transferência)",
+            f"Lat: {lat:.6f}\nLng: {lon:.6f}{texto_terreno}\n\n(Copiado para a área de transferência)",
         )
 
     def _on_capture_stopped(self):
         """Quando a ferramenta é desativada sem capturar."""
+        self._ponto_previa = None
+        self.atualizar_previa()
         # Se o usuário trocar de ferramenta, tenta restaurar.
         if self._previous_map_tool is not None and self.canvas.mapTool() == self._capture_tool:
             self.canvas.setMapTool(self._previous_map_tool)
@@ -234,7 +363,16 @@ class horizonDialog(QDialog, FORM_CLASS):
         lat = self.spinLatitude.value()
         lon = self.spinLongitude.value()
         altura = self.spinAlturaObservador.value()
+        # Widgets só são lidos aqui, na thread principal
+        modelo = self.modelo_geodesico()
         
+        self.executar_desenho(
+            "Horizon Projector: círculo do horizonte",
+            lambda tarefa: self._construir_horizonte(tarefa, modelo, lat, lon, altura),
+            "Círculo do horizonte desenhado no mapa!")
+    
+    def _construir_horizonte(self, tarefa, modelo, lat, lon, altura):
+        """Monta as camadas do horizonte (roda na QgsTask)"""
         distancia_km = self.calcular_distancia_horizonte(altura)
         
         # Criar camada de memória
@@ -251,20 +389,11 @@ class horizonDialog(QDialog, FORM_CLASS):
         ])
         layer.updateFields()
         
-        # Criar círculo (buffer ao redor do ponto)
+        # Criar círculo geodésico ao redor do ponto
         centro = QgsPointXY(lon, lat)
-        # Aproximação: 1 grau ≈ 111 km
-        raio_graus = distancia_km / 111.0
-        
-        # Criar polígono circular
-        pontos = []
-        num_pontos = 64
-        for i in range(num_pontos + 1):
-            angulo = (360.0 / num_pontos) * i
-            rad = math.radians(angulo)
-            x = lon + raio_graus * math.cos(rad)
-            y = lat + raio_graus * math.sin(rad)
-            pontos.append(QgsPointXY(x, y))
+        lats, lons = circulos.aneis_geodesicos(
+            modelo, lat, lon, [distancia_km], self.TOLERANCIA_CORDA_KM)
+        pontos = [QgsPointXY(x, y) for x, y in zip(lons[0].tolist(), lats[0].tolist())]
         
         feature = QgsFeature()
         feature.setGeometry(QgsGeometry.fromPolygonXY([pontos]))
@@ -311,19 +440,178 @@ class horizonDialog(QDialog, FORM_CLASS):
         })
         point_layer.renderer().setSymbol(point_symbol)
         
-        # Adicionar ao projeto
-        QgsProject.instance().addMapLayer(layer)
-        QgsProject.instance().addMapLayer(point_layer)
+        return [layer, point_layer]
+    
+    def amostrador_terreno(self, camada_mde):
+        """
+        Amostrador com cache de blocos do MDE. É mantido enquanto o mesmo MDE
+        estiver selecionado, então cliques e desenhos repetidos na mesma
+        região não voltam a ler o disco.
+        """
+        chave = (camada_mde.id(), camada_mde.source())
+        if self._amostrador is None or self._amostrador_id != chave:
+            self._amostrador = terreno.AmostradorTerreno(camada_mde.dataProvider())
+            self._amostrador_id = chave
+        return self._amostrador
+    
+    def desenhar_viewshed(self):
+        """Calcula o viewshed do observador sobre o MDE selecionado"""
+        camada_mde = self.comboMDE.currentLayer()
+        if camada_mde is None:
+            QMessageBox.warning(self, "Aviso", 
+                "Selecione um modelo de elevação (MDE)!")
+            return
         
-        self.created_layers.append(layer)
-        self.created_layers.append(point_layer)
+        lat = self.spinLatitude.value()
+        lon = self.spinLongitude.value()
+        altura = self.spinAlturaObservador.value()
+        refracao = self.spinRefracao.value()
         
-        # Zoom para a camada
-        self.canvas.setExtent(layer.extent())
-        self.canvas.refresh()
+        # A tarefa usa um clone: o provedor da camada pertence à thread principal
+        provedor = camada_mde.dataProvider().clone()
+        celula = terreno.celula_do_ponto(provedor, lat, lon)
+        if celula is None:
+            QMessageBox.warning(self, "Aviso", 
+                "O observador está fora do MDE selecionado!")
+            return
         
-        QMessageBox.information(self, "Sucesso", 
-            "Círculo do horizonte desenhado no mapa!")
+        self.executar_desenho(
+            "Horizon Projector: viewshed do terreno",
+            lambda tarefa: self._construir_viewshed(
+                tarefa, provedor, celula, lat, altura, refracao),
+            "Viewshed do terreno calculado!")
+    
+    def _construir_viewshed(self, tarefa, provedor, celula, lat, altura, refracao):
+        """Lê o MDE, varre o viewshed e grava o raster (roda na QgsTask)"""
+        mde = terreno.ler_mde(provedor)
+        tarefa.setProgress(20)
+        if tarefa.isCanceled():
+            return []
+        
+        visivel = visibilidade.viewshed(
+            mde, celula[0], celula[1], altura,
+            terreno.tamanho_celula_m(provedor, lat),
+            raio_km=self.RAIO_TERRA, refracao=refracao)
+        tarefa.setProgress(80)
+        if tarefa.isCanceled():
+            return []
+        
+        descritor, caminho = tempfile.mkstemp(prefix="viewshed_", suffix=".tif")
+        os.close(descritor)
+        terreno.gravar_raster_byte(caminho, visivel, provedor.extent(), provedor.crs())
+        
+        return [terreno.camada_visibilidade(caminho, f"Viewshed ({altura:.1f} m)")]
+    
+    def desenhar_horizonte_terreno(self):
+        """Desenha o horizonte visível considerando ilhas e cabos do MDE"""
+        camada_mde = self.comboMDE.currentLayer()
+        if camada_mde is None:
+            QMessageBox.warning(self, "Aviso", 
+                "Selecione um modelo de elevação (MDE)!")
+            return
+        
+        lat = self.spinLatitude.value()
+        lon = self.spinLongitude.value()
+        altura = self.spinAlturaObservador.value()
+        refracao = self.spinRefracao.value()
+        num_raios = self.spinNumRaios.value()
+        modelo = self.modelo_geodesico()
+        
+        amostrador = self.amostrador_terreno(camada_mde)
+        if terreno.celula_do_ponto(amostrador.provedor, lat, lon) is None:
+            QMessageBox.warning(self, "Aviso", 
+                "O observador está fora do MDE selecionado!")
+            return
+        posicao = terreno.posicao_no_raster(amostrador.provedor, lat, lon)
+        z_max = terreno.altitude_maxima(camada_mde.dataProvider())
+        
+        self.executar_desenho(
+            "Horizon Projector: horizonte do terreno",
+            lambda tarefa: self._construir_horizonte_terreno(
+                tarefa, amostrador, posicao, z_max, modelo, lat, lon,
+                altura, refracao, num_raios),
+            "Horizonte do terreno desenhado no mapa!")
+    
+    def _construir_horizonte_terreno(self, tarefa, amostrador, posicao, z_max, modelo,
+                                     lat, lon, altura, refracao, num_raios):
+        """Marcha os raios sobre o MDE e monta as camadas (roda na QgsTask)"""
+        linha, coluna = posicao
+        
+        # Altitude dos olhos: terreno sob o observador + altura. O observador
+        # está dentro do MDE; uma célula sem dados ali é mar (altitude 0)
+        z_chao = float(amostrador.mde.amostrar(linha, coluna))
+        z_obs = (0.0 if np.isnan(z_chao) else max(z_chao, 0.0)) + altura
+        
+        # Os raios só leem os blocos do MDE que atravessam (cache LRU)
+        azimutes, distancias_m, angulos, obstruido = visibilidade.horizonte_terreno(
+            amostrador.mde.amostrar, linha, coluna, z_obs,
+            terreno.tamanho_celula_m(amostrador.provedor, lat), z_max, num_raios,
+            raio_km=self.RAIO_TERRA, refracao=refracao)
+        tarefa.setProgress(80)
+        if tarefa.isCanceled():
+            return []
+        
+        lats, lons, _ = modelo.destino(lat, lon, azimutes, distancias_m / 1000.0)
+        
+        # Polígono do horizonte visível
+        layer = QgsVectorLayer("Polygon?crs=EPSG:4326", 
+                               f"Horizonte do Terreno ({altura:.1f} m)", "memory")
+        provider = layer.dataProvider()
+        provider.addAttributes([
+            QgsField("tipo", QVariant.String),
+            QgsField("altura_obs_m", QVariant.Double),
+            QgsField("altitude_olho_m", QVariant.Double),
+            QgsField("num_raios", QVariant.Int)
+        ])
+        layer.updateFields()
+        
+        pontos = [QgsPointXY(x, y) for x, y in zip(lons.tolist(), lats.tolist())]
+        pontos.append(pontos[0])
+        feature = QgsFeature()
+        feature.setGeometry(QgsGeometry.fromPolygonXY([pontos]))
+        feature.setAttributes(["horizonte_terreno", altura, float(z_obs), num_raios])
+        provider.addFeature(feature)
+        layer.updateExtents()
+        
+        symbol = QgsFillSymbol.createSimple({
+            'color': '0,255,245,30',
+            'outline_color': '0,255,245',
+            'outline_width': '0.5'
+        })
+        layer.renderer().setSymbol(symbol)
+        
+        # Perfil: ângulo de elevação do horizonte aparente em cada azimute
+        perfil_layer = QgsVectorLayer("Point?crs=EPSG:4326", 
+                                      "Perfil do Horizonte", "memory")
+        perfil_provider = perfil_layer.dataProvider()
+        perfil_provider.addAttributes([
+            QgsField("azimute", QVariant.Double),
+            QgsField("elevacao_graus", QVariant.Double),
+            QgsField("distancia_km", QVariant.Double),
+            QgsField("obstruido", QVariant.Int)
+        ])
+        perfil_layer.updateFields()
+        
+        features = []
+        for az, ang, dist, obs, x, y in zip(azimutes.tolist(), angulos.tolist(),
+                                            distancias_m.tolist(), obstruido.tolist(),
+                                            lons.tolist(), lats.tolist()):
+            f = QgsFeature()
+            f.setGeometry(QgsGeometry.fromPointXY(QgsPointXY(x, y)))
+            f.setAttributes([az, ang, dist / 1000.0, int(obs)])
+            features.append(f)
+        perfil_provider.addFeatures(features)
+        perfil_layer.updateExtents()
+        
+        perfil_symbol = QgsMarkerSymbol.createSimple({
+            'name': 'circle',
+            'color': '255,107,53',
+            'size': '1.2',
+            'outline_style': 'no'
+        })
+        perfil_layer.renderer().setSymbol(perfil_symbol)
+        
+        return [layer, perfil_layer]
     
     # ============ SLOTS - TAB OBJETO ============
     
@@ -347,7 +635,16 @@ class horizonDialog(QDialog, FORM_CLASS):
         lon = self.spinLongitudeObj.value()
         altura_obs = self.spinAlturaObservadorObj.value()
         altura_obj = self.spinAlturaObjeto.value()
+        modelo = self.modelo_geodesico()
         
+        self.executar_desenho(
+            "Horizon Projector: objeto visível",
+            lambda tarefa: self._construir_objeto(
+                tarefa, modelo, lat, lon, altura_obs, altura_obj),
+            "Círculo do objeto visível desenhado no mapa!")
+    
+    def _construir_objeto(self, tarefa, modelo, lat, lon, altura_obs, altura_obj):
+        """Monta a camada do objeto visível (roda na QgsTask)"""
         distancia_km = self.calcular_distancia_objeto(altura_obs, altura_obj)
         
         # Criar camada
@@ -364,17 +661,9 @@ class horizonDialog(QDialog, FORM_CLASS):
         layer.updateFields()
         
         # Criar círculo
-        centro = QgsPointXY(lon, lat)
-        raio_graus = distancia_km / 111.0
-        
-        pontos = []
-        num_pontos = 64
-        for i in range(num_pontos + 1):
-            angulo = (360.0 / num_pontos) * i
-            rad = math.radians(angulo)
-            x = lon + raio_graus * math.cos(rad)
-            y = lat + raio_graus * math.sin(rad)
-            pontos.append(QgsPointXY(x, y))
+        lats, lons = circulos.aneis_geodesicos(
+            modelo, lat, lon, [distancia_km], self.TOLERANCIA_CORDA_KM)
+        pontos = [QgsPointXY(x, y) for x, y in zip(lons[0].tolist(), lats[0].tolist())]
         
         feature = QgsFeature()
         feature.setGeometry(QgsGeometry.fromPolygonXY([pontos]))
@@ -397,15 +686,7 @@ class horizonDialog(QDialog, FORM_CLASS):
         })
         layer.renderer().setSymbol(symbol)
         
-        # Adicionar ao projeto
-        QgsProject.instance().addMapLayer(layer)
-        self.created_layers.append(layer)
-        
-        self.canvas.setExtent(layer.extent())
-        self.canvas.refresh()
-        
-        QMessageBox.information(self, "Sucesso", 
-            "Círculo do objeto visível desenhado no mapa!")
+        return [layer]
     
     # ============ SLOTS - TAB PROJEÇÃO ============
     
@@ -454,10 +735,20 @@ class horizonDialog(QDialog, FORM_CLASS):
             azimute_verdadeiro += 360
         while azimute_verdadeiro >= 360:
             azimute_verdadeiro -= 360
+        modelo = self.modelo_geodesico()
         
-        lat_alvo, lon_alvo = self.calcular_ponto_destino(
-            lat, lon, azimute_verdadeiro, distancia
-        )
+        self.executar_desenho(
+            "Horizon Projector: projeção",
+            lambda tarefa: self._construir_projecao(
+                tarefa, modelo, lat, lon, azimute_mag, azimute_verdadeiro, distancia),
+            "Projeção desenhada no mapa!")
+    
+    def _construir_projecao(self, tarefa, modelo, lat, lon, azimute_mag,
+                            azimute_verdadeiro, distancia):
+        """Monta as camadas da projeção (roda na QgsTask)"""
+        # A linha segue a geodésica (a mesma da pré-visualização)
+        lats, lons = circulos.linhas_geodesicas(modelo, lat, lon, azimute_verdadeiro, distancia)
+        lat_alvo, lon_alvo = float(lats[0, -1]), float(lons[0, -1])
         
         # Criar camada de linha
         line_layer = QgsVectorLayer("LineString?crs=EPSG:4326", 
@@ -472,7 +763,7 @@ class horizonDialog(QDialog, FORM_CLASS):
         line_layer.updateFields()
         
         # Criar linha
-        pontos = [QgsPointXY(lon, lat), QgsPointXY(lon_alvo, lat_alvo)]
+        pontos = [QgsPointXY(x, y) for x, y in zip(lons[0].tolist(), lats[0].tolist())]
         line_feature = QgsFeature()
         line_feature.setGeometry(QgsGeometry.fromPolylineXY(pontos))
         line_feature.setAttributes([azimute_mag, azimute_verdadeiro, distancia])
@@ -523,20 +814,7 @@ class horizonDialog(QDialog, FORM_CLASS):
         })
         point_layer.renderer().setSymbol(point_symbol)
         
-        # Adicionar ao projeto
-        QgsProject.instance().addMapLayer(line_layer)
-        QgsProject.instance().addMapLayer(point_layer)
-        
-        self.created_layers.extend([line_layer, point_layer])
-        
-        # Zoom para as camadas
-        combined_extent = line_layer.extent()
-        combined_extent.combineExtentWith(point_layer.extent())
-        self.canvas.setExtent(combined_extent)
-        self.canvas.refresh()
-        
-        QMessageBox.information(self, "Sucesso", 
-            "Projeção desenhada no mapa!")
+        return [line_layer, point_layer]
     
     # ============ SLOTS - TAB ANÉIS ============
     
@@ -548,7 +826,18 @@ class horizonDialog(QDialog, FORM_CLASS):
         intervalo_nm = self.spinIntervalo.value()
         mostrar_labels = self.checkMostrarLabels.isChecked()
         usar_gradiente = self.checkGradiente.isChecked()
+        modelo = self.modelo_geodesico()
         
+        self.executar_desenho(
+            "Horizon Projector: anéis de distância",
+            lambda tarefa: self._construir_aneis(
+                tarefa, modelo, lat, lon, num_aneis, intervalo_nm,
+                mostrar_labels, usar_gradiente),
+            f"{num_aneis} anéis desenhados no mapa!")
+    
+    def _construir_aneis(self, tarefa, modelo, lat, lon, num_aneis, intervalo_nm,
+                         mostrar_labels, usar_gradiente):
+        """Monta as camadas dos anéis (roda na QgsTask)"""
         # Criar camada de polígonos
         layer = QgsVectorLayer("Polygon?crs=EPSG:4326", 
                               f"Anéis de Distância ({intervalo_nm} NM)", "memory")
@@ -563,20 +852,22 @@ class horizonDialog(QDialog, FORM_CLASS):
         
         features = []
         
+        # Todos os anéis numa única passada (anel x vértice)
+        distancias_nm = np.arange(1, num_aneis + 1) * intervalo_nm
+        distancias_km = distancias_nm * self.NM_TO_KM
+        lats, lons = circulos.aneis_geodesicos(
+            modelo, lat, lon, distancias_km, self.TOLERANCIA_CORDA_KM)
+        
         for i in range(1, num_aneis + 1):
-            dist_nm = i * intervalo_nm
-            dist_km = dist_nm * self.NM_TO_KM
-            raio_graus = dist_km / 111.0
+            if tarefa.isCanceled():
+                return []
+            tarefa.setProgress(90.0 * i / num_aneis)
+            dist_nm = float(distancias_nm[i - 1])
+            dist_km = float(distancias_km[i - 1])
             
             # Criar círculo
-            pontos = []
-            num_pontos = 64
-            for j in range(num_pontos + 1):
-                angulo = (360.0 / num_pontos) * j
-                rad = math.radians(angulo)
-                x = lon + raio_graus * math.cos(rad)
-                y = lat + raio_graus * math.sin(rad)
-                pontos.append(QgsPointXY(x, y))
+            pontos = [QgsPointXY(x, y) for x, y in
+                      zip(lons[i - 1].tolist(), lats[i - 1].tolist())]
             
             feature = QgsFeature()
             feature.setGeometry(QgsGeometry.fromPolygonXY([pontos]))
@@ -670,24 +961,132 @@ class horizonDialog(QDialog, FORM_CLASS):
         })
         point_layer.renderer().setSymbol(point_symbol)
         
-        # Adicionar ao projeto
-        QgsProject.instance().addMapLayer(layer)
-        QgsProject.instance().addMapLayer(point_layer)
-        
-        self.created_layers.extend([layer, point_layer])
-        
-        # Zoom
-        self.canvas.setExtent(layer.extent())
-        self.canvas.refresh()
-        
-        QMessageBox.information(self, "Sucesso", 
-            f"{num_aneis} anéis desenhados no mapa!")
+        return [layer, point_layer]
+    
+    # ============ PRÉ-VISUALIZAÇÃO ============
+    
+    def atualizar_previa(self, *args):
+        """Agenda a pré-visualização da aba atual (limitada a ~30 quadros/s)."""
+        if self.checkPrevia.isChecked() and self.isVisible():
+            self.previa.atualizar(self.geometria_previa)
+        else:
+            self.previa.limpar()
+    
+    def geometria_previa(self):
+        """
+        Geometria (WGS84) do que "Desenhar" criaria na aba atual, centrada no
+        mouse durante a captura ou nos campos de coordenadas. Devolve
+        (geometria, centro) ou None se a aba não tem pré-visualização.
+        """
+        aba = self.tabWidget.currentWidget()
+        if aba is self.tabHorizonte:
+            lat, lon = self.spinLatitude.value(), self.spinLongitude.value()
+            raios_km = [self.calcular_distancia_horizonte(self.spinAlturaObservador.value())]
+        elif aba is self.tabObjeto:
+            lat, lon = self.spinLatitudeObj.value(), self.spinLongitudeObj.value()
+            raios_km = [self.calcular_distancia_objeto(
+                self.spinAlturaObservadorObj.value(), self.spinAlturaObjeto.value())]
+        elif aba is self.tabAneis:
+            lat, lon = self.spinLatitudeAneis.value(), self.spinLongitudeAneis.value()
+            raios_km = (np.arange(1, self.spinNumAneis.value() + 1)
+                        * self.spinIntervalo.value() * self.NM_TO_KM)
+        elif aba is self.tabProjecao:
+            lat, lon = self.spinLatitudeProj.value(), self.spinLongitudeProj.value()
+            raios_km = None
+        else:
+            return None
+        if self._ponto_previa is not None:
+            lat, lon = self._ponto_previa
+        
+        if raios_km is None:
+            # Projeção: a mesma geodésica que _construir_projecao materializa
+            azimute = (self.spinAzimute.value() + self.spinDeclinacao.value()) % 360.0
+            lats, lons = circulos.linhas_geodesicas(
+                self.modelo_geodesico(), lat, lon, azimute, self.spinDistancia.value())
+        else:
+            lats, lons = self.cache_aneis.aneis(
+                self.modelo_geodesico(), lat, lon, raios_km, self.TOLERANCIA_CORDA_KM)
+        return geometria_linhas(lats, lons), QgsPointXY(lon, lat)
+    
+    def showEvent(self, event):
+        super(horizonDialog, self).showEvent(event)
+        self.atualizar_previa()
+    
+    def hideEvent(self, event):
+        self.previa.limpar()
+        super(horizonDialog, self).hideEvent(event)
+    
+    # ============ DESENHO EM SEGUNDO PLANO ============
+    
+    def executar_desenho(self, descricao, construir, mensagem):
+        """
+        Roda `construir(tarefa)` numa QgsTask cancelável. Geometria, feições e
+        estilo são montados em segundo plano; na thread principal só se
+        adicionam as camadas ao projeto, se ajusta o zoom e se avisa o usuário.
+        Com "Acumular resultados" marcado, as feições são anexadas às camadas
+        persistentes do plugin em vez de virarem camadas novas.
+        """
+        def concluir(camadas):
+            # Zoom para o resultado (as camadas de memória ainda têm só ele)
+            extent = camadas[0].extent()
+            for camada in camadas[1:]:
+                extent.combineExtentWith(camada.extent())
+            
+            if self.checkAcumular.isChecked():
+                self.camadas.anexar(camadas)
+            else:
+                self.camadas.adicionar(camadas)
+            
+            self.canvas.setExtent(extent)
+            self.canvas.refresh()
+            
+            QMessageBox.information(self, "Sucesso", mensagem)
+        
+        def falhar(erro):
+            QMessageBox.critical(self, "Erro", f"Falha ao desenhar:\n{erro}")
+        
+        # Manter referência às tarefas até terminarem (senão o Python as coleta)
+        self._tarefas = [t for t in self._tarefas
+                         if t.status() not in (QgsTask.Complete, QgsTask.Terminated)]
+        tarefa = TarefaDesenho(descricao, construir, concluir, falhar)
+        self._tarefas.append(tarefa)
+        QgsApplication.taskManager().addTask(tarefa)
+        return tarefa
     
     # ============ SLOTS - TAB EXPORTAR ============
     
+    def camadas_vetoriais(self):
+        """Camadas vetoriais criadas pelo plugin (os rasters não são exportados)"""
+        return [l for l in self.camadas.camadas() if isinstance(l, QgsVectorLayer)]
+    
+    def executar_exportacao(self, descricao, exportar, caminhos):
+        """
+        Roda `exportar(tarefa, fontes)` numa QgsTask cancelável, com progresso
+        por feição. As fontes (exportacao.FonteCamada) são criadas aqui, na
+        thread principal; a leitura das feições e a gravação correm em
+        segundo plano. Se a tarefa for cancelada, os arquivos parciais são
+        apagados. O resultado é avisado na barra de mensagens, sem bloquear.
+        """
+        fontes = [exportacao.FonteCamada(l) for l in self.camadas_vetoriais()]
+        barra = self.iface.messageBar()
+        
+        def concluir(mensagem):
+            barra.pushSuccess("Horizon Projector", mensagem)
+        
+        def falhar(erro):
+            barra.pushCritical("Horizon Projector", f"Falha ao exportar: {erro}")
+        
+        self._tarefas = [t for t in self._tarefas
+                         if t.status() not in (QgsTask.Complete, QgsTask.Terminated)]
+        tarefa = TarefaExportacao(
+            descricao, lambda t: exportar(t, fontes), caminhos, concluir, falhar)
+        self._tarefas.append(tarefa)
+        QgsApplication.taskManager().addTask(tarefa)
+        return tarefa
+    
     def exportar_gpx(self):
-        """Exporta as camadas criadas como GPX"""
-        if not self.created_layers:
+        """Exporta todas as camadas criadas num único GPX"""
+        if not self.camadas_vetoriais():
             QMessageBox.warning(self, "Aviso", 
                 "Nenhuma camada foi criada ainda!")
             return
@@ -696,45 +1095,38 @@ class horizonDialog(QDialog, FORM_CLASS):
             self, "Salvar GPX", "", "GPS Exchange Format (*.gpx)")
         
         if filename:
-            # GPX suporta apenas pontos, então vamos exportar apenas camadas de pontos
-            point_layers = [l for l in self.created_layers 
-                          if l.geometryType() == QgsWkbTypes.PointGeometry]
-            
-            if not point_layers:
-                QMessageBox.warning(self, "Aviso", 
-                    "Nenhuma camada de pontos para exportar!")
-                return
+            # Pontos -> waypoints, projeções -> rotas, círculos e anéis -> tracks
+            def exportar(tarefa, fontes):
+                if exportacao.gravar_gpx(filename, fontes, tarefa.progresso,
+                                         tarefa.isCanceled) is None:
+                    return None
+                return f"Arquivo GPX salvo em: {filename}"
             
-            for layer in point_layers:
-                QgsVectorFileWriter.writeAsVectorFormat(
-                    layer, filename, "UTF-8", layer.crs(), "GPX",
-                    layerOptions=['GPX_USE_EXTENSIONS=YES'])
-            
-            QMessageBox.information(self, "Sucesso", 
-                f"Arquivo GPX salvo em:\n{filename}")
+            self.executar_exportacao("Exportando GPX", exportar, [filename])
     
     def exportar_kml(self):
-        """Exporta as camadas criadas como KML"""
-        if not self.created_layers:
+        """Exporta todas as camadas criadas num único KML ou KMZ (uma pasta por camada)"""
+        if not self.camadas_vetoriais():
             QMessageBox.warning(self, "Aviso", 
                 "Nenhuma camada foi criada ainda!")
             return
         
         filename, _ = QFileDialog.getSaveFileName(
-            self, "Salvar KML", "", "Keyhole Markup Language (*.kml)")
+            self, "Salvar KML", "",
+            "Keyhole Markup Language (*.kml);;KML comprimido (*.kmz)")
         
         if filename:
-            for i, layer in enumerate(self.created_layers):
-                output = filename if i == 0 else filename.replace('.kml', f'_{i}.kml')
-                QgsVectorFileWriter.writeAsVectorFormat(
-                    layer, output, "UTF-8", layer.crs(), "KML")
+            def exportar(tarefa, fontes):
+                if exportacao.gravar_kml(filename, fontes, tarefa.progresso,
+                                         tarefa.isCanceled) is None:
+                    return None
+                return f"Arquivo KML salvo em: {filename}"
             
-            QMessageBox.information(self, "Sucesso", 
-                f"Arquivo(s) KML salvo(s)!")
+            self.executar_exportacao("Exportando KML", exportar, [filename])
     
     def exportar_shapefile(self):
         """Exporta as camadas criadas como Shapefile"""
-        if not self.created_layers:
+        if not self.camadas_vetoriais():
             QMessageBox.warning(self, "Aviso", 
                 "Nenhuma camada foi criada ainda!")
             return
@@ -743,17 +1135,20 @@ class horizonDialog(QDialog, FORM_CLASS):
             self, "Selecionar Diretório para Shapefiles")
         
         if directory:
-            for layer in self.created_layers:
-                filename = os.path.join(directory, f"{layer.name()}.shp")
-                QgsVectorFileWriter.writeAsVectorFormat(
-                    layer, filename, "UTF-8", layer.crs(), "ESRI Shapefile")
+            nomes = exportacao.nomes_unicos([l.name() for l in self.camadas_vetoriais()])
+            caminhos = [os.path.join(directory, f"{nome}.shp") for nome in nomes]
             
-            QMessageBox.information(self, "Sucesso", 
-                f"Shapefiles salvos em:\n{directory}")
+            def exportar(tarefa, fontes):
+                if exportacao.gravar_arquivos(caminhos, fontes, "ESRI Shapefile",
+                                              tarefa.progresso, tarefa.isCanceled) is None:
+                    return None
+                return f"{len(caminhos)} shapefile(s) salvo(s) em: {directory}"
+            
+            self.executar_exportacao("Exportando Shapefiles", exportar, caminhos)
     
     def exportar_geojson(self):
-        """Exporta as camadas criadas como GeoJSON"""
-        if not self.created_layers:
+        """Exporta as camadas criadas como GeoJSON (um arquivo por camada)"""
+        if not self.camadas_vetoriais():
             QMessageBox.warning(self, "Aviso", 
                 "Nenhuma camada foi criada ainda!")
             return
@@ -762,30 +1157,120 @@ class horizonDialog(QDialog, FORM_CLASS):
             self, "Salvar GeoJSON", "", "GeoJSON (*.geojson *.json)")
         
         if filename:
-            for i, layer in enumerate(self.created_layers):
-                output = filename if i == 0 else filename.replace('.geojson', f'_{i}.geojson').replace('.json', f'_{i}.json')
-                QgsVectorFileWriter.writeAsVectorFormat(
-                    layer, output, "UTF-8", layer.crs(), "GeoJSON")
+            base, extensao = os.path.splitext(filename)
+            extensao = extensao or '.geojson'
+            caminhos = [f"{base}{extensao}" if i == 0 else f"{base}_{i}{extensao}"
+                        for i in range(len(self.camadas_vetoriais()))]
             
-            QMessageBox.information(self, "Sucesso", 
-                f"Arquivo(s) GeoJSON salvo(s)!")
+            def exportar(tarefa, fontes):
+                if exportacao.gravar_arquivos(caminhos, fontes, "GeoJSON",
+                                              tarefa.progresso, tarefa.isCanceled) is None:
+                    return None
+                return f"{len(caminhos)} arquivo(s) GeoJSON salvo(s) em: {os.path.dirname(filename)}"
+            
+            self.executar_exportacao("Exportando GeoJSON", exportar, caminhos)
+    
+    def exportar_geopackage(self):
+        """Exporta todas as camadas criadas num único GeoPackage"""
+        if not self.camadas_vetoriais():
+            QMessageBox.warning(self, "Aviso", 
+                "Nenhuma camada foi criada ainda!")
+            return
+        
+        filename, _ = QFileDialog.getSaveFileName(
+            self, "Salvar GeoPackage", "", "GeoPackage (*.gpkg)")
+        
+        if filename:
+            if not filename.lower().endswith('.gpkg'):
+                filename += '.gpkg'
+            
+            def exportar(tarefa, fontes):
+                tabelas = exportacao.gravar_geopackage(
+                    filename, fontes, tarefa.progresso, tarefa.isCanceled)
+                if tabelas is None:
+                    return None
+                return f"{len(tabelas)} camada(s) salva(s) em: {filename}"
+            
+            self.executar_exportacao("Exportando GeoPackage", exportar, [filename])
+    
+    def exportar_flatgeobuf(self):
+        """Exporta as camadas criadas como FlatGeobuf, um arquivo por camada"""
+        self.exportar_colunar('FlatGeobuf', 'fgb', "FlatGeobuf")
+    
+    def exportar_geoparquet(self):
+        """Exporta as camadas criadas como GeoParquet, um arquivo por camada"""
+        self.exportar_colunar('Parquet', 'parquet', "GeoParquet")
+    
+    def exportar_colunar(self, driver, extensao, titulo):
+        """Exporta as camadas num formato colunar/indexado pelo OGR (exportacao.gravar_colunar)"""
+        if not self.camadas_vetoriais():
+            QMessageBox.warning(self, "Aviso", 
+                "Nenhuma camada foi criada ainda!")
+            return
+        if not exportacao.driver_disponivel(driver):
+            QMessageBox.warning(self, "Aviso", 
+                f"O GDAL desta instalação do QGIS não tem suporte a {titulo}.")
+            return
+        
+        directory = QFileDialog.getExistingDirectory(
+            self, f"Selecionar Diretório para {titulo}")
+        
+        if directory:
+            nomes = exportacao.nomes_unicos([l.name() for l in self.camadas_vetoriais()])
+            caminhos = [os.path.join(directory, f"{nome}.{extensao}") for nome in nomes]
+            
+            def exportar(tarefa, fontes):
+                if exportacao.gravar_colunar(caminhos, fontes, driver,
+                                             tarefa.progresso, tarefa.isCanceled) is None:
+                    return None
+                return f"{len(caminhos)} arquivo(s) {titulo} salvo(s) em: {directory}"
+            
+            self.executar_exportacao(f"Exportando {titulo}", exportar, caminhos)
+    
+    def exportar_mbtiles(self):
+        """Exporta todas as camadas criadas como vector tiles num único MBTiles"""
+        if not self.camadas_vetoriais():
+            QMessageBox.warning(self, "Aviso", 
+                "Nenhuma camada foi criada ainda!")
+            return
+        zoom_min, zoom_max = self.spinZoomMin.value(), self.spinZoomMax.value()
+        if zoom_min > zoom_max:
+            QMessageBox.warning(self, "Aviso", 
+                "O zoom mínimo deve ser menor ou igual ao máximo!")
+            return
+        
+        filename, _ = QFileDialog.getSaveFileName(
+            self, "Salvar MBTiles", "", "MBTiles (*.mbtiles)")
+        
+        if filename:
+            if not filename.lower().endswith('.mbtiles'):
+                filename += '.mbtiles'
+            
+            def exportar(tarefa, fontes):
+                camadas = exportacao.gravar_mbtiles(
+                    filename, fontes, zoom_min, zoom_max,
+                    tarefa.progresso, tarefa.isCanceled)
+                if camadas is None:
+                    return None
+                return (f"{len(camadas)} camada(s) em tiles (zoom {zoom_min} a {zoom_max}) "
+                        f"salva(s) em: {filename}")
+            
+            self.executar_exportacao("Exportando MBTiles", exportar, [filename])
     
     def limpar_camadas(self):
         """Remove todas as camadas criadas pelo plugin"""
-        if not self.created_layers:
+        if not len(self.camadas):
             QMessageBox.information(self, "Info", 
                 "Nenhuma camada para limpar!")
             return
         
         reply = QMessageBox.question(self, "Confirmar", 
-            f"Deseja remover {len(self.created_layers)} camada(s) criada(s)?",
+            f"Deseja remover {len(self.camadas)} camada(s) criada(s)?",
             QMessageBox.Yes | QMessageBox.No)
         
         if reply == QMessageBox.Yes:
-            for layer in self.created_layers:
-                QgsProject.instance().removeMapLayer(layer.id())
-            
-            self.created_layers.clear()
+            # Uma única remoção em lote (um só redesenho da árvore e do mapa)
+            self.camadas.remover_todas()
             self.canvas.refresh()
             
             QMessageBox.information(self, "Sucesso", 
@@ -0,0 +1,565 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'horizon_dialog_base.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from qgis.PyQt import QtCore, QtGui, QtWidgets
+
+
+class Ui_horizonDialogBase(object):
+    def setupUi(self, horizonDialogBase):
+        horizonDialogBase.setObjectName("horizonDialogBase")
+        horizonDialogBase.resize(428, 457)
+        self.verticalLayout = QtWidgets.QVBoxLayout(horizonDialogBase)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.layoutModeloTerra = QtWidgets.QHBoxLayout()
+        self.layoutModeloTerra.setObjectName("layoutModeloTerra")
+        self.labelModeloTerra = QtWidgets.QLabel(horizonDialogBase)
+        self.labelModeloTerra.setObjectName("labelModeloTerra")
+        self.layoutModeloTerra.addWidget(self.labelModeloTerra)
+        self.comboModeloTerra = QtWidgets.QComboBox(horizonDialogBase)
+        self.comboModeloTerra.setObjectName("comboModeloTerra")
+        self.comboModeloTerra.addItem("")
+        self.comboModeloTerra.addItem("")
+        self.layoutModeloTerra.addWidget(self.comboModeloTerra)
+        self.checkPrevia = QtWidgets.QCheckBox(horizonDialogBase)
+        self.checkPrevia.setChecked(True)
+        self.checkPrevia.setObjectName("checkPrevia")
+        self.layoutModeloTerra.addWidget(self.checkPrevia)
+        self.verticalLayout.addLayout(self.layoutModeloTerra)
+        self.tabWidget = QtWidgets.QTabWidget(horizonDialogBase)
+        self.tabWidget.setObjectName("tabWidget")
+        self.tabHorizonte = QtWidgets.QWidget()
+        self.tabHorizonte.setObjectName("tabHorizonte")
+        self.verticalLayout_2 = QtWidgets.QVBoxLayout(self.tabHorizonte)
+        self.verticalLayout_2.setObjectName("verticalLayout_2")
+        self.groupCoords = QtWidgets.QGroupBox(self.tabHorizonte)
+        self.groupCoords.setObjectName("groupCoords")
+        self.gridLayout = QtWidgets.QGridLayout(self.groupCoords)
+        self.gridLayout.setObjectName("gridLayout")
+        self.labelLatitude = QtWidgets.QLabel(self.groupCoords)
+        self.labelLatitude.setObjectName("labelLatitude")
+        self.gridLayout.addWidget(self.labelLatitude, 0, 0, 1, 1)
+        self.spinLatitude = QtWidgets.QDoubleSpinBox(self.groupCoords)
+        self.spinLatitude.setDecimals(6)
+        self.spinLatitude.setMinimum(-90.0)
+        self.spinLatitude.setMaximum(90.0)
+        self.spinLatitude.setProperty("value", -17.5392)
+        self.spinLatitude.setObjectName("spinLatitude")
+        self.gridLayout.addWidget(self.spinLatitude, 0, 1, 1, 1)
+        self.labelLongitude = QtWidgets.QLabel(self.groupCoords)
+        self.labelLongitude.setObjectName("labelLongitude")
+        self.gridLayout.addWidget(self.labelLongitude, 0, 2, 1, 1)
+        self.spinLongitude = QtWidgets.QDoubleSpinBox(self.groupCoords)
+        self.spinLongitude.setDecimals(6)
+        self.spinLongitude.setMinimum(-180.0)
+        self.spinLongitude.setMaximum(180.0)
+        self.spinLongitude.setProperty("value", -39.7277)
+        self.spinLongitude.setObjectName("spinLongitude")
+        self.gridLayout.addWidget(self.spinLongitude, 0, 3, 1, 1)
+        self.btnUsarCanvas = QtWidgets.QPushButton(self.groupCoords)
+        self.btnUsarCanvas.setObjectName("btnUsarCanvas")
+        self.gridLayout.addWidget(self.btnUsarCanvas, 1, 0, 1, 2)
+        self.btnUsarAbrolhos = QtWidgets.QPushButton(self.groupCoords)
+        self.btnUsarAbrolhos.setObjectName("btnUsarAbrolhos")
+        self.gridLayout.addWidget(self.btnUsarAbrolhos, 1, 2, 1, 2)
+        self.verticalLayout_2.addWidget(self.groupCoords)
+        self.groupParametros = QtWidgets.QGroupBox(self.tabHorizonte)
+        self.groupParametros.setObjectName("groupParametros")
+        self.formLayout = QtWidgets.QFormLayout(self.groupParametros)
+        self.formLayout.setObjectName("formLayout")
+        self.labelAlturaObs = QtWidgets.QLabel(self.groupParametros)
+        self.labelAlturaObs.setObjectName("labelAlturaObs")
+        self.formLayout.setWidget(0, QtWidgets.QFormLayout.LabelRole, self.labelAlturaObs)
+        self.spinAlturaObservador = QtWidgets.QDoubleSpinBox(self.groupParametros)
+        self.spinAlturaObservador.setDecimals(2)
+        self.spinAlturaObservador.setMinimum(0.01)
+        self.spinAlturaObservador.setMaximum(10000.0)
+        self.spinAlturaObservador.setProperty("value", 1.7)
+        self.spinAlturaObservador.setObjectName("spinAlturaObservador")
+        self.formLayout.setWidget(0, QtWidgets.QFormLayout.FieldRole, self.spinAlturaObservador)
+        self.verticalLayout_2.addWidget(self.groupParametros)
+        self.btnCalcularHorizonte = QtWidgets.QPushButton(self.tabHorizonte)
+        self.btnCalcularHorizonte.setObjectName("btnCalcularHorizonte")
+        self.verticalLayout_2.addWidget(self.btnCalcularHorizonte)
+        self.groupResultadosHorizonte = QtWidgets.QGroupBox(self.tabHorizonte)
+        self.groupResultadosHorizonte.setObjectName("groupResultadosHorizonte")
+        self.formLayout_2 = QtWidgets.QFormLayout(self.groupResultadosHorizonte)
+        self.formLayout_2.setObjectName("formLayout_2")
+        self.labelDistHorizonte = QtWidgets.QLabel(self.groupResultadosHorizonte)
+        self.labelDistHorizonte.setObjectName("labelDistHorizonte")
+        self.formLayout_2.setWidget(0, QtWidgets.QFormLayout.LabelRole, self.labelDistHorizonte)
+        self.txtDistHorizonte = QtWidgets.QLineEdit(self.groupResultadosHorizonte)
+        self.txtDistHorizonte.setReadOnly(True)
+        self.txtDistHorizonte.setObjectName("txtDistHorizonte")
+        self.formLayout_2.setWidget(0, QtWidgets.QFormLayout.FieldRole, self.txtDistHorizonte)
+        self.labelDistNM = QtWidgets.QLabel(self.groupResultadosHorizonte)
+        self.labelDistNM.setObjectName("labelDistNM")
+        self.formLayout_2.setWidget(1, QtWidgets.QFormLayout.LabelRole, self.labelDistNM)
+        self.txtDistNM = QtWidgets.QLineEdit(self.groupResultadosHorizonte)
+        self.txtDistNM.setReadOnly(True)
+        self.txtDistNM.setObjectName("txtDistNM")
+        self.formLayout_2.setWidget(1, QtWidgets.QFormLayout.FieldRole, self.txtDistNM)
+        self.verticalLayout_2.addWidget(self.groupResultadosHorizonte)
+        self.btnDesenharHorizonte = QtWidgets.QPushButton(self.tabHorizonte)
+        self.btnDesenharHorizonte.setObjectName("btnDesenharHorizonte")
+        self.verticalLayout_2.addWidget(self.btnDesenharHorizonte)
+        self.groupTerreno = QtWidgets.QGroupBox(self.tabHorizonte)
+        self.groupTerreno.setObjectName("groupTerreno")
+        self.formLayoutTerreno = QtWidgets.QFormLayout(self.groupTerreno)
+        self.formLayoutTerreno.setObjectName("formLayoutTerreno")
+        self.labelMDE = QtWidgets.QLabel(self.groupTerreno)
+        self.labelMDE.setObjectName("labelMDE")
+        self.formLayoutTerreno.setWidget(0, QtWidgets.QFormLayout.LabelRole, self.labelMDE)
+        self.comboMDE = QgsMapLayerComboBox(self.groupTerreno)
+        self.comboMDE.setObjectName("comboMDE")
+        self.formLayoutTerreno.setWidget(0, QtWidgets.QFormLayout.FieldRole, self.comboMDE)
+        self.labelRefracao = QtWidgets.QLabel(self.groupTerreno)
+        self.labelRefracao.setObjectName("labelRefracao")
+        self.formLayoutTerreno.setWidget(1, QtWidgets.QFormLayout.LabelRole, self.labelRefracao)
+        self.spinRefracao = QtWidgets.QDoubleSpinBox(self.groupTerreno)
+        self.spinRefracao.setDecimals(3)
+        self.spinRefracao.setMaximum(1.0)
+        self.spinRefracao.setSingleStep(0.01)
+        self.spinRefracao.setProperty("value", 0.0)
+        self.spinRefracao.setObjectName("spinRefracao")
+        self.formLayoutTerreno.setWidget(1, QtWidgets.QFormLayout.FieldRole, self.spinRefracao)
+        self.labelNumRaios = QtWidgets.QLabel(self.groupTerreno)
+        self.labelNumRaios.setObjectName("labelNumRaios")
+        self.formLayoutTerreno.setWidget(2, QtWidgets.QFormLayout.LabelRole, self.labelNumRaios)
+        self.spinNumRaios = QtWidgets.QSpinBox(self.groupTerreno)
+        self.spinNumRaios.setMinimum(8)
+        self.spinNumRaios.setMaximum(36000)
+        self.spinNumRaios.setProperty("value", 720)
+        self.spinNumRaios.setObjectName("spinNumRaios")
+        self.formLayoutTerreno.setWidget(2, QtWidgets.QFormLayout.FieldRole, self.spinNumRaios)
+        self.btnViewshed = QtWidgets.QPushButton(self.groupTerreno)
+        self.btnViewshed.setObjectName("btnViewshed")
+        self.formLayoutTerreno.setWidget(3, QtWidgets.QFormLayout.LabelRole, self.btnViewshed)
+        self.btnHorizonteTerreno = QtWidgets.QPushButton(self.groupTerreno)
+        self.btnHorizonteTerreno.setObjectName("btnHorizonteTerreno")
+        self.formLayoutTerreno.setWidget(3, QtWidgets.QFormLayout.FieldRole, self.btnHorizonteTerreno)
+        self.verticalLayout_2.addWidget(self.groupTerreno)
+        spacerItem = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        self.verticalLayout_2.addItem(spacerItem)
+        self.tabWidget.addTab(self.tabHorizonte, "")
+        self.tabObjeto = QtWidgets.QWidget()
+        self.tabObjeto.setObjectName("tabObjeto")
+        self.verticalLayout_3 = QtWidgets.QVBoxLayout(self.tabObjeto)
+        self.verticalLayout_3.setObjectName("verticalLayout_3")
+        self.groupCoordsObj = QtWidgets.QGroupBox(self.tabObjeto)
+        self.groupCoordsObj.setObjectName("groupCoordsObj")
+        self.gridLayout_2 = QtWidgets.QGridLayout(self.groupCoordsObj)
+        self.gridLayout_2.setObjectName("gridLayout_2")
+        self.labelLatitudeObj = QtWidgets.QLabel(self.groupCoordsObj)
+        self.labelLatitudeObj.setObjectName("labelLatitudeObj")
+        self.gridLayout_2.addWidget(self.labelLatitudeObj, 0, 0, 1, 1)
+        self.spinLatitudeObj = QtWidgets.QDoubleSpinBox(self.groupCoordsObj)
+        self.spinLatitudeObj.setDecimals(6)
+        self.spinLatitudeObj.setMinimum(-90.0)
+        self.spinLatitudeObj.setMaximum(90.0)
+        self.spinLatitudeObj.setProperty("value", -17.5392)
+        self.spinLatitudeObj.setObjectName("spinLatitudeObj")
+        self.gridLayout_2.addWidget(self.spinLatitudeObj, 0, 1, 1, 1)
+        self.labelLongitudeObj = QtWidgets.QLabel(self.groupCoordsObj)
+        self.labelLongitudeObj.setObjectName("labelLongitudeObj")
+        self.gridLayout_2.addWidget(self.labelLongitudeObj, 0, 2, 1, 1)
+        self.spinLongitudeObj = QtWidgets.QDoubleSpinBox(self.groupCoordsObj)
+        self.spinLongitudeObj.setDecimals(6)
+        self.spinLongitudeObj.setMinimum(-180.0)
+        self.spinLongitudeObj.setMaximum(180.0)
+        self.spinLongitudeObj.setProperty("value", -39.7277)
+        self.spinLongitudeObj.setObjectName("spinLongitudeObj")
+        self.gridLayout_2.addWidget(self.spinLongitudeObj, 0, 3, 1, 1)
+        self.verticalLayout_3.addWidget(self.groupCoordsObj)
+        self.groupParametrosObj = QtWidgets.QGroupBox(self.tabObjeto)
+        self.groupParametrosObj.setObjectName("groupParametrosObj")
+        self.formLayout_3 = QtWidgets.QFormLayout(self.groupParametrosObj)
+        self.formLayout_3.setObjectName("formLayout_3")
+        self.labelAlturaObsObj = QtWidgets.QLabel(self.groupParametrosObj)
+        self.labelAlturaObsObj.setObjectName("labelAlturaObsObj")
+        self.formLayout_3.setWidget(0, QtWidgets.QFormLayout.LabelRole, self.labelAlturaObsObj)
+        self.spinAlturaObservadorObj = QtWidgets.QDoubleSpinBox(self.groupParametrosObj)
+        self.spinAlturaObservadorObj.setDecimals(2)
+        self.spinAlturaObservadorObj.setMinimum(0.01)
+        self.spinAlturaObservadorObj.setMaximum(10000.0)
+        self.spinAlturaObservadorObj.setProperty("value", 1.7)
+        self.spinAlturaObservadorObj.setObjectName("spinAlturaObservadorObj")
+        self.formLayout_3.setWidget(0, QtWidgets.QFormLayout.FieldRole, self.spinAlturaObservadorObj)
+        self.labelAlturaObjeto = QtWidgets.QLabel(self.groupParametrosObj)
+        self.labelAlturaObjeto.setObjectName("labelAlturaObjeto")
+        self.formLayout_3.setWidget(1, QtWidgets.QFormLayout.LabelRole, self.labelAlturaObjeto)
+        self.spinAlturaObjeto = QtWidgets.QDoubleSpinBox(self.groupParametrosObj)
+        self.spinAlturaObjeto.setDecimals(2)
+        self.spinAlturaObjeto.setMinimum(0.01)
+        self.spinAlturaObjeto.setMaximum(10000.0)
+        self.spinAlturaObjeto.setProperty("value", 50.0)
+        self.spinAlturaObjeto.setObjectName("spinAlturaObjeto")
+        self.formLayout_3.setWidget(1, QtWidgets.QFormLayout.FieldRole, self.spinAlturaObjeto)
+        self.verticalLayout_3.addWidget(self.groupParametrosObj)
+        self.btnCalcularObjeto = QtWidgets.QPushButton(self.tabObjeto)
+        self.btnCalcularObjeto.setObjectName("btnCalcularObjeto")
+        self.verticalLayout_3.addWidget(self.btnCalcularObjeto)
+        self.groupResultadosObjeto = QtWidgets.QGroupBox(self.tabObjeto)
+        self.groupResultadosObjeto.setObjectName("groupResultadosObjeto")
+        self.formLayout_4 = QtWidgets.QFormLayout(self.groupResultadosObjeto)
+        self.formLayout_4.setObjectName("formLayout_4")
+        self.labelDistObjeto = QtWidgets.QLabel(self.groupResultadosObjeto)
+        self.labelDistObjeto.setObjectName("labelDistObjeto")
+        self.formLayout_4.setWidget(0, QtWidgets.QFormLayout.LabelRole, self.labelDistObjeto)
+        self.txtDistObjeto = QtWidgets.QLineEdit(self.groupResultadosObjeto)
+        self.txtDistObjeto.setReadOnly(True)
+        self.txtDistObjeto.setObjectName("txtDistObjeto")
+        self.formLayout_4.setWidget(0, QtWidgets.QFormLayout.FieldRole, self.txtDistObjeto)
+        self.labelDistObjetoNM = QtWidgets.QLabel(self.groupResultadosObjeto)
+        self.labelDistObjetoNM.setObjectName("labelDistObjetoNM")
+        self.formLayout_4.setWidget(1, QtWidgets.QFormLayout.LabelRole, self.labelDistObjetoNM)
+        self.txtDistObjetoNM = QtWidgets.QLineEdit(self.groupResultadosObjeto)
+        self.txtDistObjetoNM.setReadOnly(True)
+        self.txtDistObjetoNM.setObjectName("txtDistObjetoNM")
+        self.formLayout_4.setWidget(1, QtWidgets.QFormLayout.FieldRole, self.txtDistObjetoNM)
+        self.verticalLayout_3.addWidget(self.groupResultadosObjeto)
+        self.btnDesenharObjeto = QtWidgets.QPushButton(self.tabObjeto)
+        self.btnDesenharObjeto.setObjectName("btnDesenharObjeto")
+        self.verticalLayout_3.addWidget(self.btnDesenharObjeto)
+        spacerItem1 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        self.verticalLayout_3.addItem(spacerItem1)
+        self.tabWidget.addTab(self.tabObjeto, "")
+        self.tabProjecao = QtWidgets.QWidget()
+        self.tabProjecao.setObjectName("tabProjecao")
+        self.verticalLayout_4 = QtWidgets.QVBoxLayout(self.tabProjecao)
+        self.verticalLayout_4.setObjectName("verticalLayout_4")
+        self.groupCoordsProj = QtWidgets.QGroupBox(self.tabProjecao)
+        self.groupCoordsProj.setObjectName("groupCoordsProj")
+        self.gridLayout_3 = QtWidgets.QGridLayout(self.groupCoordsProj)
+        self.gridLayout_3.setObjectName("gridLayout_3")
+        self.labelLatitudeProj = QtWidgets.QLabel(self.groupCoordsProj)
+        self.labelLatitudeProj.setObjectName("labelLatitudeProj")
+        self.gridLayout_3.addWidget(self.labelLatitudeProj, 0, 0, 1, 1)
+        self.spinLatitudeProj = QtWidgets.QDoubleSpinBox(self.groupCoordsProj)
+        self.spinLatitudeProj.setDecimals(6)
+        self.spinLatitudeProj.setMinimum(-90.0)
+        self.spinLatitudeProj.setMaximum(90.0)
+        self.spinLatitudeProj.setProperty("value", -17.5392)
+        self.spinLatitudeProj.setObjectName("spinLatitudeProj")
+        self.gridLayout_3.addWidget(self.spinLatitudeProj, 0, 1, 1, 1)
+        self.labelLongitudeProj = QtWidgets.QLabel(self.groupCoordsProj)
+        self.labelLongitudeProj.setObjectName("labelLongitudeProj")
+        self.gridLayout_3.addWidget(self.labelLongitudeProj, 0, 2, 1, 1)
+        self.spinLongitudeProj = QtWidgets.QDoubleSpinBox(self.groupCoordsProj)
+        self.spinLongitudeProj.setDecimals(6)
+        self.spinLongitudeProj.setMinimum(-180.0)
+        self.spinLongitudeProj.setMaximum(180.0)
+        self.spinLongitudeProj.setProperty("value", -39.7277)
+        self.spinLongitudeProj.setObjectName("spinLongitudeProj")
+        self.gridLayout_3.addWidget(self.spinLongitudeProj, 0, 3, 1, 1)
+        self.verticalLayout_4.addWidget(self.groupCoordsProj)
+        self.groupParametrosProj = QtWidgets.QGroupBox(self.tabProjecao)
+        self.groupParametrosProj.setObjectName("groupParametrosProj")
+        self.formLayout_5 = QtWidgets.QFormLayout(self.groupParametrosProj)
+        self.formLayout_5.setObjectName("formLayout_5")
+        self.labelAzimute = QtWidgets.QLabel(self.groupParametrosProj)
+        self.labelAzimute.setObjectName("labelAzimute")
+        self.formLayout_5.setWidget(0, QtWidgets.QFormLayout.LabelRole, self.labelAzimute)
+        self.spinAzimute = QtWidgets.QDoubleSpinBox(self.groupParametrosProj)
+        self.spinAzimute.setDecimals(2)
+        self.spinAzimute.setMaximum(360.0)
+        self.spinAzimute.setProperty("value", 0.0)
+        self.spinAzimute.setObjectName("spinAzimute")
+        self.formLayout_5.setWidget(0, QtWidgets.QFormLayout.FieldRole, self.spinAzimute)
+        self.labelDistancia = QtWidgets.QLabel(self.groupParametrosProj)
+        self.labelDistancia.setObjectName("labelDistancia")
+        self.formLayout_5.setWidget(1, QtWidgets.QFormLayout.LabelRole, self.labelDistancia)
+        self.spinDistancia = QtWidgets.QDoubleSpinBox(self.groupParametrosProj)
+        self.spinDistancia.setDecimals(3)
+        self.spinDistancia.setMaximum(10000.0)
+        self.spinDistancia.setProperty("value", 10.0)
+        self.spinDistancia.setObjectName("spinDistancia")
+        self.formLayout_5.setWidget(1, QtWidgets.QFormLayout.FieldRole, self.spinDistancia)
+        self.labelElevacao = QtWidgets.QLabel(self.groupParametrosProj)
+        self.labelElevacao.setObjectName("labelElevacao")
+        self.formLayout_5.setWidget(2, QtWidgets.QFormLayout.LabelRole, self.labelElevacao)
+        self.spinElevacao = QtWidgets.QDoubleSpinBox(self.groupParametrosProj)
+        self.spinElevacao.setDecimals(2)
+        self.spinElevacao.setMinimum(-1000.0)
+        self.spinElevacao.setMaximum(10000.0)
+        self.spinElevacao.setProperty("value", 0.0)
+        self.spinElevacao.setObjectName("spinElevacao")
+        self.formLayout_5.setWidget(2, QtWidgets.QFormLayout.FieldRole, self.spinElevacao)
+        self.labelDeclinacao = QtWidgets.QLabel(self.groupParametrosProj)
+        self.labelDeclinacao.setObjectName("labelDeclinacao")
+        self.formLayout_5.setWidget(3, QtWidgets.QFormLayout.LabelRole, self.labelDeclinacao)
+        self.spinDeclinacao = QtWidgets.QDoubleSpinBox(self.groupParametrosProj)
+        self.spinDeclinacao.setDecimals(3)
+        self.spinDeclinacao.setMinimum(-180.0)
+        self.spinDeclinacao.setMaximum(180.0)
+        self.spinDeclinacao.setProperty("value", -23.933)
+        self.spinDeclinacao.setObjectName("spinDeclinacao")
+        self.formLayout_5.setWidget(3, QtWidgets.QFormLayout.FieldRole, self.spinDeclinacao)
+        self.verticalLayout_4.addWidget(self.groupParametrosProj)
+        self.btnCalcularProjecao = QtWidgets.QPushButton(self.tabProjecao)
+        self.btnCalcularProjecao.setObjectName("btnCalcularProjecao")
+        self.verticalLayout_4.addWidget(self.btnCalcularProjecao)
+        self.groupResultadosProj = QtWidgets.QGroupBox(self.tabProjecao)
+        self.groupResultadosProj.setObjectName("groupResultadosProj")
+        self.formLayout_6 = QtWidgets.QFormLayout(self.groupResultadosProj)
+        self.formLayout_6.setObjectName("formLayout_6")
+        self.labelLatAlvo = QtWidgets.QLabel(self.groupResultadosProj)
+        self.labelLatAlvo.setObjectName("labelLatAlvo")
+        self.formLayout_6.setWidget(0, QtWidgets.QFormLayout.LabelRole, self.labelLatAlvo)
+        self.txtLatAlvo = QtWidgets.QLineEdit(self.groupResultadosProj)
+        self.txtLatAlvo.setReadOnly(True)
+        self.txtLatAlvo.setObjectName("txtLatAlvo")
+        self.formLayout_6.setWidget(0, QtWidgets.QFormLayout.FieldRole, self.txtLatAlvo)
+        self.labelLngAlvo = QtWidgets.QLabel(self.groupResultadosProj)
+        self.labelLngAlvo.setObjectName("labelLngAlvo")
+        self.formLayout_6.setWidget(1, QtWidgets.QFormLayout.LabelRole, self.labelLngAlvo)
+        self.txtLngAlvo = QtWidgets.QLineEdit(self.groupResultadosProj)
+        self.txtLngAlvo.setReadOnly(True)
+        self.txtLngAlvo.setObjectName("txtLngAlvo")
+        self.formLayout_6.setWidget(1, QtWidgets.QFormLayout.FieldRole, self.txtLngAlvo)
+        self.labelAzVerdadeiro = QtWidgets.QLabel(self.groupResultadosProj)
+        self.labelAzVerdadeiro.setObjectName("labelAzVerdadeiro")
+        self.formLayout_6.setWidget(2, QtWidgets.QFormLayout.LabelRole, self.labelAzVerdadeiro)
+        self.txtAzVerdadeiro = QtWidgets.QLineEdit(self.groupResultadosProj)
+        self.txtAzVerdadeiro.setReadOnly(True)
+        self.txtAzVerdadeiro.setObjectName("txtAzVerdadeiro")
+        self.formLayout_6.setWidget(2, QtWidgets.QFormLayout.FieldRole, self.txtAzVerdadeiro)
+        self.verticalLayout_4.addWidget(self.groupResultadosProj)
+        self.btnDesenharProjecao = QtWidgets.QPushButton(self.tabProjecao)
+        self.btnDesenharProjecao.setObjectName("btnDesenharProjecao")
+        self.verticalLayout_4.addWidget(self.btnDesenharProjecao)
+        spacerItem2 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        self.verticalLayout_4.addItem(spacerItem2)
+        self.tabWidget.addTab(self.tabProjecao, "")
+        self.tabAneis = QtWidgets.QWidget()
+        self.tabAneis.setObjectName("tabAneis")
+        self.verticalLayout_5 = QtWidgets.QVBoxLayout(self.tabAneis)
+        self.verticalLayout_5.setObjectName("verticalLayout_5")
+        self.groupCoordsAneis = QtWidgets.QGroupBox(self.tabAneis)
+        self.groupCoordsAneis.setObjectName("groupCoordsAneis")
+        self.gridLayout_4 = QtWidgets.QGridLayout(self.groupCoordsAneis)
+        self.gridLayout_4.setObjectName("gridLayout_4")
+        self.labelLatitudeAneis = QtWidgets.QLabel(self.groupCoordsAneis)
+        self.labelLatitudeAneis.setObjectName("labelLatitudeAneis")
+        self.gridLayout_4.addWidget(self.labelLatitudeAneis, 0, 0, 1, 1)
+        self.spinLatitudeAneis = QtWidgets.QDoubleSpinBox(self.groupCoordsAneis)
+        self.spinLatitudeAneis.setDecimals(6)
+        self.spinLatitudeAneis.setMinimum(-90.0)
+        self.spinLatitudeAneis.setMaximum(90.0)
+        self.spinLatitudeAneis.setProperty("value", -17.5392)
+        self.spinLatitudeAneis.setObjectName("spinLatitudeAneis")
+        self.gridLayout_4.addWidget(self.spinLatitudeAneis, 0, 1, 1, 1)
+        self.labelLongitudeAneis = QtWidgets.QLabel(self.groupCoordsAneis)
+        self.labelLongitudeAneis.setObjectName("labelLongitudeAneis")
+        self.gridLayout_4.addWidget(self.labelLongitudeAneis, 0, 2, 1, 1)
+        self.spinLongitudeAneis = QtWidgets.QDoubleSpinBox(self.groupCoordsAneis)
+        self.spinLongitudeAneis.setDecimals(6)
+        self.spinLongitudeAneis.setMinimum(-180.0)
+        self.spinLongitudeAneis.setMaximum(180.0)
+        self.spinLongitudeAneis.setProperty("value", -39.7277)
+        self.spinLongitudeAneis.setObjectName("spinLongitudeAneis")
+        self.gridLayout_4.addWidget(self.spinLongitudeAneis, 0, 3, 1, 1)
+        self.verticalLayout_5.addWidget(self.groupCoordsAneis)
+        self.groupConfigAneis = QtWidgets.QGroupBox(self.tabAneis)
+        self.groupConfigAneis.setObjectName("groupConfigAneis")
+        self.formLayout_7 = QtWidgets.QFormLayout(self.groupConfigAneis)
+        self.formLayout_7.setObjectName("formLayout_7")
+        self.labelNumAneis = QtWidgets.QLabel(self.groupConfigAneis)
+        self.labelNumAneis.setObjectName("labelNumAneis")
+        self.formLayout_7.setWidget(0, QtWidgets.QFormLayout.LabelRole, self.labelNumAneis)
+        self.spinNumAneis = QtWidgets.QSpinBox(self.groupConfigAneis)
+        self.spinNumAneis.setMinimum(1)
+        self.spinNumAneis.setMaximum(50)
+        self.spinNumAneis.setProperty("value", 16)
+        self.spinNumAneis.setObjectName("spinNumAneis")
+        self.formLayout_7.setWidget(0, QtWidgets.QFormLayout.FieldRole, self.spinNumAneis)
+        self.labelIntervalo = QtWidgets.QLabel(self.groupConfigAneis)
+        self.labelIntervalo.setObjectName("labelIntervalo")
+        self.formLayout_7.setWidget(1, QtWidgets.QFormLayout.LabelRole, self.labelIntervalo)
+        self.spinIntervalo = QtWidgets.QDoubleSpinBox(self.groupConfigAneis)
+        self.spinIntervalo.setDecimals(2)
+        self.spinIntervalo.setMinimum(0.1)
+        self.spinIntervalo.setMaximum(100.0)
+        self.spinIntervalo.setProperty("value", 1.0)
+        self.spinIntervalo.setObjectName("spinIntervalo")
+        self.formLayout_7.setWidget(1, QtWidgets.QFormLayout.FieldRole, self.spinIntervalo)
+        self.checkMostrarLabels = QtWidgets.QCheckBox(self.groupConfigAneis)
+        self.checkMostrarLabels.setChecked(True)
+        self.checkMostrarLabels.setObjectName("checkMostrarLabels")
+        self.formLayout_7.setWidget(2, QtWidgets.QFormLayout.SpanningRole, self.checkMostrarLabels)
+        self.checkGradiente = QtWidgets.QCheckBox(self.groupConfigAneis)
+        self.checkGradiente.setChecked(True)
+        self.checkGradiente.setObjectName("checkGradiente")
+        self.formLayout_7.setWidget(3, QtWidgets.QFormLayout.SpanningRole, self.checkGradiente)
+        self.verticalLayout_5.addWidget(self.groupConfigAneis)
+        self.btnDesenharAneis = QtWidgets.QPushButton(self.tabAneis)
+        self.btnDesenharAneis.setObjectName("btnDesenharAneis")
+        self.verticalLayout_5.addWidget(self.btnDesenharAneis)
+        spacerItem3 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        self.verticalLayout_5.addItem(spacerItem3)
+        self.tabWidget.addTab(self.tabAneis, "")
+        self.tabExportar = QtWidgets.QWidget()
+        self.tabExportar.setObjectName("tabExportar")
+        self.verticalLayout_6 = QtWidgets.QVBoxLayout(self.tabExportar)
+        self.verticalLayout_6.setObjectName("verticalLayout_6")
+        self.groupExportar = QtWidgets.QGroupBox(self.tabExportar)
+        self.groupExportar.setObjectName("groupExportar")
+        self.verticalLayout_7 = QtWidgets.QVBoxLayout(self.groupExportar)
+        self.verticalLayout_7.setObjectName("verticalLayout_7")
+        self.btnExportarGPX = QtWidgets.QPushButton(self.groupExportar)
+        self.btnExportarGPX.setObjectName("btnExportarGPX")
+        self.verticalLayout_7.addWidget(self.btnExportarGPX)
+        self.btnExportarKML = QtWidgets.QPushButton(self.groupExportar)
+        self.btnExportarKML.setObjectName("btnExportarKML")
+        self.verticalLayout_7.addWidget(self.btnExportarKML)
+        self.btnExportarShapefile = QtWidgets.QPushButton(self.groupExportar)
+        self.btnExportarShapefile.setObjectName("btnExportarShapefile")
+        self.verticalLayout_7.addWidget(self.btnExportarShapefile)
+        self.btnExportarJSON = QtWidgets.QPushButton(self.groupExportar)
+        self.btnExportarJSON.setObjectName("btnExportarJSON")
+        self.verticalLayout_7.addWidget(self.btnExportarJSON)
+        self.btnExportarGPKG = QtWidgets.QPushButton(self.groupExportar)
+        self.btnExportarGPKG.setObjectName("btnExportarGPKG")
+        self.verticalLayout_7.addWidget(self.btnExportarGPKG)
+        self.btnExportarFGB = QtWidgets.QPushButton(self.groupExportar)
+        self.btnExportarFGB.setObjectName("btnExportarFGB")
+        self.verticalLayout_7.addWidget(self.btnExportarFGB)
+        self.btnExportarParquet = QtWidgets.QPushButton(self.groupExportar)
+        self.btnExportarParquet.setObjectName("btnExportarParquet")
+        self.verticalLayout_7.addWidget(self.btnExportarParquet)
+        self.layoutZoomMBTiles = QtWidgets.QHBoxLayout()
+        self.layoutZoomMBTiles.setObjectName("layoutZoomMBTiles")
+        self.labelZoomMBTiles = QtWidgets.QLabel(self.groupExportar)
+        self.labelZoomMBTiles.setObjectName("labelZoomMBTiles")
+        self.layoutZoomMBTiles.addWidget(self.labelZoomMBTiles)
+        self.spinZoomMin = QtWidgets.QSpinBox(self.groupExportar)
+        self.spinZoomMin.setMaximum(22)
+        self.spinZoomMin.setProperty("value", 4)
+        self.spinZoomMin.setObjectName("spinZoomMin")
+        self.layoutZoomMBTiles.addWidget(self.spinZoomMin)
+        self.labelZoomAte = QtWidgets.QLabel(self.groupExportar)
+        self.labelZoomAte.setObjectName("labelZoomAte")
+        self.layoutZoomMBTiles.addWidget(self.labelZoomAte)
+        self.spinZoomMax = QtWidgets.QSpinBox(self.groupExportar)
+        self.spinZoomMax.setMaximum(22)
+        self.spinZoomMax.setProperty("value", 12)
+        self.spinZoomMax.setObjectName("spinZoomMax")
+        self.layoutZoomMBTiles.addWidget(self.spinZoomMax)
+        self.verticalLayout_7.addLayout(self.layoutZoomMBTiles)
+        self.btnExportarMBTiles = QtWidgets.QPushButton(self.groupExportar)
+        self.btnExportarMBTiles.setObjectName("btnExportarMBTiles")
+        self.verticalLayout_7.addWidget(self.btnExportarMBTiles)
+        self.verticalLayout_6.addWidget(self.groupExportar)
+        self.groupLimpar = QtWidgets.QGroupBox(self.tabExportar)
+        self.groupLimpar.setObjectName("groupLimpar")
+        self.verticalLayout_8 = QtWidgets.QVBoxLayout(self.groupLimpar)
+        self.verticalLayout_8.setObjectName("verticalLayout_8")
+        self.checkAcumular = QtWidgets.QCheckBox(self.groupLimpar)
+        self.checkAcumular.setObjectName("checkAcumular")
+        self.verticalLayout_8.addWidget(self.checkAcumular)
+        self.btnLimparCamadas = QtWidgets.QPushButton(self.groupLimpar)
+        self.btnLimparCamadas.setObjectName("btnLimparCamadas")
+        self.verticalLayout_8.addWidget(self.btnLimparCamadas)
+        self.verticalLayout_6.addWidget(self.groupLimpar)
+        spacerItem4 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        self.verticalLayout_6.addItem(spacerItem4)
+        self.tabWidget.addTab(self.tabExportar, "")
+        self.verticalLayout.addWidget(self.tabWidget)
+        self.button_box = QtWidgets.QDialogButtonBox(horizonDialogBase)
+        self.button_box.setOrientation(QtCore.Qt.Horizontal)
+        self.button_box.setStandardButtons(QtWidgets.QDialogButtonBox.Close)
+        self.button_box.setObjectName("button_box")
+        self.verticalLayout.addWidget(self.button_box)
+
+        self.retranslateUi(horizonDialogBase)
+        self.tabWidget.setCurrentIndex(2)
+        self.button_box.rejected.connect(horizonDialogBase.reject) # type: ignore
+        QtCore.QMetaObject.connectSlotsByName(horizonDialogBase)
+
+    def retranslateUi(self, horizonDialogBase):
+        _translate = QtCore.QCoreApplication.translate
+        horizonDialogBase.setWindowTitle(_translate("horizonDialogBase", "Horizon Projector"))
+        self.labelModeloTerra.setText(_translate("horizonDialogBase", "Modelo da Terra:"))
+        self.comboModeloTerra.setItemText(0, _translate("horizonDialogBase", "Esfera (R = 6371 km)"))
+        self.comboModeloTerra.setItemText(1, _translate("horizonDialogBase", "Elipsoide WGS84 (geodésico)"))
+        self.checkPrevia.setToolTip(_translate("horizonDialogBase", "Mostra no mapa, sem criar camadas, o que seria desenhado na aba atual; durante a captura de coordenadas segue o mouse"))
+        self.checkPrevia.setText(_translate("horizonDialogBase", "Pré-visualizar no mapa"))
+        self.groupCoords.setTitle(_translate("horizonDialogBase", "Coordenadas do Observador"))
+        self.labelLatitude.setText(_translate("horizonDialogBase", "Latitude:"))
+        self.labelLongitude.setText(_translate("horizonDialogBase", "Longitude:"))
+        self.btnUsarCanvas.setText(_translate("horizonDialogBase", "Usar Centro do Canvas"))
+        self.btnUsarAbrolhos.setText(_translate("horizonDialogBase", "Capturar Coordenadas no Mapa"))
+        self.groupParametros.setTitle(_translate("horizonDialogBase", "Parâmetros"))
+        self.labelAlturaObs.setText(_translate("horizonDialogBase", "Altura do Observador (m):"))
+        self.btnCalcularHorizonte.setText(_translate("horizonDialogBase", "Calcular Distância ao Horizonte"))
+        self.groupResultadosHorizonte.setTitle(_translate("horizonDialogBase", "Resultados"))
+        self.labelDistHorizonte.setText(_translate("horizonDialogBase", "Distância ao Horizonte:"))
+        self.labelDistNM.setText(_translate("horizonDialogBase", "Distância (NM):"))
+        self.btnDesenharHorizonte.setText(_translate("horizonDialogBase", "Desenhar Círculo no Mapa"))
+        self.groupTerreno.setTitle(_translate("horizonDialogBase", "Terreno (MDE)"))
+        self.labelMDE.setText(_translate("horizonDialogBase", "Modelo de Elevação:"))
+        self.labelRefracao.setText(_translate("horizonDialogBase", "Coeficiente de Refração:"))
+        self.labelNumRaios.setText(_translate("horizonDialogBase", "Raios do Horizonte:"))
+        self.btnViewshed.setText(_translate("horizonDialogBase", "Calcular Viewshed do Terreno"))
+        self.btnHorizonteTerreno.setText(_translate("horizonDialogBase", "Desenhar Horizonte do Terreno"))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.tabHorizonte), _translate("horizonDialogBase", "Horizonte"))
+        self.groupCoordsObj.setTitle(_translate("horizonDialogBase", "Coordenadas do Observador"))
+        self.labelLatitudeObj.setText(_translate("horizonDialogBase", "Latitude:"))
+        self.labelLongitudeObj.setText(_translate("horizonDialogBase", "Longitude:"))
+        self.groupParametrosObj.setTitle(_translate("horizonDialogBase", "Parâmetros"))
+        self.labelAlturaObsObj.setText(_translate("horizonDialogBase", "Altura do Observador (m):"))
+        self.labelAlturaObjeto.setText(_translate("horizonDialogBase", "Altura do Objeto (m):"))
+        self.btnCalcularObjeto.setText(_translate("horizonDialogBase", "Calcular Distância do Objeto"))
+        self.groupResultadosObjeto.setTitle(_translate("horizonDialogBase", "Resultados"))
+        self.labelDistObjeto.setText(_translate("horizonDialogBase", "Distância até Objeto:"))
+        self.labelDistObjetoNM.setText(_translate("horizonDialogBase", "Distância (NM):"))
+        self.btnDesenharObjeto.setText(_translate("horizonDialogBase", "Desenhar Círculo no Mapa"))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.tabObjeto), _translate("horizonDialogBase", "Objeto Visível"))
+        self.groupCoordsProj.setTitle(_translate("horizonDialogBase", "Ponto de Partida"))
+        self.labelLatitudeProj.setText(_translate("horizonDialogBase", "Latitude:"))
+        self.labelLongitudeProj.setText(_translate("horizonDialogBase", "Longitude:"))
+        self.groupParametrosProj.setTitle(_translate("horizonDialogBase", "Parâmetros de Projeção"))
+        self.labelAzimute.setText(_translate("horizonDialogBase", "Azimute Magnético (°):"))
+        self.labelDistancia.setText(_translate("horizonDialogBase", "Distância (km):"))
+        self.labelElevacao.setText(_translate("horizonDialogBase", "Elevação (m):"))
+        self.labelDeclinacao.setText(_translate("horizonDialogBase", "Declinação Magnética (°):"))
+        self.btnCalcularProjecao.setText(_translate("horizonDialogBase", "Calcular Projeção"))
+        self.groupResultadosProj.setTitle(_translate("horizonDialogBase", "Coordenadas do Alvo"))
+        self.labelLatAlvo.setText(_translate("horizonDialogBase", "Latitude:"))
+        self.labelLngAlvo.setText(_translate("horizonDialogBase", "Longitude:"))
+        self.labelAzVerdadeiro.setText(_translate("horizonDialogBase", "Azimute Verdadeiro (°):"))
+        self.btnDesenharProjecao.setText(_translate("horizonDialogBase", "Desenhar Linha e Ponto no Mapa"))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.tabProjecao), _translate("horizonDialogBase", "Projeção"))
+        self.groupCoordsAneis.setTitle(_translate("horizonDialogBase", "Centro dos Anéis"))
+        self.labelLatitudeAneis.setText(_translate("horizonDialogBase", "Latitude:"))
+        self.labelLongitudeAneis.setText(_translate("horizonDialogBase", "Longitude:"))
+        self.groupConfigAneis.setTitle(_translate("horizonDialogBase", "Configurações"))
+        self.labelNumAneis.setText(_translate("horizonDialogBase", "Número de Anéis:"))
+        self.labelIntervalo.setText(_translate("horizonDialogBase", "Intervalo (NM):"))
+        self.checkMostrarLabels.setText(_translate("horizonDialogBase", "Mostrar Etiquetas de Distância"))
+        self.checkGradiente.setText(_translate("horizonDialogBase", "Usar Gradiente de Cores (Verde → Vermelho)"))
+        self.btnDesenharAneis.setText(_translate("horizonDialogBase", "Desenhar Anéis no Mapa"))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.tabAneis), _translate("horizonDialogBase", "Anéis de Distância"))
+        self.groupExportar.setTitle(_translate("horizonDialogBase", "Exportar Camadas e Dados"))
+        self.btnExportarGPX.setText(_translate("horizonDialogBase", "Exportar como GPX"))
+        self.btnExportarKML.setText(_translate("horizonDialogBase", "Exportar como KML"))
+        self.btnExportarShapefile.setText(_translate("horizonDialogBase", "Exportar como Shapefile"))
+        self.btnExportarJSON.setText(_translate("horizonDialogBase", "Exportar como GeoJSON"))
+        self.btnExportarGPKG.setText(_translate("horizonDialogBase", "Exportar como GeoPackage (todas as camadas)"))
+        self.btnExportarFGB.setText(_translate("horizonDialogBase", "Exportar como FlatGeobuf (com índice espacial)"))
+        self.btnExportarParquet.setText(_translate("horizonDialogBase", "Exportar como GeoParquet"))
+        self.labelZoomMBTiles.setText(_translate("horizonDialogBase", "Zoom dos tiles:"))
+        self.labelZoomAte.setText(_translate("horizonDialogBase", "a"))
+        self.btnExportarMBTiles.setText(_translate("horizonDialogBase", "Exportar como MBTiles (vector tiles)"))
+        self.groupLimpar.setTitle(_translate("horizonDialogBase", "Gerenciar Camadas"))
+        self.checkAcumular.setToolTip(_translate("horizonDialogBase", "Anexa cada resultado como feições numa camada persistente por tipo de geometria, em vez de criar novas camadas"))
+        self.checkAcumular.setText(_translate("horizonDialogBase", "Acumular resultados (uma camada por tipo de geometria)"))
+        self.btnLimparCamadas.setText(_translate("horizonDialogBase", "Limpar Todas as Camadas Criadas"))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.tabExportar), _translate("horizonDialogBase", "Exportar"))
+from qgis.gui import QgsMapLayerComboBox
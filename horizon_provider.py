@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ horizonProvider
+                                 A QGIS plugin
+ Horizon Projector - Provedor de Processing
+                             -------------------
+        begin                : 2026-01-11
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Alberto Rodrigues
+        email                : betorodriuges@msn.com
+ ***************************************************************************/
+"""
+
+import os
+
+from qgis.PyQt.QtGui import QIcon
+from qgis.core import QgsProcessingProvider
+
+from .algoritmos.circulos import (
+    AneisDistanciaAlgorithm, CirculosHorizonteAlgorithm, CoberturaAlgorithm,
+    ObjetoVisivelAlgorithm,
+)
+from .algoritmos.consultas import (
+    IntervisibilidadeAlgorithm, ObjetosVisiveisAlgorithm, VisibilidadeTrajetoAlgorithm,
+)
+from .algoritmos.projecao import ProjecaoAlgorithm
+from .algoritmos.viewshed import ViewshedCumulativoAlgorithm
+
+
+class horizonProvider(QgsProcessingProvider):
+    """Expõe os cálculos do plugin na Caixa de Ferramentas de Processing."""
+
+    def loadAlgorithms(self):
+        for algoritmo in (CirculosHorizonteAlgorithm, ObjetoVisivelAlgorithm,
+                          ProjecaoAlgorithm, AneisDistanciaAlgorithm,
+                          ViewshedCumulativoAlgorithm, ObjetosVisiveisAlgorithm,
+                          VisibilidadeTrajetoAlgorithm, IntervisibilidadeAlgorithm,
+                          CoberturaAlgorithm):
+            self.addAlgorithm(algoritmo())
+
+    def id(self):
+        return 'horizon'
+
+    def name(self):
+        return 'Horizon Projector'
+
+    def longName(self):
+        return self.name()
+
+    def icon(self):
+        return QIcon(os.path.join(os.path.dirname(__file__), 'icon.png'))
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ previa
+                                 A QGIS plugin
+ Horizon Projector - Pré-visualização no mapa com QgsRubberBand
+                             -------------------
+        begin                : 2026-01-11
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Alberto Rodrigues
+        email                : betorodriuges@msn.com
+ ***************************************************************************/
+
+ Mostra círculos, anéis e projeções sobre o mapa enquanto o mouse se move
+ ou os parâmetros mudam, sem criar camadas nem redesenhar o mapa inteiro:
+ só os itens de rubber band são atualizados.
+"""
+
+from qgis.PyQt.QtCore import QObject, Qt, QTimer
+from qgis.PyQt.QtGui import QColor
+from qgis.core import (
+    QgsCoordinateReferenceSystem, QgsCoordinateTransform, QgsCsException, QgsGeometry,
+    QgsLineString, QgsMultiLineString, QgsProject, QgsWkbTypes,
+)
+from qgis.gui import QgsRubberBand
+
+EPSG4326 = QgsCoordinateReferenceSystem("EPSG:4326")
+
+# Intervalo mínimo entre redesenhos (~30 quadros por segundo)
+INTERVALO_MS = 33
+
+
+def geometria_linhas(lats, lons):
+    """
+    MultiLineString com uma linha por linha dos arrays 2-D (lats, lons),
+    como os anéis de circulos.aneis_geodesicos. Os vértices vão direto dos
+    arrays para o QgsLineString, sem um QgsPointXY por vértice.
+    """
+    multi = QgsMultiLineString()
+    for lats_linha, lons_linha in zip(lats, lons):
+        multi.addGeometry(QgsLineString(lons_linha.tolist(), lats_linha.tolist()))
+    return QgsGeometry(multi)
+
+
+class PreviaMapa(QObject):
+    """
+    Rubber bands de pré-visualização com redesenho limitado por tempo.
+
+    `atualizar(gerar)` só agenda: no máximo um redesenho a cada
+    `intervalo_ms`, sempre com o pedido mais recente. `gerar()` é chamada
+    nesse momento e devolve (geometria, centro) em WGS84, ou None para
+    apagar a pré-visualização.
+    """
+
+    def __init__(self, canvas, intervalo_ms=INTERVALO_MS, parent=None):
+        super(PreviaMapa, self).__init__(parent)
+        self.canvas = canvas
+
+        self.banda = QgsRubberBand(canvas, QgsWkbTypes.LineGeometry)
+        self.banda.setColor(QColor(0, 255, 245, 220))
+        self.banda.setWidth(2)
+        self.banda.setLineStyle(Qt.DashLine)
+
+        self.centro = QgsRubberBand(canvas, QgsWkbTypes.PointGeometry)
+        self.centro.setColor(QColor(0, 255, 245, 220))
+        self.centro.setIcon(QgsRubberBand.ICON_CIRCLE)
+        self.centro.setIconSize(8)
+
+        self._gerar = None
+        self._transform = None
+        self._relogio = QTimer(self)
+        self._relogio.setSingleShot(True)
+        self._relogio.setInterval(intervalo_ms)
+        self._relogio.timeout.connect(self._desenhar)
+
+    def atualizar(self, gerar):
+        """Agenda o redesenho com `gerar`, substituindo o pedido pendente."""
+        self._gerar = gerar
+        if not self._relogio.isActive():
+            self._relogio.start()
+
+    def limpar(self):
+        """Cancela o pedido pendente e apaga a pré-visualização."""
+        self._relogio.stop()
+        self._gerar = None
+        self.banda.reset(QgsWkbTypes.LineGeometry)
+        self.centro.reset(QgsWkbTypes.PointGeometry)
+
+    def remover(self):
+        """Tira os itens do mapa (ao descarregar o plugin)."""
+        self.limpar()
+        for item in (self.banda, self.centro):
+            self.canvas.scene().removeItem(item)
+
+    def _para_mapa(self):
+        """Transformação WGS84 -> SRC do mapa, refeita só se o SRC mudar."""
+        destino = self.canvas.mapSettings().destinationCrs()
+        if self._transform is None or self._transform.destinationCrs() != destino:
+            self._transform = QgsCoordinateTransform(EPSG4326, destino, QgsProject.instance())
+        return self._transform
+
+    def _desenhar(self):
+        gerar, self._gerar = self._gerar, None
+        if gerar is None:
+            return
+        resultado = gerar()
+        if resultado is None:
+            self.limpar()
+            return
+        geometria, centro = resultado
+        transform = self._para_mapa()
+        geometria = QgsGeometry(geometria)
+        try:
+            geometria.transform(transform)
+            centro = transform.transform(centro)
+        except QgsCsException:
+            # Fora da área válida do SRC do mapa (p.ex. perto dos polos em Web
+            # Mercator): sem pré-visualização, em vez de deixar a anterior
+            self.limpar()
+            return
+        self.banda.setToGeometry(geometria, None)
+        self.centro.reset(QgsWkbTypes.PointGeometry)
+        self.centro.addPoint(centro)
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ tarefas
+                                 A QGIS plugin
+ Horizon Projector - Desenho e exportação em segundo plano (QgsTask)
+                             -------------------
+        begin                : 2026-01-11
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Alberto Rodrigues
+        email                : betorodriuges@msn.com
+ ***************************************************************************/
+"""
+
+import os
+import traceback
+
+from qgis.PyQt.QtCore import QCoreApplication
+from qgis.core import Qgis, QgsMessageLog, QgsTask, QgsVectorFileWriter
+
+
+class TarefaDesenho(QgsTask):
+    """
+    Monta camadas de memória fora da thread principal.
+
+    A função `construir(tarefa)` roda em segundo plano: gera a geometria,
+    cria as feições e estiliza as camadas, consultando `tarefa.isCanceled()`
+    e informando o progresso com `tarefa.setProgress()`. Ela devolve a lista
+    de camadas prontas, que são movidas para a thread principal. Em
+    `finished()`, já na thread principal, `concluir(camadas)` só precisa
+    adicioná-las ao projeto. Se `construir` falhar, `falhar(erro)` recebe
+    a mensagem da exceção (o traceback vai para o log de mensagens).
+    """
+
+    def __init__(self, descricao, construir, concluir, falhar=None):
+        super(TarefaDesenho, self).__init__(descricao, QgsTask.CanCancel)
+        self.construir = construir
+        self.concluir = concluir
+        self.falhar = falhar
+        self.camadas = []
+        self.erro = None
+
+    def run(self):
+        try:
+            self.camadas = self.construir(self) or []
+        except Exception as e:
+            self.erro = str(e)
+            QgsMessageLog.logMessage(
+                f"{self.description()}:\n{traceback.format_exc()}",
+                "Horizon Projector", Qgis.Critical)
+            return False
+        if self.isCanceled():
+            return False
+
+        # Camadas criadas aqui pertencem à thread da tarefa
+        principal = QCoreApplication.instance().thread()
+        for camada in self.camadas:
+            camada.moveToThread(principal)
+        return True
+
+    def finished(self, resultado):
+        if resultado:
+            self.concluir(self.camadas)
+        elif self.erro is not None:
+            if self.falhar is not None:
+                self.falhar(self.erro)
+        else:
+            QgsMessageLog.logMessage(
+                f"{self.description()}: cancelado", "Horizon Projector", Qgis.Info)
+
+
+class TarefaExportacao(QgsTask):
+    """
+    Grava arquivos fora da thread principal.
+
+    A função `exportar(tarefa)` roda em segundo plano, lendo as camadas por
+    exportacao.FonteCamada (criadas antes, na thread principal), informando
+    o progresso por feição com `tarefa.setProgress()` e parando quando
+    `tarefa.isCanceled()`. Ela devolve uma mensagem de resumo, ou None se
+    foi interrompida. Se a tarefa for cancelada ou falhar, os `caminhos`
+    de saída são apagados, para não deixar arquivos pela metade. Em
+    `finished()`, `concluir(mensagem)` ou `falhar(erro)` avisam o usuário.
+    """
+
+    def __init__(self, descricao, exportar, caminhos, concluir, falhar=None):
+        super(TarefaExportacao, self).__init__(descricao, QgsTask.CanCancel)
+        self.exportar = exportar
+        self.caminhos = list(caminhos)
+        self.concluir = concluir
+        self.falhar = falhar
+        self.mensagem = None
+        self.erro = None
+
+    def progresso(self, fracao):
+        """Progresso em fração (0 a 1), no formato usado por exportacao."""
+        self.setProgress(100.0 * fracao)
+
+    def run(self):
+        try:
+            self.mensagem = self.exportar(self)
+        except Exception as e:
+            self.erro = str(e)
+            QgsMessageLog.logMessage(
+                f"{self.description()}:\n{traceback.format_exc()}",
+                "Horizon Projector", Qgis.Critical)
+        if self.erro is not None or self.mensagem is None or self.isCanceled():
+            self.apagar_parciais()
+            return False
+        return True
+
+    def apagar_parciais(self):
+        """Remove os arquivos de saída incompletos."""
+        for caminho in self.caminhos:
+            if caminho.lower().endswith('.shp'):
+                QgsVectorFileWriter.deleteShapeFile(caminho)
+            elif os.path.exists(caminho):
+                os.remove(caminho)
+
+    def finished(self, resultado):
+        if resultado:
+            self.concluir(self.mensagem)
+        elif self.erro is not None:
+            if self.falhar is not None:
+                self.falhar(self.erro)
+        else:
+            QgsMessageLog.logMessage(
+                f"{self.description()}: cancelado", "Horizon Projector", Qgis.Info)
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ terreno
+                                 A QGIS plugin
+ Horizon Projector - Leitura e gravação de rasters de terreno
+                             -------------------
+        begin                : 2026-01-11
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Alberto Rodrigues
+        email                : betorodriuges@msn.com
+ ***************************************************************************/
+
+ Ponte entre os provedores raster do QGIS e os arrays NumPy usados por
+ horizon_core.visibilidade.
+"""
+
+import math
+
+import numpy as np
+from qgis.PyQt.QtCore import QByteArray
+from qgis.PyQt.QtGui import QColor
+from qgis.core import (
+    Qgis, QgsCoordinateReferenceSystem, QgsCoordinateTransform,
+    QgsPalettedRasterRenderer, QgsPointXY, QgsProject, QgsRasterBandStats,
+    QgsRasterBlock, QgsRasterFileWriter, QgsRasterLayer, QgsRectangle,
+    QgsUnitTypes,
+)
+
+from .horizon_core import geodesia, visibilidade
+
+# Tipos de dado do QGIS -> NumPy
+TIPOS_NUMPY = {
+    Qgis.Byte: np.uint8,
+    Qgis.UInt16: np.uint16,
+    Qgis.Int16: np.int16,
+    Qgis.UInt32: np.uint32,
+    Qgis.Int32: np.int32,
+    Qgis.Float32: np.float32,
+    Qgis.Float64: np.float64,
+}
+
+# Metros por grau de arco na esfera do plugin
+METROS_POR_GRAU = geodesia.RAIO_TERRA_KM * 1000.0 * math.pi / 180.0
+
+
+def bloco_para_array(bloco):
+    """Converte um QgsRasterBlock em array float64, com NaN onde não há dados."""
+    dtype = TIPOS_NUMPY.get(bloco.dataType())
+    if dtype is None:
+        raise ValueError(f"Tipo de dado raster não suportado: {bloco.dataType()}")
+    array = np.frombuffer(bytes(bloco.data()), dtype=dtype)
+    array = array.reshape(bloco.height(), bloco.width()).astype(np.float64)
+    if bloco.hasNoDataValue():
+        array[array == bloco.noDataValue()] = np.nan
+    return array
+
+
+def ler_mde(provedor, banda=1):
+    """
+    Lê a banda inteira de um provedor raster como array float64.
+
+    Para uso em segundo plano, passe um clone do provedor
+    (camada.dataProvider().clone()), nunca o provedor da própria camada.
+    """
+    bloco = provedor.block(banda, provedor.extent(), provedor.xSize(), provedor.ySize())
+    return bloco_para_array(bloco)
+
+
+def ler_janela(provedor, linha0, linha1, coluna0, coluna1, banda=1):
+    """Lê as células [linha0:linha1, coluna0:coluna1] do raster como float64."""
+    extent = provedor.extent()
+    res_x = extent.width() / provedor.xSize()
+    res_y = extent.height() / provedor.ySize()
+    janela = QgsRectangle(
+        extent.xMinimum() + coluna0 * res_x, extent.yMaximum() - linha1 * res_y,
+        extent.xMinimum() + coluna1 * res_x, extent.yMaximum() - linha0 * res_y)
+    bloco = provedor.block(banda, janela, coluna1 - coluna0, linha1 - linha0)
+    return bloco_para_array(bloco)
+
+
+def posicoes_no_raster(provedor, lats, lons, contexto=None):
+    """
+    Posições fracionárias (linhas, colunas) de pontos em WGS84 no raster, com
+    o centro da célula [i, j] em (i, j), como em visibilidade.amostrar_bilinear.
+    """
+    lats = np.atleast_1d(np.asarray(lats, dtype=np.float64))
+    lons = np.atleast_1d(np.asarray(lons, dtype=np.float64))
+    contexto = contexto or QgsProject.instance().transformContext()
+    transform = QgsCoordinateTransform(
+        QgsCoordinateReferenceSystem("EPSG:4326"), provedor.crs(), contexto)
+    if transform.isShortCircuited():
+        xs, ys = lons, lats
+    else:
+        pontos = [transform.transform(QgsPointXY(lon, lat))
+                  for lat, lon in zip(lats.tolist(), lons.tolist())]
+        xs = np.array([p.x() for p in pontos])
+        ys = np.array([p.y() for p in pontos])
+    extent = provedor.extent()
+    res_x = extent.width() / provedor.xSize()
+    res_y = extent.height() / provedor.ySize()
+    return ((extent.yMaximum() - ys) / res_y - 0.5,
+            (xs - extent.xMinimum()) / res_x - 0.5)
+
+
+def posicao_no_raster(provedor, lat, lon, contexto=None):
+    """Posição fracionária (linha, coluna) de um ponto (lat, lon) em WGS84 no raster."""
+    linhas, colunas = posicoes_no_raster(provedor, lat, lon, contexto)
+    return float(linhas[0]), float(colunas[0])
+
+
+def celula_do_ponto(provedor, lat, lon, contexto=None):
+    """
+    Célula (linha, coluna) do MDE que contém o ponto (lat, lon) em WGS84.
+    Devolve None se o ponto ficar fora do raster.
+    """
+    linha, coluna = posicao_no_raster(provedor, lat, lon, contexto)
+    linha, coluna = int(math.floor(linha + 0.5)), int(math.floor(coluna + 0.5))
+    if 0 <= linha < provedor.ySize() and 0 <= coluna < provedor.xSize():
+        return linha, coluna
+    return None
+
+
+def altitude_maxima(provedor, banda=1):
+    """Maior altitude do raster (estatística por amostragem), nunca abaixo de 0."""
+    estatisticas = provedor.bandStatistics(banda, QgsRasterBandStats.Max, provedor.extent(), 250000)
+    return max(estatisticas.maximumValue, 0.0)
+
+
+class AmostradorTerreno:
+    """
+    Altitudes de um MDE em pontos WGS84, com leituras alinhadas em blocos e
+    cache LRU (horizon_core.visibilidade.AmostradorBlocos).
+
+    Guarda um clone do provedor, então pode ser usado pelas tarefas em
+    segundo plano; as leituras são serializadas pelo lock do cache.
+    """
+
+    def __init__(self, provedor, banda=1, tamanho_bloco=256, max_blocos=64):
+        self.provedor = provedor.clone()
+        self.banda = banda
+        forma = (self.provedor.ySize(), self.provedor.xSize())
+
+        def ler_bloco(bl, bc):
+            linha0, coluna0 = bl * tamanho_bloco, bc * tamanho_bloco
+            return ler_janela(
+                self.provedor, linha0, min(linha0 + tamanho_bloco, forma[0]),
+                coluna0, min(coluna0 + tamanho_bloco, forma[1]), banda)
+
+        self.mde = visibilidade.AmostradorBlocos(ler_bloco, forma, tamanho_bloco, max_blocos)
+
+    def altitudes(self, lats, lons, contexto=None):
+        """Altitudes interpoladas (bilinear) nos pontos; NaN fora do MDE ou sem dados."""
+        linhas, colunas = posicoes_no_raster(self.provedor, lats, lons, contexto)
+        return self.mde.amostrar(linhas, colunas)
+
+    def altitude(self, lat, lon, contexto=None):
+        """Altitude interpolada num ponto, ou None fora do MDE ou sem dados."""
+        z = float(self.altitudes(lat, lon, contexto)[0])
+        return None if math.isnan(z) else z
+
+
+def tamanho_celula_m(provedor, lat):
+    """
+    Tamanho (dy, dx) da célula em metros. Em CRS geográfico, converte graus
+    para metros na latitude do observador.
+    """
+    extent = provedor.extent()
+    res_x = extent.width() / provedor.xSize()
+    res_y = extent.height() / provedor.ySize()
+    if provedor.crs().isGeographic():
+        return (res_y * METROS_POR_GRAU,
+                res_x * METROS_POR_GRAU * math.cos(math.radians(lat)))
+    fator = QgsUnitTypes.fromUnitToUnitFactor(
+        provedor.crs().mapUnits(), QgsUnitTypes.DistanceMeters)
+    return res_y * fator, res_x * fator
+
+
+def gravar_raster(caminho, array, extent, crs, tipo, sem_dados=None, linhas_por_faixa=512):
+    """
+    Grava um array 2-D como GeoTIFF de uma banda, em faixas de linhas: com um
+    np.memmap, só uma faixa por vez é trazida para a memória.
+    """
+    altura, largura = array.shape
+    dtype = TIPOS_NUMPY[tipo]
+    escritor = QgsRasterFileWriter(caminho)
+    escritor.setOutputFormat('GTiff')
+    provedor = escritor.createOneBandRaster(tipo, largura, altura, extent, crs)
+    if provedor is None or not provedor.isValid():
+        raise IOError(f"Não foi possível criar o raster {caminho}")
+    if sem_dados is not None:
+        provedor.setNoDataValue(1, sem_dados)
+    for linha0 in range(0, altura, linhas_por_faixa):
+        faixa = np.ascontiguousarray(array[linha0:linha0 + linhas_por_faixa], dtype=dtype)
+        bloco = QgsRasterBlock(tipo, largura, faixa.shape[0])
+        bloco.setData(QByteArray(faixa.tobytes()))
+        provedor.writeBlock(bloco, 1, 0, linha0)
+    # O arquivo só é fechado quando o provedor é destruído
+    del provedor
+
+
+def gravar_raster_byte(caminho, array, extent, crs, sem_dados=visibilidade.SEM_DADOS):
+    """Grava um array uint8 como GeoTIFF de uma banda."""
+    gravar_raster(caminho, array, extent, crs, Qgis.Byte, sem_dados)
+
+
+def camada_visibilidade(caminho, nome):
+    """Camada raster de viewshed com visível em ciano e o resto transparente."""
+    camada = QgsRasterLayer(caminho, nome)
+    classes = [
+        QgsPalettedRasterRenderer.Class(
+            visibilidade.VISIVEL, QColor(0, 255, 245, 140), "Visível"),
+        QgsPalettedRasterRenderer.Class(
+            visibilidade.INVISIVEL, QColor(0, 0, 0, 0), "Não visível"),
+    ]
+    camada.setRenderer(QgsPalettedRasterRenderer(camada.dataProvider(), 1, classes))
+    return camada
@@ -0,0 +1,157 @@
+# coding=utf-8
+"""Vector export test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'betorodriuges@msn.com'
+__date__ = '2026-01-11'
+__copyright__ = 'Copyright 2026, Alberto Rodrigues'
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from osgeo import ogr
+from qgis.PyQt.QtCore import QVariant
+from qgis.core import QgsFeature, QgsField, QgsGeometry, QgsVectorLayer
+
+from exportacao import (
+    FonteCamada, gravar_geopackage, gravar_gpx, gravar_kml, nomes_unicos,
+)
+
+from utilities import get_qgis_app
+QGIS_APP = get_qgis_app()
+
+
+def camada_memoria(tipo, nome, wkts):
+    """Memory layer in WGS84 with a "nome" field and one feature per WKT (None = null geometry)."""
+    camada = QgsVectorLayer(f"{tipo}?crs=EPSG:4326", nome, "memory")
+    camada.dataProvider().addAttributes([QgsField("nome", QVariant.String)])
+    camada.updateFields()
+    feicoes = []
+    for numero, wkt in enumerate(wkts, 1):
+        feature = QgsFeature(camada.fields())
+        if wkt is not None:
+            feature.setGeometry(QgsGeometry.fromWkt(wkt))
+        feature.setAttributes([f"{nome} {numero}"])
+        feicoes.append(feature)
+    camada.dataProvider().addFeatures(feicoes)
+    camada.updateExtents()
+    return camada
+
+
+def contar(dataset, camada):
+    """Feature count of a layer of an OGR dataset (0 if the layer is absent)."""
+    resultado = dataset.GetLayerByName(camada)
+    return 0 if resultado is None else resultado.GetFeatureCount()
+
+
+class NomesUnicosTest(unittest.TestCase):
+    """Test table name sanitising."""
+
+    def test_nomes_unicos(self):
+        """Invalid characters become "_" and repeated names get a suffix."""
+        self.assertEqual(
+            nomes_unicos(["Horizonte (12.34 km)", "horizonte 12 34 km", "", "Anéis"]),
+            ["Horizonte_12_34_km", "horizonte_12_34_km_2", "camada", "An_is"])
+
+    def test_nomes_unicos_maximo(self):
+        """Names are cut to the maximum length, suffix included."""
+        nomes = nomes_unicos(["a" * 80, "a" * 80], maximo=10)
+        self.assertEqual(nomes, ["a" * 10, "a" * 8 + "_2"])
+
+
+class ExportacaoTest(unittest.TestCase):
+    """Test GPX, KML/KMZ and GeoPackage export against OGR."""
+
+    def setUp(self):
+        """Runs before each test."""
+        self.pasta = tempfile.mkdtemp()
+        self.camadas = [
+            camada_memoria("Point", "Observador", ["POINT(-46.6 -23.5)"]),
+            camada_memoria("LineString", "Projeção (10 km)",
+                           ["LINESTRING(-46.6 -23.5, -46.5 -23.4)", None]),
+            camada_memoria("MultiLineString", "Anéis",
+                           ["MULTILINESTRING((-46 -23, -45 -23), (-46 -24, -45 -24))"]),
+            camada_memoria("Polygon", "Horizonte (12.34 km)",
+                           ["POLYGON((-47 -24, -46 -24, -46 -23, -47 -23, -47 -24))"]),
+        ]
+        self.fontes = [FonteCamada(camada) for camada in self.camadas]
+
+    def tearDown(self):
+        """Runs after each test."""
+        self.fontes = None
+        self.camadas = None
+        shutil.rmtree(self.pasta, ignore_errors=True)
+
+    def caminho(self, nome):
+        return os.path.join(self.pasta, nome)
+
+    def test_gpx(self):
+        """Points, single-part lines and multi-part/polygons become wpt, rte and trk."""
+        caminho = self.caminho("saida.gpx")
+        self.assertEqual(gravar_gpx(caminho, self.fontes), 4)
+        dataset = ogr.Open(caminho)
+        self.assertIsNotNone(dataset)
+        self.assertEqual(contar(dataset, "waypoints"), 1)
+        self.assertEqual(contar(dataset, "routes"), 1)
+        self.assertEqual(contar(dataset, "tracks"), 2)
+        ponto = dataset.GetLayerByName("waypoints").GetNextFeature()
+        self.assertEqual(ponto.GetField("name"), "Observador 1")
+        self.assertAlmostEqual(ponto.GetGeometryRef().GetX(), -46.6)
+        self.assertAlmostEqual(ponto.GetGeometryRef().GetY(), -23.5)
+
+    def test_gpx_geometria_nula(self):
+        """A feature without geometry writes no empty trk or rte."""
+        fonte = FonteCamada(camada_memoria("LineString", "Vazia", [None, None]))
+        caminho = self.caminho("vazia.gpx")
+        self.assertEqual(gravar_gpx(caminho, [fonte]), 0)
+        with open(caminho, encoding='utf-8') as arquivo:
+            texto = arquivo.read()
+        self.assertNotIn("<trk>", texto)
+        self.assertNotIn("<rte>", texto)
+
+    def test_kml_kmz(self):
+        """One Folder per layer, with the features that have geometry, in KML and KMZ."""
+        for nome, leitura in (("saida.kml", "{}"), ("saida.kmz", "/vsizip/{}/doc.kml")):
+            caminho = self.caminho(nome)
+            self.assertEqual(gravar_kml(caminho, self.fontes), 4)
+            dataset = ogr.Open(leitura.format(caminho))
+            self.assertIsNotNone(dataset, nome)
+            self.assertEqual(contar(dataset, "Observador"), 1)
+            self.assertEqual(contar(dataset, "Projeção (10 km)"), 1)
+            self.assertEqual(contar(dataset, "Anéis"), 1)
+            self.assertEqual(contar(dataset, "Horizonte (12.34 km)"), 1)
+
+    def test_geopackage(self):
+        """One table per layer, named by nomes_unicos, with every feature."""
+        caminho = self.caminho("saida.gpkg")
+        nomes = gravar_geopackage(caminho, self.fontes)
+        self.assertEqual(nomes, nomes_unicos([camada.name() for camada in self.camadas]))
+        dataset = ogr.Open(caminho)
+        self.assertEqual(
+            sorted(dataset.GetLayer(i).GetName() for i in range(dataset.GetLayerCount())),
+            sorted(nomes))
+        for nome, camada in zip(nomes, self.camadas):
+            self.assertEqual(contar(dataset, nome), camada.featureCount())
+
+    def test_cancelado(self):
+        """A cancelled export returns None and leaves no partial file."""
+        gravadores = (("saida.gpx", gravar_gpx), ("saida.kml", gravar_kml),
+                      ("saida.kmz", gravar_kml), ("saida.gpkg", gravar_geopackage))
+        for nome, gravar in gravadores:
+            caminho = self.caminho(nome)
+            self.assertIsNone(gravar(caminho, self.fontes, cancelado=lambda: True), nome)
+            self.assertFalse(os.path.exists(caminho), nome)
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(ExportacaoTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
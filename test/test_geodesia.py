@@ -0,0 +1,91 @@
+# coding=utf-8
+"""Ellipsoidal geodesic engine test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'betorodriuges@msn.com'
+__date__ = '2026-01-11'
+__copyright__ = 'Copyright 2026, Alberto Rodrigues'
+
+import unittest
+
+import numpy as np
+
+from horizon_core.geodesia import GeodesicaElipsoidal
+
+# (lat1, lon1, azi1, s12_km) -> (lat2, lon2, azi2), GeographicLib 2.0
+DIRETO = [
+    ((-17.5392, -39.7277, 45.0, 150.0),
+     (-16.57833966014216, -38.73388010660684, 44.708443477949274)),
+    ((60.0, 5.0, 270.0, 400.0),
+     (59.80612250442027, -2.14062362714803, -96.17993464987534)),
+    ((-89.0, 0.0, 10.0, 50.0),
+     (-88.55705193932418, 3.0884114312717768, 6.912266969846094)),
+]
+
+# (lat1, lon1, lat2, lon2) -> (s12_km, azi1, azi2), GeographicLib 2.0
+INVERSO = [
+    ((-17.5392, -39.7277, -18.0, -38.0),
+     (190.1730752481389, 105.81829006673061, 105.2909724270306)),
+    ((40.6, -73.8, 49.0, 2.5),
+     (5850.506686353017, 53.504933356622665, 111.57704676912671)),
+    ((0.0, 0.0, 0.5, 179.7),
+     (19944.127420750458, 15.556882793490544, 164.44251389085494)),
+]
+
+
+class GeodesicaElipsoidalTest(unittest.TestCase):
+    """Test the WGS84 direct and inverse solvers."""
+
+    def setUp(self):
+        """Runs before each test."""
+        self.geodesica = GeodesicaElipsoidal()
+
+    def test_direto(self):
+        """Direct problem matches reference values to sub-millimetre."""
+        for entrada, esperado in DIRETO:
+            lat2, lon2, azi2 = self.geodesica.destino(*entrada)
+            for valor, referencia in zip((lat2, lon2, azi2), esperado):
+                self.assertAlmostEqual(float(valor), referencia, places=10)
+
+    def test_inverso(self):
+        """Inverse problem matches reference values, incl. near-antipodal."""
+        for entrada, esperado in INVERSO:
+            s12, azi1, azi2 = self.geodesica.inverso(*entrada)
+            self.assertAlmostEqual(float(s12), esperado[0], places=8)
+            self.assertAlmostEqual(float(azi1), esperado[1], places=7)
+            self.assertAlmostEqual(float(azi2), esperado[2], places=7)
+
+    def test_leque_igual_destino(self):
+        """A cached fan of rays gives the same points as pointwise solving."""
+        azimutes = np.linspace(0.0, 360.0, 65)
+        distancias = np.array([1.852, 18.52, 185.2])[:, np.newaxis]
+        leque = self.geodesica.leque(-17.5392, -39.7277, azimutes)
+        lats, lons, _ = leque.posicoes(distancias)
+        self.assertEqual(lats.shape, (3, 65))
+        self.assertIs(
+            self.geodesica.leque(-17.5392, 10.0, azimutes)._p, leque._p)
+        lat, lon, _ = self.geodesica.destino(
+            [-17.5392], [-39.7277], azimutes[7], 18.52)
+        self.assertAlmostEqual(lats[1, 7], lat[0], places=12)
+        self.assertAlmostEqual(lons[1, 7], lon[0], places=12)
+
+    def test_ida_e_volta(self):
+        """Inverse of a direct solution recovers distance and azimuth."""
+        lats, lons, _ = self.geodesica.destino(
+            -17.5392, -39.7277, np.arange(0.0, 360.0, 30.0), 250.0)
+        s12, azi1, _ = self.geodesica.inverso(-17.5392, -39.7277, lats, lons)
+        np.testing.assert_allclose(s12, 250.0, rtol=0, atol=1e-9)
+        np.testing.assert_allclose(
+            np.mod(azi1, 360.0), np.arange(0.0, 360.0, 30.0), atol=1e-9)
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(GeodesicaElipsoidalTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
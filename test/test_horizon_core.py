@@ -0,0 +1,129 @@
+# coding=utf-8
+"""Qt-free compute core test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'betorodriuges@msn.com'
+__date__ = '2026-01-11'
+__copyright__ = 'Copyright 2026, Alberto Rodrigues'
+
+import os
+import subprocess
+import sys
+import unittest
+
+import numpy as np
+
+from horizon_core import (
+    GeodesicaEsferica, GeodesicaElipsoidal, criar_modelo_terra,
+    distancia_horizonte, distancia_objeto,
+    distancias_horizonte, distancias_objeto,
+    num_vertices_circulo, aneis_geodesicos, circulos_geodesicos, CacheAneis,
+    linhas_geodesicas,
+)
+
+
+class HorizonCoreTest(unittest.TestCase):
+    """Test the horizon kernels, spherical model and ring tessellation."""
+
+    def test_importa_sem_qt(self):
+        """The core imports without pulling in Qt or QGIS."""
+        raiz = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+        codigo = ("import sys, horizon_core; "
+                  "print(any(m.split('.')[0] in ('qgis', 'PyQt5', 'PyQt6') "
+                  "for m in sys.modules))")
+        saida = subprocess.check_output(
+            [sys.executable, '-c', codigo], cwd=raiz, universal_newlines=True)
+        self.assertEqual(saida.strip(), 'False')
+
+    def test_horizonte_vetorizado_igual_escalar(self):
+        """Vectorized kernels are bit-identical to the scalar ones."""
+        alturas = np.linspace(0.0, 10000.0, 1001)
+        distancias = distancias_horizonte(alturas)
+        for altura, distancia in zip(alturas, distancias):
+            self.assertEqual(distancia, distancia_horizonte(altura))
+        objetos = distancias_objeto(alturas[:, np.newaxis], [5.0, 60.0])
+        self.assertEqual(objetos.shape, (1001, 2))
+        self.assertEqual(objetos[500, 1], distancia_objeto(alturas[500], 60.0))
+
+    def test_esfera_ida_e_volta(self):
+        """Spherical direct and inverse solutions are consistent."""
+        esfera = GeodesicaEsferica()
+        azimutes = np.arange(0.0, 360.0, 15.0)
+        lats, lons, azi2 = esfera.destino(-17.5392, -39.7277, azimutes, 120.0)
+        dist, azi1, azi2_inv = esfera.inverso(-17.5392, -39.7277, lats, lons)
+        np.testing.assert_allclose(dist, 120.0, atol=1e-9)
+        np.testing.assert_allclose(np.mod(azi1, 360.0), azimutes, atol=1e-9)
+        np.testing.assert_allclose(azi2, azi2_inv, atol=1e-9)
+
+    def test_modelos(self):
+        """Earth models are created by name."""
+        self.assertIsInstance(criar_modelo_terra('esfera'), GeodesicaEsferica)
+        self.assertIsInstance(criar_modelo_terra('wgs84'), GeodesicaElipsoidal)
+        self.assertRaises(ValueError, criar_modelo_terra, 'geoide')
+
+    def test_aneis_em_ambos_modelos(self):
+        """Rings from both models share shape and lie at the right distance."""
+        raios = np.array([1.852, 9.26, 18.52])
+        for modelo in (GeodesicaEsferica(), GeodesicaElipsoidal()):
+            lats, lons = aneis_geodesicos(modelo, 45.0, 10.0, raios)
+            self.assertEqual(lats.shape, (3, num_vertices_circulo(18.52) + 1))
+            dist, _, _ = modelo.inverso(45.0, 10.0, lats, lons)
+            np.testing.assert_allclose(
+                dist, np.repeat(raios[:, np.newaxis], lats.shape[1], axis=1),
+                atol=1e-9)
+
+    def test_circulos_em_lote(self):
+        """Batch circles keep input order and their own vertex budget."""
+        lats = np.array([-17.5, 10.0, 60.0, -40.0])
+        lons = np.array([-39.7, 20.0, 5.0, 170.0])
+        raios = np.array([5.0, 40.0, 5.0, 120.0])
+        modelo = GeodesicaElipsoidal()
+        circulos = circulos_geodesicos(modelo, lats, lons, raios)
+        self.assertEqual(len(circulos), 4)
+        for i, (lats_c, lons_c) in enumerate(circulos):
+            self.assertEqual(lats_c.shape, (num_vertices_circulo(raios[i]) + 1,))
+            dist, _, _ = modelo.inverso(lats[i], lons[i], lats_c, lons_c)
+            np.testing.assert_allclose(dist, raios[i], atol=1e-9)
+
+    def test_linhas_geodesicas(self):
+        """Projection lines follow the geodesic and end at the direct-problem target."""
+        modelo = GeodesicaElipsoidal()
+        lats, lons = linhas_geodesicas(modelo, [-17.5, 50.0], [-39.7, 170.0],
+                                       [45.0, 80.0], [600.0, 3000.0], 16)
+        self.assertEqual(lats.shape, (2, 17))
+        self.assertEqual((lats[0, 0], lons[0, 0]), (-17.5, -39.7))
+        lat_alvo, lon_alvo, _ = modelo.destino(50.0, 170.0, 80.0, 3000.0)
+        self.assertAlmostEqual(lats[1, -1], float(lat_alvo), places=9)
+        self.assertAlmostEqual(lons[1, -1], float(lon_alvo), places=9)
+        dist, azi, _ = modelo.inverso(50.0, 170.0, lats[1, 1:], lons[1, 1:])
+        np.testing.assert_allclose(dist, np.linspace(0.0, 3000.0, 17)[1:], atol=1e-6)
+        np.testing.assert_allclose(azi, 80.0, atol=1e-6)
+
+    def test_cache_aneis(self):
+        """Cached ring shapes are reused across longitudes and stay within a few metres."""
+        modelo = GeodesicaElipsoidal()
+        cache = CacheAneis()
+        raios = [5.0, 10.0, 20.0]
+        for lon in (-39.7277, -20.0, 175.0):
+            lats, lons = cache.aneis(modelo, -17.5392, lon, raios)
+            exatos = aneis_geodesicos(modelo, -17.5392, lon, raios)
+            self.assertEqual(lats.shape, exatos[0].shape)
+            dist, _, _ = modelo.inverso(-17.5392, lon, lats, lons)
+            np.testing.assert_allclose(
+                dist, np.broadcast_to(np.array(raios)[:, np.newaxis], dist.shape), atol=0.005)
+        self.assertEqual(cache.calculadas, 1)
+        cache.aneis(modelo, -17.6, -39.7, raios)
+        cache.aneis(modelo, -17.6, -39.7, raios[:1])
+        self.assertEqual(cache.calculadas, 3)
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(HorizonCoreTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
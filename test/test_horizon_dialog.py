@@ -14,6 +14,8 @@ __copyright__ = 'Copyright 2026, Alberto Rodrigues'
 
 import unittest
 
+import numpy as np
+
 from qgis.PyQt.QtGui import QDialogButtonBox, QDialog
 
 from horizon_dialog import horizonDialog
@@ -48,6 +50,38 @@ class horizonDialogTest(unittest.TestCase):
         result = self.dialog.result()
         self.assertEqual(result, QDialog.Rejected)
 
+
+class horizonDialogCalculoTest(unittest.TestCase):
+    """Test the calculation kernels of the dialog."""
+
+    def setUp(self):
+        """Runs before each test."""
+        _, _, iface, _ = QGIS_APP
+        self.dialog = horizonDialog(iface)
+
+    def tearDown(self):
+        """Runs after each test."""
+        self.dialog = None
+
+    def test_horizonte_vetorizado_igual_escalar(self):
+        """Vectorized horizon distance matches the scalar path exactly."""
+        alturas = np.linspace(0.01, 10000.0, 1001)
+        resultado = self.dialog.calcular_distancia_horizonte_vetorizado(alturas)
+        for altura, distancia in zip(alturas, resultado):
+            self.assertEqual(
+                distancia, self.dialog.calcular_distancia_horizonte(altura))
+
+    def test_objeto_vetorizado_broadcast(self):
+        """One observer against many objects broadcasts like the scalar path."""
+        alturas_obj = [0.0, 10.0, 45.5, 120.0]
+        resultado = self.dialog.calcular_distancia_objeto_vetorizado(
+            15.0, alturas_obj)
+        self.assertEqual(resultado.shape, (4,))
+        for altura_obj, distancia in zip(alturas_obj, resultado):
+            self.assertEqual(
+                distancia,
+                self.dialog.calcular_distancia_objeto(15.0, altura_obj))
+
 if __name__ == "__main__":
     suite = unittest.makeSuite(horizonDialogTest)
     runner = unittest.TextTestRunner(verbosity=2)
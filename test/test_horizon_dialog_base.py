@@ -0,0 +1,72 @@
+# coding=utf-8
+"""Precompiled dialog module test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'betorodriuges@msn.com'
+__date__ = '2026-01-11'
+__copyright__ = 'Copyright 2026, Alberto Rodrigues'
+
+import io
+import os
+import re
+import unittest
+import xml.etree.ElementTree as ET
+
+try:
+    from PyQt5 import uic
+except ImportError:
+    uic = None
+
+PASTA = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UI = os.path.join(PASTA, 'horizon_dialog_base.ui')
+COMPILADO = os.path.join(PASTA, 'horizon_dialog_base.py')
+
+
+def sem_cabecalho(texto):
+    """Código gerado sem os comentários do início (trazem a versão do pyuic5)."""
+    return texto[texto.index('\nfrom '):]
+
+
+class DialogBaseTest(unittest.TestCase):
+    """Test that horizon_dialog_base.py is up to date with horizon_dialog_base.ui."""
+
+    def test_mesmos_widgets(self):
+        """Every widget and layout of the .ui is created, with its class, and nothing else."""
+        raiz = ET.parse(UI).getroot()
+        esperado = {elemento.get('name'): elemento.get('class')
+                    for tag in ('widget', 'layout') for elemento in raiz.iter(tag)}
+        # O widget raiz é o próprio diálogo
+        del esperado[raiz.find('class').text]
+        espacadores = {elemento.get('name') for elemento in raiz.iter('spacer')}
+
+        with open(COMPILADO, encoding='utf-8') as arquivo:
+            criados = dict(re.findall(
+                r'^\s+self\.(\w+) = (?:[\w.]+\.)?(\w+)\(', arquivo.read(), re.M))
+        for nome in espacadores:
+            criados.pop(nome, None)
+        self.assertEqual(criados, esperado)
+
+    @unittest.skipIf(uic is None, 'PyQt5.uic não está disponível')
+    def test_igual_pyuic5(self):
+        """The committed module is what "make compile" generates from the .ui."""
+        saida = io.StringIO()
+        with open(UI, encoding='utf-8') as arquivo:
+            uic.compileUi(arquivo, saida)
+        # Mesma troca de import da regra %.py : %.ui do Makefile
+        gerado = re.sub(r'^from PyQt5 import', 'from qgis.PyQt import',
+                        saida.getvalue(), flags=re.M)
+        with open(COMPILADO, encoding='utf-8') as arquivo:
+            self.assertEqual(sem_cabecalho(arquivo.read()), sem_cabecalho(gerado),
+                             'horizon_dialog_base.py está desatualizado: rode "make compile"')
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(DialogBaseTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
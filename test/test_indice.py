@@ -0,0 +1,185 @@
+# coding=utf-8
+"""Spatial index and visible-objects query test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'betorodriuges@msn.com'
+__date__ = '2026-01-11'
+__copyright__ = 'Copyright 2026, Alberto Rodrigues'
+
+import unittest
+
+import numpy as np
+
+from horizon_core import (
+    SOME, SURGE, GeodesicaElipsoidal, GeodesicaEsferica, IndiceEspacial,
+    caixas_busca, chaves_morton,
+    distancias_acumuladas, distancias_objeto, eventos_trajeto,
+    objetos_visiveis, pares_intervisiveis, posicoes_trajeto,
+)
+
+
+class IndiceEspacialTest(unittest.TestCase):
+    """Test that the indexed query matches a full scan."""
+
+    def setUp(self):
+        """Runs before each test."""
+        rng = np.random.default_rng(11)
+        n = 20000
+        self.lats = rng.uniform(-70.0, 70.0, n)
+        self.lons = rng.uniform(-180.0, 180.0, n)
+        self.alturas = rng.uniform(5.0, 400.0, n)
+        # Um aglomerado perto do observador e outro sobre o antimeridiano
+        self.lats[:500] = -17.5 + rng.uniform(-0.5, 0.5, 500)
+        self.lons[:500] = -39.7 + rng.uniform(-0.5, 0.5, 500)
+        self.lats[500:1000] = 10.0 + rng.uniform(-0.5, 0.5, 500)
+        self.lons[500:1000] = np.mod(180.0 + rng.uniform(-0.5, 0.5, 500) + 180.0, 360.0) - 180.0
+        self.indice = IndiceEspacial(self.lats, self.lons)
+
+    def test_igual_varredura_completa(self):
+        for modelo in (GeodesicaEsferica(), GeodesicaElipsoidal()):
+            for lat, lon, altura in [(-17.5, -39.7, 30.0), (10.0, 179.9, 50.0),
+                                     (10.0, -179.9, 5.0), (69.9, 0.0, 1000.0)]:
+                indices, distancias, _, alcances = objetos_visiveis(
+                    self.indice, self.alturas, lat, lon, altura, modelo)
+                todas, _, _ = modelo.inverso(lat, lon, self.lats, self.lons)
+                esperado = np.flatnonzero(
+                    todas <= distancias_objeto(altura, self.alturas))
+                self.assertEqual(sorted(indices.tolist()), esperado.tolist())
+                self.assertTrue((np.diff(distancias) >= 0).all())
+                self.assertTrue((distancias <= alcances).all())
+
+    def test_candidatos_poucos(self):
+        candidatos = self.indice.candidatos(-17.5, -39.7, 60.0)
+        self.assertGreaterEqual(len(candidatos), 400)
+        self.assertLess(len(candidatos), 2000)
+
+    def test_caixas_busca(self):
+        """The boxes hold every point in reach, and split at the antimeridian."""
+        modelo = GeodesicaElipsoidal()
+        for lat, lon, raio in [(-17.5, -39.7, 60.0), (10.0, 179.9, 80.0),
+                               (10.0, -179.9, 80.0), (69.9, 0.0, 3000.0)]:
+            caixas = caixas_busca(lat, lon, raio)
+            dentro = np.zeros(len(self.lats), dtype=bool)
+            for lon_min, lat_min, lon_max, lat_max in caixas:
+                dentro |= ((self.lons >= lon_min) & (self.lons <= lon_max)
+                           & (self.lats >= lat_min) & (self.lats <= lat_max))
+            distancias, _, _ = modelo.inverso(lat, lon, self.lats, self.lons)
+            self.assertTrue(dentro[distancias <= raio].all())
+        self.assertEqual(len(caixas_busca(10.0, 179.9, 80.0)), 2)
+        self.assertEqual(len(caixas_busca(-17.5, -39.7, 60.0)), 1)
+        self.assertEqual(caixas_busca(89.0, 0.0, 200.0)[0][::2], (-180.0, 180.0))
+
+    def test_indice_vazio(self):
+        indices, distancias, _, _ = objetos_visiveis(
+            IndiceEspacial([], []), [], 0.0, 0.0, 10.0, GeodesicaEsferica())
+        self.assertEqual(len(indices), 0)
+        self.assertEqual(len(distancias), 0)
+
+
+class EventosTrajetoTest(unittest.TestCase):
+    """Test rise/dip events along a track against a brute-force scan."""
+
+    def setUp(self):
+        """Runs before each test."""
+        rng = np.random.default_rng(12)
+        t = np.linspace(0.0, 1.0, 4000)
+        self.lats = -20.0 + 3.0 * t + 0.2 * np.sin(30.0 * t)
+        self.lons = -40.0 + 0.4 * np.cos(20.0 * t)
+        self.lats_obj = rng.uniform(-22.0, -15.0, 300)
+        self.lons_obj = rng.uniform(-42.0, -38.0, 300)
+        self.alturas = rng.uniform(5.0, 120.0, 300)
+
+    def test_igual_varredura_completa(self):
+        for modelo in (GeodesicaEsferica(), GeodesicaElipsoidal()):
+            eventos, intervalos = eventos_trajeto(
+                self.lats, self.lons, self.lats_obj, self.lons_obj,
+                self.alturas, 12.0, modelo)
+            alcances = distancias_objeto(12.0, self.alturas)
+            for j in range(len(self.lats_obj)):
+                distancias, _, _ = modelo.inverso(
+                    self.lats_obj[j], self.lons_obj[j], self.lats, self.lons)
+                visivel = (distancias <= alcances[j]).astype(int)
+                surgimentos = int(visivel[0]) + np.count_nonzero(np.diff(visivel) == 1)
+                sumicos = np.count_nonzero(np.diff(visivel) == -1)
+                deste = eventos['objeto'] == j
+                self.assertEqual(np.count_nonzero(eventos['tipo'][deste] == SURGE), surgimentos)
+                self.assertEqual(np.count_nonzero(eventos['tipo'][deste] == SOME), sumicos)
+                self.assertEqual(np.count_nonzero(intervalos['objeto'] == j), surgimentos)
+
+            # Ordem ao longo do trajeto e contagem da varredura
+            self.assertTrue((np.diff(eventos['posicao']) >= 0).all())
+            self.assertTrue((eventos['visiveis'] >= 0).all())
+
+    def test_cruzamento_no_alcance(self):
+        modelo = GeodesicaEsferica()
+        eventos, _ = eventos_trajeto(self.lats, self.lons, self.lats_obj, self.lons_obj,
+                                     self.alturas, 12.0, modelo)
+        internos = eventos['posicao'] > 0
+        objetos = eventos['objeto'][internos]
+        lats, lons = posicoes_trajeto(self.lats, self.lons, eventos['posicao'][internos])
+        distancias, _, _ = modelo.inverso(self.lats_obj[objetos], self.lons_obj[objetos],
+                                          lats, lons)
+        np.testing.assert_allclose(distancias, distancias_objeto(12.0, self.alturas[objetos]),
+                                   atol=0.01)
+
+    def test_distancias_acumuladas(self):
+        km = distancias_acumuladas([0.0, 0.0, 1.0], [0.0, 1.0, 1.0], GeodesicaEsferica())
+        np.testing.assert_allclose(km, [0.0, 111.19, 222.39], atol=0.01)
+
+
+class ParesIntervisiveisTest(unittest.TestCase):
+    """Test the pruned all-pairs intervisibility against the full matrix."""
+
+    def test_igual_matriz_completa(self):
+        rng = np.random.default_rng(13)
+        lats = rng.uniform(-20.0, -18.0, 600)
+        lons = rng.uniform(-40.0, -38.0, 600)
+        alturas = rng.uniform(5.0, 150.0, 600)
+        for modelo in (GeodesicaEsferica(), GeodesicaElipsoidal()):
+            origens, destinos, distancias, alcances = pares_intervisiveis(
+                IndiceEspacial(lats, lons), alturas, modelo)
+            todas, _, _ = modelo.inverso(lats[:, None], lons[:, None],
+                                         lats[None, :], lons[None, :])
+            esperado = np.triu(todas <= distancias_objeto(alturas[:, None], alturas[None, :]), 1)
+            linhas, colunas = np.nonzero(esperado)
+            np.testing.assert_array_equal(origens, linhas)
+            np.testing.assert_array_equal(destinos, colunas)
+            np.testing.assert_allclose(distancias, todas[linhas, colunas])
+            self.assertTrue((distancias <= alcances).all())
+
+    def test_poucos_pontos(self):
+        origens, _, _, _ = pares_intervisiveis(
+            IndiceEspacial([0.0], [0.0]), [10.0], GeodesicaEsferica())
+        self.assertEqual(len(origens), 0)
+
+
+class ChavesMortonTest(unittest.TestCase):
+    """Test the Z-order keys used to partition unions."""
+
+    def test_ordem_z(self):
+        # Grade 2x2 (1 bit por eixo): sul-oeste, sul-leste, norte-oeste, norte-leste
+        chaves = chaves_morton([-90.0, -90.0, 90.0, 90.0], [-180.0, 179.0, -180.0, 179.0], bits=1)
+        np.testing.assert_array_equal(chaves, [0, 1, 2, 3])
+
+    def test_vizinhos_juntos(self):
+        rng = np.random.default_rng(14)
+        lats = np.r_[rng.uniform(-1.0, 0.0, 50), rng.uniform(40.0, 41.0, 50)]
+        lons = np.r_[rng.uniform(10.0, 11.0, 50), rng.uniform(-60.0, -59.0, 50)]
+        ordem = np.argsort(chaves_morton(lats, lons))
+        # Os dois aglomerados não se misturam na ordem
+        self.assertEqual(np.count_nonzero(np.diff(ordem < 50)), 1)
+
+
+if __name__ == "__main__":
+    suite = unittest.TestSuite([unittest.makeSuite(IndiceEspacialTest),
+                                unittest.makeSuite(EventosTrajetoTest),
+                                unittest.makeSuite(ParesIntervisiveisTest),
+                                unittest.makeSuite(ChavesMortonTest)])
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
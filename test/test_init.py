@@ -9,6 +9,7 @@ __copyright__ = 'Copyright 2012, Australia Indonesia Facility for '
 __copyright__ += 'Disaster Reduction'
 
 import os
+import ast
 import unittest
 import logging
 import configparser
@@ -60,5 +61,26 @@ class TestInit(unittest.TestCase):
 
             self.assertIn(expectation, dict(metadata), message)
 
+    def test_lazy_dialog_import(self):
+        """Test that loading the plugin does not import the dialog or resources."""
+        file_path = os.path.abspath(os.path.join(
+            os.path.dirname(__file__), os.pardir,
+            'horizon.py'))
+        with open(file_path, encoding='utf-8') as source:
+            tree = ast.parse(source.read())
+
+        module_imports = []
+        for node in tree.body:
+            if isinstance(node, ast.ImportFrom):
+                module_imports.append(node.module or '')
+                module_imports.extend(alias.name for alias in node.names)
+            elif isinstance(node, ast.Import):
+                module_imports.extend(alias.name for alias in node.names)
+
+        for heavy in ('horizon_dialog', 'resources'):
+            message = ('%s must only be imported inside run() so QGIS startup '
+                       'stays cheap.' % heavy)
+            self.assertNotIn(heavy, module_imports, message)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,90 @@
+# coding=utf-8
+"""Process pool batch execution test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'betorodriuges@msn.com'
+__date__ = '2026-01-11'
+__copyright__ = 'Copyright 2026, Alberto Rodrigues'
+
+import unittest
+
+import numpy as np
+
+from horizon_core import (
+    ExecutorProcessos, GeodesicaElipsoidal, circulos_geodesicos,
+    circulos_geodesicos_paralelo, kernel_destino, kernel_horizonte, kernel_objeto,
+)
+
+
+class ExecutorProcessosTest(unittest.TestCase):
+    """Test that the process pool matches serial execution, in input order."""
+
+    def setUp(self):
+        """Runs before each test."""
+        rng = np.random.default_rng(7)
+        n = 2503
+        self.entradas = {
+            'lat': rng.uniform(-80.0, 80.0, n),
+            'lon': rng.uniform(-180.0, 180.0, n),
+            'azimute': rng.uniform(0.0, 360.0, n),
+            'distancia_km': rng.uniform(0.0, 300.0, n),
+        }
+
+    def test_pool_igual_serial(self):
+        """Two workers with small chunks reproduce the serial result exactly."""
+        with ExecutorProcessos(1, 400) as serial:
+            esperado = serial.mapear(kernel_destino, self.entradas, {'modelo': 'wgs84'})
+        progresso = []
+        with ExecutorProcessos(2, 400) as pool:
+            obtido = pool.mapear(kernel_destino, self.entradas, {'modelo': 'wgs84'},
+                                 progresso=progresso.append)
+            horizonte = pool.mapear(
+                kernel_horizonte, {'altura_m': self.entradas['distancia_km']})
+        for nome in ('lat', 'lon', 'azimute'):
+            np.testing.assert_array_equal(obtido[nome], esperado[nome])
+        self.assertEqual(progresso[-1], 1.0)
+        self.assertEqual(horizonte['distancia_km'].shape, (2503,))
+
+    def test_cancelado(self):
+        """A cancelled run returns None."""
+        with ExecutorProcessos(2, 100) as pool:
+            self.assertIsNone(pool.mapear(
+                kernel_objeto,
+                {'altura_obs_m': self.entradas['distancia_km'],
+                 'altura_obj_m': self.entradas['distancia_km']},
+                cancelado=lambda: True))
+
+    def test_circulos_pool_igual_serial(self):
+        """Circle tessellation through the pool matches circulos_geodesicos."""
+        # Few distinct radii, so each vertex-count group spans several chunks
+        n = 301
+        lats, lons = self.entradas['lat'][:n], self.entradas['lon'][:n]
+        raios = np.array([2.0, 40.0, 250.0])[np.arange(n) % 3]
+        esperado = circulos_geodesicos(GeodesicaElipsoidal(), lats, lons, raios)
+        with ExecutorProcessos(2, 50) as pool:
+            obtido = circulos_geodesicos_paralelo(pool, 'wgs84', lats, lons, raios)
+            self.assertIsNone(circulos_geodesicos_paralelo(
+                pool, 'wgs84', lats, lons, raios, cancelado=lambda: True))
+        self.assertEqual(len(obtido), n)
+        for (lats_e, lons_e), (lats_o, lons_o) in zip(esperado, obtido):
+            np.testing.assert_array_equal(lats_o, lats_e)
+            np.testing.assert_array_equal(lons_o, lons_e)
+
+    def test_entradas_invalidas(self):
+        """Inputs of different lengths and bad settings are rejected."""
+        self.assertRaises(ValueError, ExecutorProcessos, 0)
+        with ExecutorProcessos(1) as serial:
+            self.assertRaises(ValueError, serial.mapear, kernel_horizonte,
+                              {'altura_m': [1.0, 2.0], 'outra': [1.0]})
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(ExecutorProcessosTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
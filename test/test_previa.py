@@ -0,0 +1,59 @@
+# coding=utf-8
+"""Map preview test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'betorodriuges@msn.com'
+__date__ = '2026-01-11'
+__copyright__ = 'Copyright 2026, Alberto Rodrigues'
+
+import unittest
+
+from qgis.core import QgsCoordinateReferenceSystem, QgsGeometry, QgsPointXY
+
+from previa import PreviaMapa
+
+from utilities import get_qgis_app
+QGIS_APP, CANVAS, IFACE, PARENT = get_qgis_app()
+
+
+class PreviaMapaTest(unittest.TestCase):
+    """Test the rubber band preview."""
+
+    def setUp(self):
+        """Runs before each test."""
+        # Estereográfica polar sul: o polo norte fica fora da área válida
+        CANVAS.setDestinationCrs(QgsCoordinateReferenceSystem("EPSG:3031"))
+        self.previa = PreviaMapa(CANVAS)
+
+    def tearDown(self):
+        """Runs after each test."""
+        self.previa.remover()
+        self.previa = None
+
+    def desenhar(self, wkt, centro):
+        self.previa.atualizar(lambda: (QgsGeometry.fromWkt(wkt), centro))
+        self.previa._desenhar()
+
+    def test_desenhar(self):
+        """A valid geometry is shown in the canvas CRS."""
+        self.desenhar("LINESTRING(0 -80, 10 -80)", QgsPointXY(0, -80))
+        self.assertFalse(self.previa.banda.asGeometry().isEmpty())
+
+    def test_transformacao_falha(self):
+        """A transform failure clears the preview instead of raising."""
+        self.desenhar("LINESTRING(0 -80, 10 -80)", QgsPointXY(0, -80))
+        self.desenhar("LINESTRING(0 89, 10 90)", QgsPointXY(0, 90))
+        self.assertTrue(self.previa.banda.asGeometry().isEmpty())
+        self.assertEqual(self.previa.centro.numberOfVertices(), 0)
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(PreviaMapaTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
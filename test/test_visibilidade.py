@@ -0,0 +1,204 @@
+# coding=utf-8
+"""DEM viewshed test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'betorodriuges@msn.com'
+__date__ = '2026-01-11'
+__copyright__ = 'Copyright 2026, Alberto Rodrigues'
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from horizon_core.horizonte import distancia_horizonte
+from horizon_core.visibilidade import (
+    INVISIVEL, SEM_DADOS, VISIVEL, AmostradorBlocos, amostrar_bilinear,
+    alcance_maximo_m, horizonte_terreno,
+    viewshed, viewshed_cumulativo,
+)
+
+
+class ViewshedTest(unittest.TestCase):
+    """Test the curvature-aware sweep viewshed."""
+
+    def test_mar_liso_igual_horizonte_geometrico(self):
+        """On a flat sea the viewshed edge is the geometric horizon."""
+        celula = 100.0
+        mde = np.zeros((401, 401))
+        visivel = viewshed(mde, 200, 200, 10.0, celula)
+        eixo = (np.arange(401) - 200) * celula
+        raios = np.hypot(*np.meshgrid(eixo, eixo))
+        horizonte_m = distancia_horizonte(10.0) * 1000.0
+        longe_da_borda = np.abs(raios - horizonte_m) >= celula
+        np.testing.assert_array_equal(
+            (visivel == VISIVEL)[longe_da_borda], (raios <= horizonte_m)[longe_da_borda])
+
+    def test_muro_faz_sombra(self):
+        """A wall hides what is behind it, but not what is in front."""
+        mde = np.zeros((41, 41))
+        mde[:, 25] = 50.0
+        visivel = viewshed(mde, 20, 5, 2.0, 10.0)
+        self.assertTrue(np.all(visivel[:, 6:25] == VISIVEL))
+        self.assertTrue(np.all(visivel[15:26, 26:] == INVISIVEL))
+        self.assertEqual(visivel[20, 25], VISIVEL)
+
+    def test_mde_de_teste(self):
+        """The shipped 10x10 ramp is fully visible; no-data is flagged."""
+        caminho = os.path.join(os.path.dirname(__file__), 'tenbytenraster.asc')
+        mde = np.loadtxt(caminho, skiprows=7, max_rows=10)
+        mde[0, 0] = -9999
+        visivel = viewshed(mde, 5, 9, 1.7, 10.0, sem_dados=-9999)
+        self.assertEqual(visivel[0, 0], SEM_DADOS)
+        visivel[0, 0] = VISIVEL
+        self.assertTrue(np.all(visivel == VISIVEL))
+
+    def test_alcance_maximo(self):
+        """Cells beyond raio_max_m are never visible."""
+        visivel = viewshed(np.zeros((101, 101)), 50, 50, 100.0, 10.0, raio_max_m=200.0)
+        self.assertEqual(int(visivel.sum()), int(np.sum(
+            np.hypot(*np.meshgrid(np.arange(-50, 51), np.arange(-50, 51))) * 10.0 <= 200.0)))
+        self.assertRaises(ValueError, viewshed, np.zeros((5, 5)), 7, 0, 1.0, 10.0)
+
+    def test_cumulativo_em_blocos(self):
+        """Tiled, memory-mapped accumulation equals the sum of viewsheds."""
+        rng = np.random.default_rng(3)
+        mde = np.cumsum(np.cumsum(rng.normal(0.0, 1.0, (150, 200)), 0), 1) * 0.05
+        observadores = [(int(rng.integers(150)), int(rng.integers(200)), 5.0,
+                         float(rng.uniform(300.0, 1500.0))) for _ in range(12)]
+        esperado = np.zeros(mde.shape, dtype=np.uint16)
+        for linha, coluna, altura, alcance in observadores:
+            esperado += viewshed(mde, linha, coluna, altura, 30.0,
+                                 raio_max_m=alcance) == VISIVEL
+
+        lidos = []
+
+        def ler_bloco(bl, bc):
+            lidos.append((bl, bc))
+            return mde[bl * 32:(bl + 1) * 32, bc * 32:(bc + 1) * 32]
+
+        caminho = os.path.join(tempfile.mkdtemp(), 'contagem.npy')
+        contagem = np.lib.format.open_memmap(caminho, 'w+', np.uint16, mde.shape)
+        somados = viewshed_cumulativo(ler_bloco, mde.shape, 32, observadores, 30.0, contagem)
+        self.assertEqual(somados, 12)
+        np.testing.assert_array_equal(np.asarray(contagem), esperado)
+        # Só os blocos dentro do alcance são lidos
+        self.assertLess(len(lidos), 12 * 5 * 7)
+        del contagem
+        os.remove(caminho)
+
+    def test_cumulativo_max_blocos(self):
+        """max_blocos clips each reach to that many tiles around the observer."""
+        rng = np.random.default_rng(5)
+        mde = np.cumsum(np.cumsum(rng.normal(0.0, 1.0, (150, 200)), 0), 1) * 0.05
+        observadores = [(int(rng.integers(150)), int(rng.integers(200)), 5.0, 5000.0)
+                        for _ in range(6)]
+        limite = alcance_maximo_m(32, 1, 30.0, 30.0)
+        self.assertEqual(limite, 960.0)
+        esperado = np.zeros(mde.shape, dtype=np.uint16)
+        for linha, coluna, altura, _ in observadores:
+            esperado += viewshed(mde, linha, coluna, altura, 30.0,
+                                 raio_max_m=limite) == VISIVEL
+
+        lidos = []
+
+        def ler_bloco(bl, bc):
+            lidos.append((bl, bc))
+            return mde[bl * 32:(bl + 1) * 32, bc * 32:(bc + 1) * 32]
+
+        contagem = np.zeros(mde.shape, dtype=np.uint16)
+        viewshed_cumulativo(ler_bloco, mde.shape, 32, observadores, 30.0, contagem,
+                            max_blocos=1)
+        np.testing.assert_array_equal(contagem, esperado)
+        # A janela de cada observador toca no máximo 3 x 3 blocos
+        self.assertLessEqual(len(lidos), 6 * 9)
+
+
+class HorizonteTerrenoTest(unittest.TestCase):
+    """Test the ray-marched terrain horizon."""
+
+    def test_amostrar_bilinear(self):
+        mde = np.arange(12, dtype=np.float64).reshape(3, 4)
+        z = amostrar_bilinear(mde, [0.0, 0.5, 1.5, -0.1, 2.0], [0.0, 0.5, 2.5, 1.0, 3.5])
+        np.testing.assert_allclose(z[:3], [0.0, 2.5, 8.5])
+        self.assertTrue(np.isnan(z[3:]).all())
+
+    def test_mar_liso_igual_horizonte_geometrico(self):
+        mde = np.zeros((401, 401))
+        azimutes, distancias, angulos, obstruido = horizonte_terreno(
+            lambda l, c: amostrar_bilinear(mde, l, c), 200.0, 200.0, 10.0, 100.0,
+            0.0, num_raios=36, refracao=0.0)
+        self.assertEqual(len(azimutes), 36)
+        self.assertFalse(obstruido.any())
+        np.testing.assert_allclose(distancias, distancia_horizonte(10.0) * 1000.0, rtol=1e-3)
+        self.assertTrue((angulos < 0).all())
+
+    def test_ilha_obstrui(self):
+        mde = np.zeros((401, 401))
+        mde[105:110, 150:250] = 50.0  # ilha ao norte, face a ~9,1 km
+        azimutes, distancias, angulos, obstruido = horizonte_terreno(
+            lambda l, c: amostrar_bilinear(mde, l, c), 200.0, 200.0, 10.0, 100.0,
+            50.0, num_raios=4, refracao=0.0)
+        self.assertTrue(obstruido[0])
+        self.assertFalse(obstruido[1:].any())
+        self.assertAlmostEqual(distancias[0], 9100.0, delta=100.0)
+        self.assertGreater(angulos[0], 0.0)
+
+
+class AmostradorBlocosTest(unittest.TestCase):
+    """Test block-aligned DEM sampling with an LRU cache."""
+
+    def setUp(self):
+        self.mde = np.random.default_rng(5).normal(0.0, 10.0, (130, 200))
+        self.mde[40:45, 60:70] = np.nan
+        self.lidos = []
+
+        def ler_bloco(bl, bc):
+            self.lidos.append((bl, bc))
+            return self.mde[bl * 32:(bl + 1) * 32, bc * 32:(bc + 1) * 32]
+
+        self.amostrador = AmostradorBlocos(ler_bloco, self.mde.shape, 32, max_blocos=4)
+
+    def test_igual_bilinear_direto(self):
+        rng = np.random.default_rng(6)
+        linhas = rng.uniform(-3.0, 133.0, 5000)
+        colunas = rng.uniform(-3.0, 203.0, 5000)
+        np.testing.assert_array_equal(
+            self.amostrador.amostrar(linhas, colunas),
+            amostrar_bilinear(self.mde, linhas, colunas))
+        np.testing.assert_array_equal(self.amostrador.janela(20, 90, 50, 150),
+                                      self.mde[20:90, 50:150])
+
+    def test_consultas_repetidas_usam_cache(self):
+        linhas = 50.0 + np.random.default_rng(7).uniform(-5.0, 5.0, 1000)
+        colunas = 100.0 + np.random.default_rng(8).uniform(-5.0, 5.0, 1000)
+        self.amostrador.amostrar(linhas, colunas)
+        leituras = self.amostrador.leituras
+        self.assertEqual(leituras, len(set(self.lidos)))
+        for _ in range(10):
+            self.amostrador.amostrar(linhas, colunas)
+        self.assertEqual(self.amostrador.leituras, leituras)
+
+    def test_cache_limitado(self):
+        for bl in range(5):
+            for bc in range(7):
+                self.amostrador.bloco(bl, bc)
+        self.assertEqual(len(self.amostrador._cache), 4)
+        # O bloco mais antigo foi descartado e volta a ser lido
+        self.amostrador.bloco(0, 0)
+        self.assertEqual(self.amostrador.leituras, 36)
+
+
+if __name__ == "__main__":
+    suite = unittest.TestSuite([unittest.makeSuite(ViewshedTest),
+                                unittest.makeSuite(HorizonteTerrenoTest),
+                                unittest.makeSuite(AmostradorBlocosTest)])
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)